@@ -1,6 +1,8 @@
 from typing import Any, TypeAlias
 from .base import BaseAPI
 
+import ast_json
+
 Application: TypeAlias = dict[str, Any]
 ApplicationList: TypeAlias = list[Application]
 
@@ -102,7 +104,10 @@ class Applications(BaseAPI):
             filter_obj = {}
 
         df = self.send_request(
-            method="PUT", uri=f"applications/{name}/eventFilter", **filter_obj
+            method="PUT",
+            uri=f"applications/{name}/eventFilter",
+            content_type="application/json",
+            message_body=ast_json.dumps(filter_obj),
         )
         df.addCallback(self.process_result)
         return df
@@ -76,7 +76,7 @@ class Asterisk(BaseAPI):
         :param object_id: string - The unique identifier of the object to delete.
         """
 
-        self.send_request(
+        return self.send_request(
             method="DELETE",
             uri=f"asterisk/config/dynamic/{config_class}/{object_type}/{object_id}",
         )
@@ -128,7 +128,7 @@ class Asterisk(BaseAPI):
         :param name: string - (required) Module name.
         """
 
-        self.send_request(method="POST", uri=f"asterisk/modules/{name}")
+        return self.send_request(method="POST", uri=f"asterisk/modules/{name}")
 
     def unload_module(self, name: str) -> None:
         """Unload an Asterisk module.
@@ -136,7 +136,7 @@ class Asterisk(BaseAPI):
         :param name: string - (required) Module name.
         """
 
-        self.send_request(method="DELETE", uri=f"asterisk/modules/{name}")
+        return self.send_request(method="DELETE", uri=f"asterisk/modules/{name}")
 
     def reload_module(self, name: str) -> None:
         """Reload an Asterisk module.
@@ -144,7 +144,7 @@ class Asterisk(BaseAPI):
         :param name: string - (required) Module name.
         """
 
-        self.send_request(method="PUT", uri=f"asterisk/modules/{name}")
+        return self.send_request(method="PUT", uri=f"asterisk/modules/{name}")
 
     def list_log_channels(self) -> LogChannelList:
         """Gets Asterisk log channel information."""
@@ -160,7 +160,7 @@ class Asterisk(BaseAPI):
         :param config: string - (required) levels of the log channel
         """
 
-        self.send_request(
+        return self.send_request(
             method="POST", uri=f"asterisk/logging/{name}?configuration={config}"
         )
 
@@ -170,7 +170,7 @@ class Asterisk(BaseAPI):
         :param name: string - (required) Name of the log channel.
         """
 
-        self.send_request(method="DELETE", uri=f"asterisk/logging/{name}")
+        return self.send_request(method="DELETE", uri=f"asterisk/logging/{name}")
 
     def rotate_log(self, name: str) -> None:
         """Rotates a log channel.
@@ -178,7 +178,7 @@ class Asterisk(BaseAPI):
         :param name: string - (required) Name of the log channel.
         """
 
-        self.send_request(method="PUT", uri=f"asterisk/logging/{name}/rotate")
+        return self.send_request(method="PUT", uri=f"asterisk/logging/{name}/rotate")
 
     def get_variable(self, variable: str) -> Variable:
         """Get the value of a global variable.
@@ -204,4 +204,4 @@ class Asterisk(BaseAPI):
             query_params["value"] = value
 
         uri = self._build_uri("asterisk/variable", query_params)
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
@@ -1,8 +1,9 @@
-import json
 from urllib.parse import urlencode
 
 from typing import Any
 
+import ast_json
+
 
 class BaseAPI:
     def __init__(self, send_request):
@@ -12,7 +13,7 @@ class BaseAPI:
     def parse_body(body: str) -> Any:
         if not body:
             return None
-        return json.loads(body)
+        return ast_json.loads(body)
 
     @staticmethod
     def _build_uri(path: str, query_params: dict | None = None) -> str:
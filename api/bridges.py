@@ -88,7 +88,7 @@ class Bridges(BaseAPI):
         :param bridge_id: string - (required) Bridge ID
         """
 
-        self.send_request(
+        return self.send_request(
             method="DELETE", uri=f"bridges/{bridge_id}", wait_for_response=False
         )
 
@@ -127,7 +127,7 @@ class Bridges(BaseAPI):
             query_params["inhibitConnectedLineUpdates"] = "true"
 
         uri = self._build_uri(f"bridges/{bridge_id}/addChannel", query_params)
-        self.send_request(method="POST", uri=uri, wait_for_response=False)
+        return self.send_request(method="POST", uri=uri)
 
     def remove_channel(self, bridge_id: str, channel: str) -> None:
         """
@@ -140,7 +140,7 @@ class Bridges(BaseAPI):
 
         query_params: dict[str, str] = {"channel": channel}
         uri = self._build_uri(f"bridges/{bridge_id}/removeChannel", query_params)
-        self.send_request(method="POST", uri=uri, wait_for_response=False)
+        return self.send_request(method="POST", uri=uri, wait_for_response=False)
 
     def set_video_source(self, bridge_id: int) -> NotImplementedError:
         raise NotImplementedError()
@@ -157,7 +157,7 @@ class Bridges(BaseAPI):
 
         query_params: dict[str, str] = {"mohClass": moh_class}
         uri = self._build_uri(f"bridges/{bridge_id}/moh", query_params)
-        self.send_request(method="POST", uri=uri, wait_for_response=False)
+        return self.send_request(method="POST", uri=uri, wait_for_response=False)
 
     def stop_moh(self, bridge_id: str) -> None:
         """Stop playing music on hold on the bridge.
@@ -165,7 +165,7 @@ class Bridges(BaseAPI):
         :param bridge_id: string - (required) Bridge Id.
         """
 
-        self.send_request(
+        return self.send_request(
             method="DELETE", uri=f"bridges/{bridge_id}/moh", wait_for_response=False
         )
 
@@ -295,7 +295,7 @@ class Channels(BaseAPI):
         elif reason:
             uri = self._build_uri(uri, {"reason": reason})
 
-        self.send_request(method="DELETE", uri=uri)
+        return self.send_request(method="DELETE", uri=uri)
 
     def continue_in_dialplan(
         self,
@@ -326,7 +326,7 @@ class Channels(BaseAPI):
             query_params["label"] = label
 
         uri = self._build_uri(f"/channels/{channel_id}/continue", query_params)
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
 
     def move(self, channel_id: str, app: str, app_args: str | None = None) -> None:
         """Move the channel from one Stasis application to another.
@@ -343,7 +343,7 @@ class Channels(BaseAPI):
             query_params["appArgs"] = app_args
 
         uri = self._build_uri(f"/channels/{channel_id}/move", query_params)
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
 
     def redirect(
         self,
@@ -359,7 +359,7 @@ class Channels(BaseAPI):
         uri = self._build_uri(
             f"/channels/{channel_id}/redirect", {"endpoint": endpoint}
         )
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
 
     def answer(
         self,
@@ -370,7 +370,7 @@ class Channels(BaseAPI):
         :param channel_id: (required) string - Channel's id
         """
 
-        self.send_request(method="POST", uri=f"/channels/{channel_id}/answer")
+        return self.send_request(method="POST", uri=f"/channels/{channel_id}/answer")
 
     def ring(
         self,
@@ -381,7 +381,7 @@ class Channels(BaseAPI):
         :param channel_id: (required) string - Channel's id
         """
 
-        self.send_request(method="POST", uri=f"/channels/{channel_id}/ring")
+        return self.send_request(method="POST", uri=f"/channels/{channel_id}/ring")
 
     def ring_stop(
         self,
@@ -392,7 +392,7 @@ class Channels(BaseAPI):
         :param channel_id: (required) string - Channel's id
         """
 
-        self.send_request(method="DELETE", uri=f"/channels/{channel_id}/ring")
+        return self.send_request(method="DELETE", uri=f"/channels/{channel_id}/ring")
 
     def progress(
         self,
@@ -403,7 +403,7 @@ class Channels(BaseAPI):
         :param channel_id: (required) string - Channel's id
         """
 
-        self.send_request(method="POST", uri=f"/channels/{channel_id}/progress")
+        return self.send_request(method="POST", uri=f"/channels/{channel_id}/progress")
 
     def send_dtmf(
         self,
@@ -440,7 +440,7 @@ class Channels(BaseAPI):
             query_params["after"] = str(after)
 
         uri = self._build_uri(f"/channels/{channel_id}/dtmf", query_params)
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
 
     def mute(self, channel_id: str, direction: str = "both") -> None:
         """Mute a channel.
@@ -452,7 +452,7 @@ class Channels(BaseAPI):
         """
 
         uri = self._build_uri(f"/channels/{channel_id}/mute", {"direction": direction})
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
 
     def unmute(self, channel_id: str, direction: str = "both") -> None:
         """Unmute a channel.
@@ -464,7 +464,7 @@ class Channels(BaseAPI):
         """
 
         uri = self._build_uri(f"/channels/{channel_id}/mute", {"direction": direction})
-        self.send_request(method="DELETE", uri=uri)
+        return self.send_request(method="DELETE", uri=uri)
 
     def hold(self, channel_id: str) -> None:
         """Hold a channel.
@@ -472,7 +472,7 @@ class Channels(BaseAPI):
         :param channel_id: (required) string - Channel's id
         """
 
-        self.send_request(method="POST", uri=f"/channels/{channel_id}/hold")
+        return self.send_request(method="POST", uri=f"/channels/{channel_id}/hold")
 
     def unhold(self, channel_id: str) -> None:
         """Remove a channel from hold.
@@ -480,7 +480,7 @@ class Channels(BaseAPI):
         :param channel_id: (required) string - Channel's id
         """
 
-        self.send_request(method="DELETE", uri=f"/channels/{channel_id}/hold")
+        return self.send_request(method="DELETE", uri=f"/channels/{channel_id}/hold")
 
     def start_moh(self, channel_id: str, moh_class: str | None = None) -> None:
         """Play music on hold to a channel. Using media operations such as /play on a
@@ -497,7 +497,7 @@ class Channels(BaseAPI):
             query_params["mohClass"] = moh_class
 
         uri = self._build_uri(f"/channels/{channel_id}/moh", query_params)
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
 
     def stop_moh(self, channel_id: str) -> None:
         """Remove a channel from hold.
@@ -505,7 +505,7 @@ class Channels(BaseAPI):
         :param channel_id: (required) string - Channel's id
         """
 
-        self.send_request(method="DELETE", uri=f"/channels/{channel_id}/moh")
+        return self.send_request(method="DELETE", uri=f"/channels/{channel_id}/moh")
 
     def start_silence(self, channel_id: str) -> None:
         """Play silence to a channel. Using media operations such as /play on a channel
@@ -514,7 +514,7 @@ class Channels(BaseAPI):
 
         :param channel_id: (required) string - Channel's id
         """
-        self.send_request(method="POST", uri=f"/channels/{channel_id}/silence")
+        return self.send_request(method="POST", uri=f"/channels/{channel_id}/silence")
 
     def stop_silence(self, channel_id: str) -> None:
         """Stop playing silence to a channel.
@@ -522,7 +522,7 @@ class Channels(BaseAPI):
         :param channel_id: (required) string - Channel's id
         """
 
-        self.send_request(method="DELETE", uri=f"/channels/{channel_id}/silence")
+        return self.send_request(method="DELETE", uri=f"/channels/{channel_id}/silence")
 
     def play(
         self,
@@ -686,7 +686,7 @@ class Channels(BaseAPI):
             query_params["value"] = value
 
         uri = self._build_uri(f"channels/{channel_id}/variable", query_params)
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
 
     def snoop(
         self,
@@ -787,7 +787,7 @@ class Channels(BaseAPI):
             query_params["timeout"] = str(timeout)
 
         uri = self._build_uri(f"channels/{channel_id}/dial", query_params)
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
 
     def rtp_statistics(self, channel_id: str) -> RTPstat:
         """RTP stats on a channel.
@@ -888,4 +888,4 @@ class Channels(BaseAPI):
         uri = self._build_uri(
             f"channels/{channel_id}/transfer_progress", {"states": states}
         )
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
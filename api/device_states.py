@@ -38,7 +38,7 @@ class DeviceStates(BaseAPI):
 
         query_params: dict[str, str] = {"deviceState": state}
         uri = self._build_uri(f"deviceStates/{name}", query_params)
-        self.send_request(method="PUT", uri=uri)
+        return self.send_request(method="PUT", uri=uri)
 
     def delete(self, name: str) -> None:
         """Destroy a device-state controlled by ARI.
@@ -46,4 +46,4 @@ class DeviceStates(BaseAPI):
         :param name: string - (required) Name of the device
         """
 
-        self.send_request(method="DELETE", uri=f"deviceStates/{name}")
+        return self.send_request(method="DELETE", uri=f"deviceStates/{name}")
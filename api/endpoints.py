@@ -35,7 +35,7 @@ class Endpoints(BaseAPI):
         if not variables:
             variables = {}
 
-        self.send_request(method="PUT", uri=uri, **variables)
+        return self.send_request(method="PUT", uri=uri, **variables)
 
     def refer(
         self,
@@ -67,7 +67,7 @@ class Endpoints(BaseAPI):
             "to_self": to_self,
         }
         uri = self._build_uri("endpoints/refer", query_params)
-        self.send_request(method="POST", uri=uri, **variables)
+        return self.send_request(method="POST", uri=uri, **variables)
 
     def list_by_tech(self, tech: str) -> EndpointList:
         """List available endpoints for a given endpoint technology.
@@ -116,7 +116,7 @@ class Endpoints(BaseAPI):
         if not variables:
             variables = {}
 
-        self.send_request(method="PUT", uri=uri, **variables)
+        return self.send_request(method="PUT", uri=uri, **variables)
 
     def refer_to_endpoint(
         self,
@@ -152,4 +152,4 @@ class Endpoints(BaseAPI):
         if not variables:
             variables = {}
 
-        self.send_request(method="POST", uri=uri, **variables)
+        return self.send_request(method="POST", uri=uri, **variables)
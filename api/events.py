@@ -57,4 +57,4 @@ class Events(BaseAPI):
         if not variables:
             variables = {}
 
-        self.send_request(method="POST", uri=uri, **variables)
+        return self.send_request(method="POST", uri=uri, **variables)
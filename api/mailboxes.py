@@ -40,7 +40,7 @@ class Mailboxes(BaseAPI):
         }
         uri = self._build_uri(f"mailboxes/{name}", query_params)
 
-        self.send_request(
+        return self.send_request(
             method="PUT",
             uri=uri,
         )
@@ -51,4 +51,4 @@ class Mailboxes(BaseAPI):
         :param name: string - (required) The name of the mailbox
         """
 
-        self.send_request(method="DELETE", uri=f"mailboxes/{name}")
+        return self.send_request(method="DELETE", uri=f"mailboxes/{name}")
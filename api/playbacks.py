@@ -29,7 +29,7 @@ class Playbacks(BaseAPI):
 
         query_params: dict[str, str] = {"operation": operation}
         uri = self._build_uri(f"playbacks/{playback_id}/control", query_params)
-        self.send_request(method="POST", uri=uri)
+        return self.send_request(method="POST", uri=uri)
 
     def stop(self, playback_id: str) -> None:
         """Stop a playback.
@@ -37,4 +37,4 @@ class Playbacks(BaseAPI):
         :param playback_id: string - (required) Playback Id.
         """
 
-        self.send_request(method="DELETE", uri=f"playbacks/{playback_id}")
+        return self.send_request(method="DELETE", uri=f"playbacks/{playback_id}")
@@ -57,7 +57,7 @@ class Recordings(BaseAPI):
         :param name: string - (required) The name of the recording
         """
 
-        self.send_request(method="DELETE", uri=f"recordings/stored/{name}")
+        return self.send_request(method="DELETE", uri=f"recordings/stored/{name}")
 
     def get_live(self, name: str) -> LiveRecording:
         """Get a stored recording's details.
@@ -75,7 +75,7 @@ class Recordings(BaseAPI):
         :param name: string - (required) The name of the recording
         """
 
-        self.send_request(method="DELETE", uri=f"recordings/live/{name}")
+        return self.send_request(method="DELETE", uri=f"recordings/live/{name}")
 
     def stop(self, name: str) -> None:
         """Stop a live recording and store it.
@@ -83,7 +83,7 @@ class Recordings(BaseAPI):
         :param name: string - (required) The name of the recording
         """
 
-        self.send_request(method="POST", uri=f"recordings/live/{name}/stop")
+        return self.send_request(method="POST", uri=f"recordings/live/{name}/stop")
 
     def pause(self, name: str) -> None:
         """Pause a live recording. Pausing a recording suspends silence detection,
@@ -93,7 +93,7 @@ class Recordings(BaseAPI):
         :param name: string - (required) The name of the recording
         """
 
-        self.send_request(method="POST", uri=f"recordings/live/{name}/pause")
+        return self.send_request(method="POST", uri=f"recordings/live/{name}/pause")
 
     def unpause(self, name: str) -> None:
         """Unpause a live recording.
@@ -101,7 +101,7 @@ class Recordings(BaseAPI):
         :param name: string - (required) The name of the recording
         """
 
-        self.send_request(method="DELETE", uri=f"recordings/live/{name}/pause")
+        return self.send_request(method="DELETE", uri=f"recordings/live/{name}/pause")
 
     def mute(self, name: str) -> None:
         """Mute a live recording. Muting a recording suspends silence detection,
@@ -110,7 +110,7 @@ class Recordings(BaseAPI):
         :param name: string - (required) The name of the recording
         """
 
-        self.send_request(method="POST", uri=f"recordings/live/{name}/mute")
+        return self.send_request(method="POST", uri=f"recordings/live/{name}/mute")
 
     def unmute(self, name: str) -> None:
         """Mute a live recording. Muting a recording suspends silence detection,
@@ -119,4 +119,4 @@ class Recordings(BaseAPI):
         :param name: string - (required) The name of the recording
         """
 
-        self.send_request(method="DELETE", uri=f"recordings/live/{name}/mute")
+        return self.send_request(method="DELETE", uri=f"recordings/live/{name}/mute")
@@ -7,18 +7,454 @@ the Apache License Version 2.0.
 """
 
 import asyncio
-import json
+from collections import OrderedDict, deque
+import contextvars
+import functools
+import inspect
+import itertools
 import logging
 from logging import INFO, WARNING, ERROR, DEBUG, NOTSET
+import random
+import re
 import signal
+import traceback
 import uuid
 from websockets.asyncio.client import connect
 from websockets.asyncio.server import serve
 from websockets.asyncio.server import basic_auth
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+from api import Applications, Bridges, Channels
+import ast_json
+
+DEFAULT_REQUEST_TIMEOUT = 30.0
+# Asterisk normally writes "type" as the first key of events and responses so it
+# can be read without decoding the whole frame.  Frames that don't match
+# are fully decoded.
+EVENT_TYPE = re.compile(r'\s*\{\s*"type"\s*:\s*"(\w+)"')
+EVENT_TYPE_BYTES = re.compile(rb'\s*\{\s*"type"\s*:\s*"(\w+)"')
+REQUEST_ID = re.compile(r'"request_id"\s*:\s*"([^"\\]*)"')
+REQUEST_ID_BYTES = re.compile(rb'"request_id"\s*:\s*"([^"\\]*)"')
+# The connection whose event is being handled by the current task.
+current_connection = contextvars.ContextVar("current_connection", default=None)
+# ARI event types, used to map handle_* method names back to the case
+# sensitive names applications/{name}/eventFilter expects.
+ARI_EVENT_TYPES = (
+    "ApplicationMoveFailed",
+    "ApplicationRegistered",
+    "ApplicationReplaced",
+    "ApplicationUnregistered",
+    "BridgeAttendedTransfer",
+    "BridgeBlindTransfer",
+    "BridgeCreated",
+    "BridgeDestroyed",
+    "BridgeMerged",
+    "BridgeVideoSourceChanged",
+    "ChannelCallerId",
+    "ChannelConnectedLine",
+    "ChannelCreated",
+    "ChannelDestroyed",
+    "ChannelDialplan",
+    "ChannelDtmfReceived",
+    "ChannelEnteredBridge",
+    "ChannelHangupRequest",
+    "ChannelHold",
+    "ChannelLeftBridge",
+    "ChannelStateChange",
+    "ChannelTalkingFinished",
+    "ChannelTalkingStarted",
+    "ChannelToneDetected",
+    "ChannelTransfer",
+    "ChannelUnhold",
+    "ChannelUserevent",
+    "ChannelVarset",
+    "ContactStatusChange",
+    "DeviceStateChanged",
+    "Dial",
+    "EndpointStateChange",
+    "MissingParams",
+    "PeerStatusChange",
+    "PlaybackContinuing",
+    "PlaybackFinished",
+    "PlaybackStarted",
+    "RecordingFailed",
+    "RecordingFinished",
+    "RecordingStarted",
+    "StasisEnd",
+    "StasisStart",
+    "TextMessageReceived",
+)
+ARI_EVENT_TYPES_BY_HANDLER = {et.lower(): et for et in ARI_EVENT_TYPES}
+# handle_* methods that aren't ARI event handlers.
+NON_EVENT_HANDLERS = frozenset(["handle_any", "handle_connection"])
+DEFAULT_MAX_PENDING_REQUESTS = 1000
+DEFAULT_EVENT_WORKERS = 64
+
+
+class RESTError(Exception):
+    def __init__(self, method, uri, response):
+        """
+        Raised when a REST request in a batch gets an error response.
+        :param method: The HTTP method of the failed request.
+        :param uri: The URI of the failed request.
+        :param response: The RESTResponse message.
+        """
+        super().__init__(
+            f"{method} {uri} {response['status_code']} {response['reason_phrase']}"
+        )
+        self.method = method
+        self.uri = uri
+        self.response = response
+
+
+class AsyncRequest:
+    def __init__(self, task, method, uri):
+        """
+        Awaitable wrapper around a send_request call for the api wrappers.
+        Supports addCallback() the same way a Deferred would, and raises
+        RESTError for error responses before the callbacks run.  Requests
+        sent with wait_for_response=False resolve to None without running
+        the callbacks.  The
+        request is already on its way, so one that's never awaited is
+        still sent.
+        :param task: The send_request task.
+        :param method: The HTTP method of the request.
+        :param uri: The URI of the request.
+        """
+        self.task = task
+        self.method = method
+        self.uri = uri
+        self.callbacks = []
+
+    def addCallback(self, callback, *args, **kwargs):
+        self.callbacks.append((callback, args, kwargs))
+        return self
+
+    def __await__(self):
+        return self.run().__await__()
+
+    async def run(self):
+        result = await self.task
+        if result is None:
+            # Sent with wait_for_response=False.  There's nothing to pass
+            # the callbacks.
+            return None
+        if result["status_code"] >= 400:
+            raise RESTError(self.method, self.uri, result)
+        for callback, args, kwargs in self.callbacks:
+            result = callback(result, *args, **kwargs)
+        return result
+
+
+class PendingRequests:
+    def __init__(
+        self,
+        timeout=DEFAULT_REQUEST_TIMEOUT,
+        max_pending=DEFAULT_MAX_PENDING_REQUESTS,
+        expired_history=1000,
+    ):
+        """
+        Correlates outstanding RESTRequests with their RESTResponses.
+        Each request is parked as a future that is resolved by the matching
+        response, fails when its deadline passes and is removed from the
+        table however it completes.
+        :param timeout: Default number of seconds to wait for a response.
+        None or 0 waits forever.
+        :param max_pending: Maximum number of requests in flight.  Senders
+        wait for a free slot once the limit is reached.
+        :param expired_history: Number of timed out or cancelled request ids
+        remembered so their responses can be counted as late.
+        """
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.expired_history = expired_history
+        self.pending = {}
+        self.expired = OrderedDict()
+        self.slots = asyncio.Semaphore(max_pending)
+        self.id_prefix = uuid.uuid4().hex[:12]
+        self.id_counter = itertools.count(1)
+        self.stats = {
+            "sent": 0,
+            "completed": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "failed": 0,
+            "late": 0,
+            "orphaned": 0,
+        }
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __contains__(self, request_id):
+        return request_id in self.pending
+
+    def new_id(self):
+        """
+        Returns a request id unique to this table.
+        """
+        return f"{self.id_prefix}-{next(self.id_counter)}"
+
+    async def add(self, request_id, timeout=None):
+        """
+        Registers a request and returns the future its response will resolve.
+        Waits for a free slot if max_pending requests are already in flight.
+        :param request_id: The id the response will be correlated on.
+        :param timeout: Seconds to wait for the response.  Defaults to the
+        table's timeout.
+        :return: An asyncio future.
+        :raises ValueError: If a request with the same id is pending.
+        """
+        if request_id in self.pending:
+            raise ValueError(f"Request {request_id} is already pending")
+        await self.slots.acquire()
+        # Checked again, since another request with the id may have been
+        # added while this one waited for a slot.
+        if request_id in self.pending:
+            self.slots.release()
+            raise ValueError(f"Request {request_id} is already pending")
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        if timeout is None:
+            timeout = self.timeout
+        handle = None
+        if timeout:
+            handle = loop.call_later(timeout, self._expire, request_id, fut, timeout)
+        self.pending[request_id] = (fut, handle)
+        self.stats["sent"] += 1
+        fut.add_done_callback(functools.partial(self._done, request_id))
+        return fut
+
+    def resolve(self, msg):
+        """
+        Resolves the pending request a RESTResponse belongs to.
+        :param msg: The decoded RESTResponse.
+        :return: "resolved" if a pending request was resolved, "late" if its
+        request already timed out or was cancelled, "orphaned" if its request
+        is unknown.
+        """
+        request_id = msg.get("request_id")
+        entry = self.pending.get(request_id)
+        if entry is None or entry[0].done():
+            return self.discard_response(request_id)
+        entry[0].set_result(msg)
+        self.stats["completed"] += 1
+        return "resolved"
+
+    def discard_response(self, request_id):
+        """
+        Counts a response that has no pending request.
+        :param request_id: The request id from the response.
+        :return: "late" or "orphaned".
+        """
+        if request_id in self.expired or request_id in self.pending:
+            self.stats["late"] += 1
+            return "late"
+        self.stats["orphaned"] += 1
+        return "orphaned"
+
+    def fail_all(self, exc):
+        """
+        Fails every pending request with the given exception.
+        :param exc: The exception to raise in the waiting coroutines.
+        """
+        for fut, _ in list(self.pending.values()):
+            if not fut.done():
+                fut.set_exception(exc)
+
+    def _expire(self, request_id, fut, timeout):
+        if not fut.done():
+            self.stats["timeouts"] += 1
+            fut.set_exception(
+                TimeoutError(f"Request {request_id} timed out after {timeout}s")
+            )
+
+    def _done(self, request_id, fut):
+        fut, handle = self.pending.pop(request_id)
+        if handle is not None:
+            handle.cancel()
+        self.slots.release()
+        if fut.cancelled():
+            self.stats["cancelled"] += 1
+        elif fut.exception() is not None:
+            if not isinstance(fut.exception(), TimeoutError):
+                self.stats["failed"] += 1
+        else:
+            return
+        self.expired[request_id] = None
+        if len(self.expired) > self.expired_history:
+            self.expired.popitem(last=False)
+
+
+class EventScheduler:
+    def __init__(self, run, workers=DEFAULT_EVENT_WORKERS, high_water=None, log=None):
+        """
+        Runs events in order per key (channel or bridge id) while events for
+        different keys run concurrently on a bounded set of workers.
+        Workers are started as keys become ready and exit when there's
+        nothing left to run, so an idle scheduler holds no tasks.
+        :param run: Coroutine function called with each event.
+        :param workers: Maximum number of events run at the same time.
+        :param high_water: Queue depth above which a warning is logged.
+        :param log: Optional log(level, message) function.
+        """
+        self.run = run
+        self.workers = workers
+        self.high_water = high_water
+        self.log = log
+        self.queues = {}
+        self.ready = deque()
+        self.tasks = set()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.depth = 0
+        self.max_depth = 0
+        self.above_high_water = False
+        self.stopping = False
+
+    def __len__(self):
+        return self.depth
+
+    def submit(self, key, event):
+        """
+        Queues an event behind any other events with the same key.
+        :param key: The ordering key.
+        :param event: The event to pass to run.
+        """
+        queue = self.queues.get(key)
+        if queue is None:
+            queue = self.queues[key] = deque()
+            self.ready.append(key)
+            if len(self.tasks) < self.workers:
+                self.start_worker()
+        queue.append(event)
+        self.idle.clear()
+        self.depth += 1
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+        if self.high_water and self.depth > self.high_water:
+            if not self.above_high_water and self.log is not None:
+                self.log(WARNING, f"Event queue depth {self.depth} above high water")
+            self.above_high_water = True
+
+    def start_worker(self):
+        self.tasks.add(asyncio.create_task(self.worker()))
+
+    async def drain(self):
+        """
+        Waits until every queued event has been run.
+        """
+        await self.idle.wait()
+
+    async def stop(self):
+        """
+        Cancels the workers.  Queued events are discarded.
+        """
+        self.stopping = True
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.queues.clear()
+        self.ready.clear()
+        self.depth = 0
+        self.idle.set()
+        self.stopping = False
+
+    async def worker(self):
+        # The key whose event is running, until it's back in ready or gone.
+        key = None
+        try:
+            while self.ready:
+                key = self.ready.popleft()
+                queue = self.queues[key]
+                event = queue.popleft()
+                self.depth -= 1
+                if self.above_high_water and self.depth <= self.high_water // 2:
+                    self.above_high_water = False
+                try:
+                    await self.run(event)
+                except asyncio.CancelledError as e:
+                    # A handler awaiting something that was cancelled
+                    # mustn't take the worker with it.  Only stop() and
+                    # cancelling the worker itself end it.
+                    if self.stopping or asyncio.current_task().cancelling():
+                        raise
+                    if self.log is not None:
+                        self.log(ERROR, f"Event handler cancelled: {e!r}")
+                except Exception as e:
+                    if self.log is not None:
+                        self.log(ERROR, f"Event handler failed: {e}")
+                    traceback.print_exc()
+                # One event per turn so a busy key can't starve the others.
+                if queue:
+                    self.ready.append(key)
+                else:
+                    del self.queues[key]
+                key = None
+        finally:
+            # A key whose event was interrupted is put back, or dropped if
+            # it has nothing left, so it's never left without a worker.
+            if key is not None and not self.stopping:
+                if self.queues[key]:
+                    self.ready.append(key)
+                else:
+                    del self.queues[key]
+            # Leave the task set before returning, not in a done callback a
+            # loop pass later, or a key submitted in between would find
+            # every worker slot taken and never run.
+            self.tasks.discard(asyncio.current_task())
+            if self.ready and not self.stopping:
+                self.start_worker()
+            if not self.queues:
+                self.idle.set()
+
+
+class AstAriConnection:
+    def __init__(self, ari, websocket):
+        """
+        State for one ARI websocket: its request table, event scheduler
+        and event filters.  Requests made while handling an event from
+        this websocket are sent back on it.
+        :param ari: The AstAriWebSocket handling the connection.
+        :param websocket: The websocket.
+        """
+        self.ari = ari
+        self.websocket = websocket
+        self.requests = PendingRequests(ari.request_timeout, ari.max_pending_requests)
+        self.scheduler = EventScheduler(
+            ari.run_event, ari.event_workers, ari.event_queue_high_water, ari.log
+        )
+        self.filtered_apps = set()
+        # The allowed events last pushed for each application.
+        self.event_filters = {}
 
 
 class AstAriWebSocket:
-    def __init__(self, tag=None, log_level=None):
+    # Event handler tables resolved once per subclass.
+    handler_tables = {}
+    # Event types not logged by handle_any.
+    quiet_events = frozenset(["ChannelVarset"])
+    # Read the event type from the raw frame and skip decoding events
+    # nothing handles or logs.
+    lazy_decode = True
+    # Number of events handled concurrently, and the queued event count
+    # above which a warning is logged.
+    event_workers = DEFAULT_EVENT_WORKERS
+    event_queue_high_water = 10000
+    # Push an allowed-events filter derived from the handlers to each
+    # application on connect.  allowed_events replaces the derived list,
+    # extra_events is added to it.
+    auto_event_filter = True
+    allowed_events = None
+    extra_events = ()
+
+    def __init__(
+        self,
+        tag=None,
+        log_level=None,
+        request_timeout=DEFAULT_REQUEST_TIMEOUT,
+        max_pending_requests=DEFAULT_MAX_PENDING_REQUESTS,
+    ):
         """
         Initializes the ARI event handler.
         :param host: The host address of the Asterisk server for client connections
@@ -28,13 +464,66 @@ class AstAriWebSocket:
         :param credentials: A tuple containing the username and password for ARI authentication.
         :param app: The ARI application name to connect to for client connections.
         :param protocol: The protocol to use for the WebSocket server connection. Default "ari".
+        :param request_timeout: Default number of seconds to wait for a REST response.
+        :param max_pending_requests: Maximum number of REST requests in flight.
         """
-        self.requests = {}
+        self.request_timeout = request_timeout
+        self.max_pending_requests = max_pending_requests
+        self.connections = set()
+        self.connection = None
+        self.applications = Applications(self.api_request)
+        self.bridges = Bridges(self.api_request)
+        self.channels = Channels(self.api_request)
+        self.handlers = {
+            event: getattr(self, attr) for event, attr in self.handler_table().items()
+        }
+        self.dispatch_table = {}
+        self.any_handler_overridden = (
+            type(self).handle_any is not AstAriWebSocket.handle_any
+        )
+        self.skipped_events = 0
+        # Tasks finishing the events of closed connections.
+        self.draining = set()
+        self.filter_apps = []
         self.logger = logging.getLogger(__name__)
         self.tag = tag
         if log_level is not None:
             self.logger.setLevel(log_level)
 
+    def current(self):
+        """
+        Returns the connection requests should be sent on: the one the event
+        being handled arrived on, otherwise the most recent one.  Outside of
+        an event with more than one connection open, the most recent one is
+        only a guess, so a warning is logged.
+        :return: An AstAriConnection or None if not connected.
+        """
+        conn = current_connection.get()
+        if conn is None or conn.ari is not self:
+            if len(self.connections) > 1:
+                self.log(
+                    WARNING,
+                    f"No current ARI websocket connection.  Using the most "
+                    f"recent of {len(self.connections)}",
+                )
+            conn = self.connection
+        return conn
+
+    @property
+    def websocket(self):
+        conn = self.current()
+        return None if conn is None else conn.websocket
+
+    @property
+    def requests(self):
+        conn = self.current()
+        return None if conn is None else conn.requests
+
+    @property
+    def scheduler(self):
+        conn = self.current()
+        return None if conn is None else conn.scheduler
+
     def log(self, level, message):
         """
         Logs a message with the tag.
@@ -45,21 +534,29 @@ class AstAriWebSocket:
         self.logger.log(level, f"{tag}{message}")
 
     async def send_request(
-        self, method, uri, wait_for_response=True, callback=None, **kwargs
+        self, method, uri, wait_for_response=True, callback=None, timeout=None, **kwargs
     ):
         """
         Sends a REST request over the WebSocket connection.
         :param method: The HTTP method (GET, POST, etc.) to use for the request.
         :param uri: The URI for the REST request.
         :param wait_for_response: Whether to wait for a response from the server.
+        If False, the request still occupies a slot until its response arrives
+        or it times out, and the callback, if any, is called with the response.
         :param callback: An optional callback function to process the response.
+        :param timeout: Seconds to wait for the response.  Defaults to request_timeout.
         :param kwargs: Additional parameters to include in the request.
         :return: The response from the server, or the result of the callback function.
+        None if not waiting for the response.
+        :raises TimeoutError: If no response arrived before the deadline.
         """
-        uuidstr = kwargs.pop("request_id", str(uuid.uuid4()))
+        conn = self.current()
+        if conn is None:
+            raise ConnectionError("No ARI websocket connection")
+        reqid = kwargs.pop("request_id", None) or conn.requests.new_id()
         req = {
             "type": "RESTRequest",
-            "request_id": uuidstr,
+            "request_id": reqid,
             "method": method,
             "uri": uri,
         }
@@ -67,25 +564,137 @@ class AstAriWebSocket:
         for k, v in kwargs.items():
             req[k] = v
 
-        msg = json.dumps(req)
-        rtnobj = {"result": ""}
-        if wait_for_response:
-            rtnobj["event"] = asyncio.Event()
-
-        self.requests[uuidstr] = rtnobj
-        self.log(INFO, f"RESTRequest: {method} {uri} {uuidstr}")
-        await self.websocket.send(msg.encode("utf-8"), text=True)
-        if wait_for_response:
-            await rtnobj["event"].wait()
-        del self.requests[uuidstr]
-        resp = rtnobj["result"]
+        msg = ast_json.dumpb(req)
+        fut = await conn.requests.add(reqid, timeout)
+        self.log(INFO, f"RESTRequest: {method} {uri} {reqid}")
+        try:
+            await conn.websocket.send(msg, text=True)
+        except BaseException:
+            fut.cancel()
+            raise
+
+        if not wait_for_response:
+            fut.add_done_callback(
+                functools.partial(
+                    self._request_done,
+                    conn.websocket,
+                    method,
+                    uri,
+                    reqid,
+                    req,
+                    callback,
+                )
+            )
+            return None
+
+        try:
+            resp = await fut
+        except TimeoutError:
+            self.log(WARNING, f"RESTRequest: {method} {uri} {reqid} timed out")
+            raise
+        self.log(
+            INFO,
+            f"RESTResponse: {method} {uri} {resp['status_code']} {resp['reason_phrase']}",
+        )
+        if callback is not None:
+            return callback(conn.websocket, reqid, req, resp)
+        return resp
+
+    def api_request(self, method, uri, **kwargs):
+        """
+        send_request adapter for the api wrappers (api.Bridges, api.Channels...).
+        :param method: The HTTP method (GET, POST, etc.) to use for the request.
+        :param uri: The URI for the REST request.
+        :param kwargs: Additional send_request parameters.
+        :return: An awaitable AsyncRequest.
+        """
+        task = asyncio.ensure_future(self.send_request(method, uri, **kwargs))
+        task.add_done_callback(functools.partial(self._api_request_done, method, uri))
+        return AsyncRequest(task, method, uri)
+
+    def _api_request_done(self, method, uri, task):
+        # Retrieves the exception so a request nobody awaited still gets
+        # logged instead of reported as never retrieved.
+        if not task.cancelled() and task.exception() is not None:
+            self.log(WARNING, f"RESTRequest: {method} {uri} failed: {task.exception()}")
+
+    async def send_requests(
+        self, requests, return_exceptions=False, concurrency=None, timeout=None
+    ):
+        """
+        Sends several REST requests back-to-back and gathers their responses.
+        The requests are written without waiting for each other's responses
+        so the whole batch costs roughly one round trip.
+        :param requests: An iterable of requests.  Each one is either a
+        (method, uri) tuple or a dict with "method", "uri" and any other
+        send_request keyword arguments.
+        :param return_exceptions: If False, the batch is all-or-nothing: the
+        first failure cancels the requests still outstanding and is raised.
+        If True, failures are returned in place of their responses.
+        :param concurrency: Optional maximum number of requests from this
+        batch in flight at once.
+        :param timeout: Seconds to wait for each response.  Defaults to request_timeout.
+        :return: A list of responses in the same order as the requests.  A
+        request with a callback gives the callback's result, and one with
+        wait_for_response=False gives None.
+        :raises RESTError: If a request got an error status and
+        return_exceptions is False.
+        """
+        limit = asyncio.Semaphore(concurrency) if concurrency else None
+
+        async def send_one(method, uri, kwargs):
+            if limit is None:
+                resp = await self.send_request(method, uri, **kwargs)
+            else:
+                async with limit:
+                    resp = await self.send_request(method, uri, **kwargs)
+            # Only a RESTResponse has a status.  Requests with a callback
+            # or wait_for_response=False return something else.
+            if (
+                isinstance(resp, dict)
+                and resp.get("type") == "RESTResponse"
+                and resp["status_code"] >= 400
+            ):
+                raise RESTError(method, uri, resp)
+            return resp
+
+        tasks = []
+        for req in requests:
+            if isinstance(req, dict):
+                kwargs = dict(req)
+                method = kwargs.pop("method")
+                uri = kwargs.pop("uri")
+            else:
+                method, uri = req
+                kwargs = {}
+            kwargs.setdefault("timeout", timeout)
+            tasks.append(asyncio.create_task(send_one(method, uri, kwargs)))
+
+        if return_exceptions:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    def _request_done(self, websocket, method, uri, reqid, req, callback, fut):
+        """
+        Completes a request that was sent without waiting for its response.
+        """
+        if fut.cancelled():
+            return
+        if fut.exception() is not None:
+            self.log(WARNING, f"RESTRequest: {method} {uri} {reqid} {fut.exception()}")
+            return
+        resp = fut.result()
         self.log(
             INFO,
             f"RESTResponse: {method} {uri} {resp['status_code']} {resp['reason_phrase']}",
         )
         if callback is not None:
-            return callback(self.websocket, uuidstr, req, rtnobj["result"])
-        return rtnobj["result"]
+            callback(websocket, reqid, req, resp)
 
     async def process_rest_response(self, msg):
         """
@@ -93,41 +702,133 @@ class AstAriWebSocket:
         :param msg: The REST response message.
         """
         if msg["type"] == "RESTResponse":
-            reqid = msg["request_id"]
-            req = self.requests.get(reqid)
-            if req is None:
+            reqid = msg.get("request_id")
+            status = self.requests.resolve(msg)
+            if status == "late":
+                self.log(WARNING, f"Late response for request {reqid} discarded.")
+            elif status == "orphaned":
                 self.log(ERROR, f"Pending request {reqid} not found.")
-                return
-            req["result"] = msg
-            event = req.get("event", None)
-            if event is not None:
-                event.set()
 
-    def get_function(self, func):
+    @classmethod
+    def handler_table(cls):
+        """
+        Returns the event handlers defined on the class, resolved once per class.
+        :return: A dict mapping lower case event types to handler method names.
+        """
+        table = AstAriWebSocket.handler_tables.get(cls)
+        if table is None:
+            table = {}
+            for attr in dir(cls):
+                if attr.startswith("handle_") and attr not in NON_EVENT_HANDLERS:
+                    if callable(getattr(cls, attr)):
+                        table[attr[len("handle_") :]] = attr
+            AstAriWebSocket.handler_tables[cls] = table
+        return table
+
+    def register_handler(self, event_type, handler):
+        """
+        Registers a handler for an event type on this instance without
+        subclassing.  Replaces any handle_<event_type> method.
+        :param event_type: The ARI event type (e.g. "StasisStart").  Not case sensitive.
+        :param handler: A function or coroutine function taking the event.
+        """
+        self.handlers[event_type.lower()] = handler
+        self.dispatch_table.clear()
+        self.refresh_event_filters()
+
+    def unregister_handler(self, event_type):
+        """
+        Removes the handler for an event type from this instance.
+        :param event_type: The ARI event type.  Not case sensitive.
+        """
+        self.handlers.pop(event_type.lower(), None)
+        self.dispatch_table.clear()
+        self.refresh_event_filters()
+
+    def lookup_handler(self, event_type):
+        """
+        Returns the handler for an event type.
+        :param event_type: The ARI event type exactly as received.
+        :return: A (handler, is_coroutine) tuple or None if there's no handler.
         """
-        Returns a callable function based on the provided function name.
-        :param func: The name of the function to retrieve.
-        :return: The callable function if it exists, otherwise None.
+        entry = self.dispatch_table.get(event_type, False)
+        if entry is False:
+            handler = self.handlers.get(event_type.lower())
+            entry = None
+            if handler is not None:
+                entry = (handler, asyncio.iscoroutinefunction(handler))
+            self.dispatch_table[event_type] = entry
+        return entry
+
+    def event_filter(self):
         """
-        if hasattr(self, func):
-            attr = getattr(self, func)
-            if callable(attr):
-                return attr
+        Returns the event types this instance needs from Asterisk.
+        :return: A sorted list of event types, or None if every event is
+        needed (handle_any is overridden, or a handler's event type isn't known).
+        """
+        if self.allowed_events is not None:
+            return sorted(set(self.allowed_events) | set(self.extra_events))
+        if self.any_handler_overridden:
             return None
+        allowed = set(self.extra_events)
+        for event in self.handlers:
+            et = ARI_EVENT_TYPES_BY_HANDLER.get(event)
+            if et is None:
+                self.log(
+                    WARNING,
+                    f"Unknown event type for handler '{event}', not filtering events",
+                )
+                return None
+            allowed.add(et)
+        return sorted(allowed) if allowed else None
 
-    async def handle_any(self, msg):
+    async def apply_event_filter(self, app, conn=None):
         """
-        Handles any ARI event that does not have a specific handler.
-        :param rest_handler: The REST handler to use for processing the event.
-        :param msg: The ARI event message.
+        Sets the allowed-events filter for an application so Asterisk only
+        sends the events this instance handles.
+        :param app: The ARI application name.
+        :param conn: Optional AstAriConnection to set it on.  Defaults to
+        the current one.
+        """
+        if conn is not None:
+            current_connection.set(conn)
+        conn = self.current()
+        conn.filtered_apps.add(app)
+        allowed = self.event_filter()
+        if conn.event_filters.get(app) == allowed:
+            return
+        # An empty allowed list lets every event through again.
+        conn.event_filters[app] = allowed
+        try:
+            await self.applications.filter(
+                app, {"allowed": [{"type": et} for et in allowed or []]}
+            )
+        except Exception as e:
+            conn.event_filters.pop(app, None)
+            self.log(WARNING, f"Unable to set event filter for {app}: {e}")
+            return
+        self.log(INFO, f"Event filter for {app}: {', '.join(allowed or ['all'])}")
+
+    def refresh_event_filters(self):
+        """
+        Pushes the event filter again to every application on every
+        connection after the handlers change, so events for a handler
+        registered later aren't still filtered out.
         """
-        if msg["type"] == "ChannelVarset":
+        if not self.auto_event_filter:
             return
+        for conn in self.connections:
+            for app in conn.filtered_apps:
+                asyncio.create_task(self.apply_event_filter(app, conn))
+
+    def log_event(self, msg):
+        """
+        Logs a received ARI event unless its type is in quiet_events.
+        :param msg: The ARI event message.
+        """
         et = msg["type"]
-        ts = msg["timestamp"]
-        del msg["timestamp"]
-        del msg["type"]
-        msg["timestamp"] = ts
+        if et in self.quiet_events:
+            return
         name = ""
         if "bridge" in msg:
             name = (
@@ -140,19 +841,118 @@ class AstAriWebSocket:
 
         self.log(INFO, f"Received {et} {name}")
 
+    async def handle_any(self, msg):
+        """
+        Handles any ARI event that does not have a specific handler.
+        Subclasses that override this are called for every event.
+        :param msg: The ARI event message.
+        """
+        if self.logger.isEnabledFor(INFO):
+            self.log_event(msg)
+
+    @staticmethod
+    def event_key(msg):
+        """
+        Returns the key events are ordered on: the channel, dialed peer or
+        bridge the event is about.  Events without any share one key.
+        :param msg: The ARI event message.
+        """
+        for obj in ("channel", "peer", "bridge"):
+            if obj in msg:
+                return msg[obj].get("id")
+        return None
+
+    def dispatch(self, msg):
+        """
+        Queues an ARI event for its handler.  Events with the same key are
+        handled in the order they were received.  Events without a handler
+        are dropped after being logged.
+        :param msg: The ARI event message.
+        """
+        conn = self.current()
+        app = msg.get("application")
+        if app is not None and app not in conn.filtered_apps:
+            conn.filtered_apps.add(app)
+            if self.auto_event_filter:
+                asyncio.create_task(self.apply_event_filter(app))
+        if not self.any_handler_overridden:
+            if self.logger.isEnabledFor(INFO):
+                self.log_event(msg)
+            if self.lookup_handler(msg["type"]) is None:
+                return
+        conn.scheduler.submit(self.event_key(msg), msg)
+
+    async def run_event(self, msg):
+        """
+        Runs the handlers for an ARI event.  Non-coroutine handlers are
+        called inline.
+        :param msg: The ARI event message.
+        """
+        if self.any_handler_overridden:
+            await self.handle_any(msg)
+        entry = self.lookup_handler(msg["type"])
+        if entry is None:
+            return
+        handler, is_coroutine = entry
+        if is_coroutine:
+            await handler(msg)
+            return
+        result = handler(msg)
+        if inspect.isawaitable(result):
+            await result
+
+    def wants_event(self, event_type):
+        """
+        Returns whether an event needs to be decoded for a handler or for logging.
+        :param event_type: The ARI event type exactly as received.
+        """
+        if self.any_handler_overridden or self.lookup_handler(event_type) is not None:
+            return True
+        return event_type not in self.quiet_events and self.logger.isEnabledFor(INFO)
+
+    def skip_frame(self, message):
+        """
+        Reads the type, and for RESTResponses the request id, from a raw
+        frame and decides whether it can be dropped without decoding.
+        Events nobody wants are counted in skipped_events.  Responses for
+        requests that aren't pending are counted as late or orphaned.
+        :param message: The raw websocket frame.
+        :return: True if the frame was consumed.
+        """
+        is_text = isinstance(message, str)
+        m = (EVENT_TYPE if is_text else EVENT_TYPE_BYTES).match(message)
+        if m is None:
+            return False
+        event_type = m.group(1) if is_text else m.group(1).decode()
+        if event_type == "RESTResponse":
+            m = (REQUEST_ID if is_text else REQUEST_ID_BYTES).search(message)
+            if m is None:
+                return False
+            reqid = m.group(1) if is_text else m.group(1).decode()
+            if reqid in self.requests:
+                return False
+            if self.requests.discard_response(reqid) == "late":
+                self.log(WARNING, f"Late response for request {reqid} discarded.")
+            else:
+                self.log(ERROR, f"Pending request {reqid} not found.")
+            return True
+        if self.wants_event(event_type):
+            return False
+        self.skipped_events += 1
+        return True
+
     async def process_message(self, msg):
         """
         Processes an incoming ARI event message and call a handler if it exists.
+        The message is handled immediately, bypassing the event scheduler.
         :param msg: The ARI event message to process.
         """
         if msg["type"] == "RESTResponse":
             await self.process_rest_response(msg)
             return
-        handler_name = f"handle_{msg['type'].lower()}"
-        func = self.get_function(handler_name)
-        await self.handle_any(msg)
-        if func is not None:
-            await func(msg)
+        if not self.any_handler_overridden:
+            await self.handle_any(msg)
+        await self.run_event(msg)
 
     async def handle_connection(self, websocket):
         """
@@ -160,16 +960,49 @@ class AstAriWebSocket:
         :param websocket: The WebSocket connection to handle.
         """
         self.log(INFO, f"ARI websocket connection from {websocket.remote_address}")
-        self.websocket = websocket
-        async for message in websocket:
-            msg = json.loads(message)
-            asyncio.create_task(self.process_message(msg))
-        self.log(INFO, "ARI disconnected")
+        conn = AstAriConnection(self, websocket)
+        self.connections.add(conn)
+        self.connection = conn
+        token = current_connection.set(conn)
+        if self.auto_event_filter:
+            for app in self.filter_apps:
+                asyncio.create_task(self.apply_event_filter(app))
+        try:
+            async for message in websocket:
+                if self.lazy_decode and self.skip_frame(message):
+                    continue
+                msg = ast_json.loads(message)
+                if msg["type"] == "RESTResponse":
+                    await self.process_rest_response(msg)
+                    continue
+                self.dispatch(msg)
+        finally:
+            # Nothing sent on this websocket can be answered any more.
+            conn.requests.fail_all(ConnectionError("ARI websocket disconnected"))
+            self.log(INFO, "ARI disconnected")
+            self.connections.discard(conn)
+            if self.connection is conn:
+                self.connection = next(iter(self.connections), None)
+            current_connection.reset(token)
+            # Events already queued are still handled, in the background so
+            # a slow handler doesn't hold up a reconnect.
+            task = asyncio.create_task(conn.scheduler.drain())
+            self.draining.add(task)
+            task.add_done_callback(self.draining.discard)
 
 
 class AstAriWebSocketServer(AstAriWebSocket):
     def __init__(
-        self, host, port, credentials, protocol="ari", tag=None, log_level=None
+        self,
+        host,
+        port,
+        credentials,
+        protocol="ari",
+        tag=None,
+        log_level=None,
+        request_timeout=DEFAULT_REQUEST_TIMEOUT,
+        max_pending_requests=DEFAULT_MAX_PENDING_REQUESTS,
+        apps=None,
     ):
         """
         Initializes the media websocket server.
@@ -179,13 +1012,18 @@ class AstAriWebSocketServer(AstAriWebSocket):
         :param protocol: The protocol to use for the websocket. Default "ari".
         :param tag: Optional tag for logging.
         :param log_level: Optional logging level for the server.
+        :param request_timeout: Default number of seconds to wait for a REST response.
+        :param max_pending_requests: Maximum number of REST requests in flight.
+        :param apps: Optional list of the ARI applications Asterisk connects
+        for, to set their event filters on connect.  Otherwise the filter is
+        set when the first event for an application arrives.
         """
-        super().__init__(tag, log_level)
+        super().__init__(tag, log_level, request_timeout, max_pending_requests)
         self.host = host
         self.port = port
         self.credentials = credentials
+        self.filter_apps = list(apps or [])
         self.protocol = protocol
-        self.websocket = None
         self.server = None
 
     async def listen(self):
@@ -217,24 +1055,108 @@ class AstAriWebSocketServer(AstAriWebSocket):
 
 
 class AstAriWebSocketClient(AstAriWebSocket):
-    def __init__(self, host, port, app, credentials, tag=None, log_level=None):
+    # Reconnect backoff bounds and dead peer detection, in seconds.
+    reconnect_min_delay = 0.5
+    reconnect_max_delay = 30.0
+    ping_interval = 5.0
+    ping_timeout = 5.0
+
+    def __init__(
+        self,
+        host,
+        port,
+        app,
+        credentials,
+        tag=None,
+        log_level=None,
+        request_timeout=DEFAULT_REQUEST_TIMEOUT,
+        max_pending_requests=DEFAULT_MAX_PENDING_REQUESTS,
+    ):
         """
         Initializes the media websocket client.
         :param uri: The URI to connect to the media websocket.
         :param tag: Optional tag for logging.
+        :param request_timeout: Default number of seconds to wait for a REST response.
+        :param max_pending_requests: Maximum number of REST requests in flight.
         """
-        super().__init__(tag, log_level)
+        super().__init__(tag, log_level, request_timeout, max_pending_requests)
         self.host = host
         self.port = port
         self.app = app
         self.credentials = credentials
+        self.filter_apps = app.split(",")
+        self.stop_event = asyncio.Event()
 
-    async def connect(self):
+    async def connect(self, reconnect=True):
         """
         Connects to the ARI WebSocket server.
         This method is used for client connections to the Asterisk ARI server.
+        Unless reconnect is False, the connection is re-established with
+        jittered exponential backoff whenever it drops or a ping goes
+        unanswered, and the local state is resynchronized afterwards.
+        Returns when stop() is called.
+        :param reconnect: Whether to reconnect after the connection drops.
         """
         uri = f"ws://{self.host}:{self.port}/ari/events?subscribeAll=false&app={self.app}&api_key={':'.join(self.credentials)}"
-        self.log(INFO, f"Connecting to ARI at {uri}")
-        async with connect(uri) as websocket:
-            await self.handle_connection(websocket)
+        self.stop_event.clear()
+        delay = self.reconnect_min_delay
+        connected_before = False
+        while not self.stop_event.is_set():
+            self.log(INFO, f"Connecting to ARI at {uri}")
+            try:
+                async with connect(
+                    uri,
+                    ping_interval=self.ping_interval,
+                    ping_timeout=self.ping_timeout,
+                ) as websocket:
+                    delay = self.reconnect_min_delay
+                    if connected_before:
+                        asyncio.create_task(self.resync())
+                    connected_before = True
+                    await self.handle_connection(websocket)
+            except (OSError, TimeoutError, ConnectionClosed, InvalidHandshake) as e:
+                self.log(WARNING, f"ARI connection failed: {e}")
+            if not reconnect or self.stop_event.is_set():
+                break
+            wait = random.uniform(delay / 2, delay)
+            self.log(INFO, f"Reconnecting to ARI in {wait:.1f}s")
+            try:
+                # Ends the wait early if stop() is called.
+                await asyncio.wait_for(self.stop_event.wait(), wait)
+            except TimeoutError:
+                pass
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def stop(self):
+        """
+        Closes the connection and stops reconnecting.
+        """
+        self.stop_event.set()
+        if self.websocket is not None:
+            self.log(INFO, "Stopping ARI client")
+            await self.websocket.close()
+
+    async def resync(self):
+        """
+        Pulls the current channels and bridges from Asterisk after a
+        reconnect and passes them to reconcile().
+        """
+        try:
+            channels, bridges = await asyncio.gather(
+                self.channels.list(), self.bridges.list()
+            )
+        except Exception as e:
+            self.log(WARNING, f"ARI resync failed: {e}")
+            return
+        self.log(INFO, f"ARI resync: {len(channels)} channels, {len(bridges)} bridges")
+        await self.reconcile(channels, bridges)
+
+    async def reconcile(self, channels, bridges):
+        """
+        Called after a reconnect with the channels and bridges that exist in
+        Asterisk.  Override to drop or repair local state for calls that
+        changed while disconnected.
+        :param channels: List of channel objects.
+        :param bridges: List of bridge objects.
+        """
+        pass
@@ -0,0 +1,216 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import asyncio
+from logging import INFO, DEBUG
+
+
+class CallSetupStep:
+    def __init__(self, name, action, after=(), merge_key=None, merge_value=None):
+        """
+        A single step of a call setup plan.
+        :param name: Unique name of the step.
+        :param action: A callable taking the AstAriWebSocket and returning an awaitable.
+        Mergeable steps are given the list of merged values instead.
+        :param after: Names of the steps that must complete before this one starts.
+        :param merge_key: Steps with the same merge_key and dependencies are
+        combined into a single request.
+        :param merge_value: This step's contribution to a merged request.
+        """
+        self.name = name
+        self.action = action
+        self.after = tuple(after)
+        self.merge_key = merge_key
+        self.merge_value = merge_value
+        self.values = None
+
+
+class CallSetupPlan:
+    def __init__(self):
+        """
+        A declared call setup sequence (bridge/channel/answer...) that is run
+        as a dependency graph.  Steps whose dependencies have completed run
+        concurrently and batchable steps are merged into a single request.
+        """
+        self.steps = {}
+        self.results = {}
+        self.timings = {}
+
+    def step(self, name, action, after=()):
+        """
+        Adds a generic step.
+        :param name: Unique name of the step.
+        :param action: A callable taking the AstAriWebSocket and returning an awaitable.
+        :param after: Names of the steps that must complete before this one starts.
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate call setup step '{name}'")
+        self.steps[name] = CallSetupStep(name, action, after)
+        return self
+
+    def request(self, name, method, uri, after=(), **kwargs):
+        """
+        Adds a step that sends a raw REST request.
+        :param name: Unique name of the step.
+        :param method: The HTTP method of the request.
+        :param uri: The URI of the request.
+        :param after: Names of the steps that must complete before this one starts.
+        :param kwargs: Additional send_request parameters.
+        """
+        return self.step(
+            name, lambda ari: ari.api_request(method, uri, **kwargs), after
+        )
+
+    def create_bridge(self, name, bridge_id, bridge_type="mixing", after=()):
+        """
+        Adds a step that creates a bridge.
+        :param name: Unique name of the step.
+        :param bridge_id: The id of the bridge to create.
+        :param bridge_type: The bridge type.  Default "mixing".
+        :param after: Names of the steps that must complete before this one starts.
+        """
+        return self.step(
+            name,
+            lambda ari: ari.bridges.create_with_id(bridge_id, bridge_type=bridge_type),
+            after,
+        )
+
+    def add_channel(self, name, bridge_id, channel, after=()):
+        """
+        Adds a step that adds a channel to a bridge.  add_channel steps for
+        the same bridge with the same dependencies are sent as one
+        addChannel request with a comma separated channel list.
+        :param name: Unique name of the step.
+        :param bridge_id: The id of the bridge.
+        :param channel: The id of the channel to add.
+        :param after: Names of the steps that must complete before this one starts.
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate call setup step '{name}'")
+        self.steps[name] = CallSetupStep(
+            name,
+            lambda ari, channels: ari.bridges.add_channel(
+                bridge_id, ",".join(channels)
+            ),
+            after,
+            merge_key=("addChannel", bridge_id, frozenset(after)),
+            merge_value=channel,
+        )
+        return self
+
+    def answer(self, name, channel_id, after=()):
+        """
+        Adds a step that answers a channel.
+        :param name: Unique name of the step.
+        :param channel_id: The id of the channel to answer.
+        :param after: Names of the steps that must complete before this one starts.
+        """
+        return self.step(name, lambda ari: ari.channels.answer(channel_id), after)
+
+    def merged_steps(self):
+        """
+        Combines mergeable steps and checks the dependency graph.
+        :return: A tuple of (list of steps to run, dict mapping every declared
+        step name to the name of the step that runs it).
+        """
+        steps = []
+        owner = {}
+        groups = {}
+        for step in self.steps.values():
+            if step.merge_key is None:
+                steps.append(step)
+                owner[step.name] = step.name
+                continue
+            group = groups.get(step.merge_key)
+            if group is None:
+                group = CallSetupStep(step.name, step.action, step.after)
+                group.values = []
+                groups[step.merge_key] = group
+                steps.append(group)
+            group.values.append(step.merge_value)
+            owner[step.name] = group.name
+
+        for step in steps:
+            for dep in step.after:
+                if dep not in owner:
+                    raise ValueError(f"Step '{step.name}' depends on unknown '{dep}'")
+
+        # Kahn's algorithm, only to reject cycles before anything is sent.
+        indegree = {s.name: len(set(owner[d] for d in s.after)) for s in steps}
+        dependents = {s.name: [] for s in steps}
+        for step in steps:
+            for dep in set(owner[d] for d in step.after):
+                dependents[dep].append(step.name)
+        ready = [name for name, count in indegree.items() if count == 0]
+        seen = 0
+        while ready:
+            name = ready.pop()
+            seen += 1
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if seen != len(steps):
+            raise ValueError("Call setup plan has a dependency cycle")
+        return steps, owner
+
+    async def run(self, ari):
+        """
+        Runs the plan.  Each step starts as soon as its dependencies have
+        completed.  If any step fails, the steps still running are cancelled
+        and the exception is raised.
+        :param ari: The AstAriWebSocket to send the requests on.
+        :return: A dict mapping step names to their results.  Merged steps
+        share a result.  Per-step timings are left in self.timings as
+        {"start": seconds from the start of the plan, "duration": seconds}.
+        """
+        steps, owner = self.merged_steps()
+        loop = asyncio.get_running_loop()
+        plan_start = loop.time()
+        tasks = {}
+        self.results = {}
+        self.timings = {}
+
+        async def run_step(step):
+            for dep in step.after:
+                await tasks[owner[dep]]
+            start = loop.time()
+            if step.values is not None:
+                result = await step.action(ari, step.values)
+            else:
+                result = await step.action(ari)
+            self.timings[step.name] = {
+                "start": start - plan_start,
+                "duration": loop.time() - start,
+            }
+            return result
+
+        for step in steps:
+            tasks[step.name] = asyncio.create_task(run_step(step))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        for name, step_name in owner.items():
+            self.results[name] = tasks[step_name].result()
+            self.timings[name] = self.timings[step_name]
+        ari.log(
+            DEBUG,
+            "Call setup: "
+            + " ".join(
+                f"{name}={t['start'] * 1000:.1f}+{t['duration'] * 1000:.1f}ms"
+                for name, t in self.timings.items()
+            ),
+        )
+        ari.log(
+            INFO, f"Call setup completed in {(loop.time() - plan_start) * 1000:.1f}ms"
+        )
+        return self.results
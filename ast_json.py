@@ -0,0 +1,86 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Pluggable JSON codec for ARI messages.
+
+The fastest available backend is chosen at import time (orjson, ujson,
+then the standard library) unless the AST_JSON_CODEC environment
+variable names one.  Callers should use ast_json.loads() and
+ast_json.dumpb() rather than importing the functions directly so a later
+set_codec() takes effect everywhere.
+"""
+
+import json
+import os
+
+
+def _stdlib_codec():
+    encoder = json.JSONEncoder(separators=(",", ":"))
+    return json.loads, lambda obj: encoder.encode(obj).encode("utf-8")
+
+
+def _ujson_codec():
+    import ujson
+
+    # ujson escapes "/" by default which Asterisk doesn't need.
+    return ujson.loads, lambda obj: ujson.dumps(
+        obj, escape_forward_slashes=False
+    ).encode("utf-8")
+
+
+def _orjson_codec():
+    import orjson
+
+    return orjson.loads, orjson.dumps
+
+
+CODECS = {
+    "orjson": _orjson_codec,
+    "ujson": _ujson_codec,
+    "json": _stdlib_codec,
+}
+
+name = None
+loads = None
+dumpb = None
+
+
+def set_codec(codec=None):
+    """
+    Selects the JSON backend.
+    :param codec: "orjson", "ujson" or "json".  If None, the first one of
+    those that can be imported is used.
+    :return: The name of the selected backend.
+    :raises ValueError: If the requested backend isn't one of those.
+    :raises ImportError: If the requested backend isn't installed.
+    """
+    global name, loads, dumpb
+    if codec is not None and codec not in CODECS:
+        raise ValueError(
+            f"Unknown JSON codec '{codec}'.  Use one of: {', '.join(CODECS)}"
+        )
+    candidates = list(CODECS) if codec is None else [codec]
+    for candidate in candidates:
+        try:
+            loads, dumpb = CODECS[candidate]()
+        except ImportError:
+            if codec is not None:
+                raise
+            continue
+        name = candidate
+        return name
+
+
+def dumps(obj):
+    """
+    Encodes an object to a JSON string with the selected backend.
+    Use dumpb() when the result is going straight to a socket.
+    """
+    return dumpb(obj).decode("utf-8")
+
+
+set_codec(os.environ.get("AST_JSON_CODEC") or None)
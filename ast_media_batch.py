@@ -0,0 +1,173 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import logging
+from logging import INFO, WARNING, ERROR, DEBUG, NOTSET
+import traceback
+import numpy as np
+import ast_media_codec as codec
+from ast_media_clock import get_default_clock
+
+DEFAULT_CAPACITY = 256
+
+
+def grow_array(array, size):
+    """
+    Returns array extended with zeros to size entries.
+    """
+    return np.concatenate((array, np.zeros(size - len(array), dtype=array.dtype)))
+
+
+class BatchProcessor:
+    def __init__(self, listener, clock=None, tag=None, log_level=None):
+        """
+        Base class for analysis that runs on many streams at once.  Each
+        stream gets a slot, feed() only queues a frame, and the queued
+        frames of every stream are decoded and passed to classify() in
+        one batch on the next MediaClock tick.  Subclasses keep their per
+        stream state in arrays indexed by slot and call notify() to report
+        results.
+        :param listener: Called with a stream's key and a result.
+        :param clock: Optional MediaClock.  Defaults to the shared one.
+        :param tag: Optional tag for logging.
+        :param log_level: Optional log level.  One of logging.LOG_LEVEL.
+        """
+        self.listener = listener
+        self.clock = clock or get_default_clock()
+        self.keys = [None] * DEFAULT_CAPACITY
+        self.formats = [None] * DEFAULT_CAPACITY
+        self.free = list(range(DEFAULT_CAPACITY - 1, -1, -1))
+        # Each round holds at most one frame per stream so the state of a
+        # stream that had several frames queued is updated in order.
+        self.rounds = []
+        self.queued = {}
+        self.frames = 0
+        self.logger = logging.getLogger(__name__)
+        self.tag = tag
+        if log_level is not None:
+            self.logger.setLevel(log_level)
+
+    def log(self, level, message):
+        """
+        Logs a message with the tag.
+        :param level: The logging level (e.g., info, warning, error).
+        :param message: The message to log.
+        """
+        tag = "" if self.tag is None else f"{self.tag}: "
+        self.logger.log(level, f"{tag}{message}")
+
+    def __len__(self):
+        return len(self.keys) - len(self.free)
+
+    def add(self, key, fmt):
+        """
+        Starts tracking a stream.
+        :param key: Passed to the listener to identify the stream.
+        :param fmt: The stream's media format.  One of codec.SAMPLE_RATES.
+        :return: The slot to pass to feed() and remove().
+        :raises ValueError: If the format isn't supported.
+        """
+        codec.check_format(fmt)
+        if not self.free:
+            size = len(self.keys)
+            self.keys.extend([None] * size)
+            self.formats.extend([None] * size)
+            self.free.extend(range(2 * size - 1, size - 1, -1))
+            self.resize(2 * size)
+        slot = self.free.pop()
+        self.keys[slot] = key
+        self.formats[slot] = fmt
+        self.reset(slot)
+        return slot
+
+    def remove(self, slot):
+        """
+        Stops tracking a stream.  Frames it still has queued are dropped.
+        :param slot: The slot add() returned.
+        """
+        # add() can hand the slot straight to a new stream, whose state
+        # the old stream's frames mustn't reach.
+        for entries in self.rounds[: self.queued.pop(slot, 0)]:
+            entries[:] = [entry for entry in entries if entry[0] != slot]
+        self.keys[slot] = None
+        self.formats[slot] = None
+        self.free.append(slot)
+
+    def feed(self, slot, frame):
+        """
+        Queues a frame from a stream.
+        :param slot: The slot add() returned.
+        :param frame: bytes-like audio in the stream's format.
+        """
+        if not isinstance(frame, bytes):
+            # Frames are kept until the next tick, possibly longer than a
+            # borrowed view stays valid.
+            frame = bytes(frame)
+        index = self.queued.get(slot, 0)
+        if index == len(self.rounds):
+            if not self.rounds:
+                self.clock.add(self)
+            self.rounds.append([])
+        self.rounds[index].append((slot, frame))
+        self.queued[slot] = index + 1
+
+    async def tick(self, now):
+        self.clock.remove(self)
+        self.process()
+
+    def process(self):
+        """
+        Runs classify() on every queued frame.
+        """
+        rounds = self.rounds
+        self.rounds = []
+        self.queued = {}
+        for entries in rounds:
+            groups = {}
+            for slot, frame in entries:
+                fmt = self.formats[slot]
+                if fmt is not None:
+                    groups.setdefault((fmt, len(frame)), []).append((slot, frame))
+            for (fmt, _), group in groups.items():
+                slots = np.fromiter(
+                    (slot for slot, _ in group), dtype=np.intp, count=len(group)
+                )
+                samples = codec.decode_batch([frame for _, frame in group], fmt)
+                self.frames += len(group)
+                self.classify(fmt, slots, samples)
+
+    def notify(self, slot, result):
+        """
+        Calls the listener for a stream.
+        """
+        try:
+            self.listener(self.keys[slot], result)
+        except Exception as e:
+            self.log(ERROR, f"Listener failed: {e}")
+            traceback.print_exc()
+
+    def reset(self, slot):
+        """
+        Initializes a new stream's state.
+        """
+        pass
+
+    def resize(self, size):
+        """
+        Grows the per stream state arrays to size slots.
+        """
+        pass
+
+    def classify(self, fmt, slots, samples):
+        """
+        Processes one frame from each of a group of streams.
+        :param fmt: The streams' media format.
+        :param slots: ndarray of the streams' slots.
+        :param samples: int16 ndarray with one frame per row.
+        """
+        raise NotImplementedError
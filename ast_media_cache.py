@@ -0,0 +1,222 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import asyncio
+from collections import OrderedDict
+import glob
+import logging
+from logging import INFO, WARNING, ERROR, DEBUG, NOTSET
+import os
+
+DEFAULT_BUDGET = 64 * 1024 * 1024
+# 20ms of ulaw.
+DEFAULT_WARM_FRAME_SIZES = (160,)
+
+
+class PromptFrames:
+    __slots__ = ("view", "frame_size", "count")
+
+    def __init__(self, data, frame_size):
+        """
+        A prompt's audio as a sequence of frame_size memoryviews.  Frames
+        are sliced from the audio as they're asked for instead of kept in a
+        list, so a split costs a few bytes however long the prompt is.
+        :param data: bytes-like audio.
+        :param frame_size: Bytes per frame.  The last frame may be short.
+        """
+        self.view = memoryview(data)
+        self.frame_size = frame_size
+        self.count = -(-len(self.view) // frame_size)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("frame index out of range")
+        start = index * self.frame_size
+        return self.view[start : start + self.frame_size]
+
+
+class Prompt:
+    __slots__ = ("filename", "data", "frames")
+
+    def __init__(self, filename, data):
+        """
+        One cached audio file and its frame splits.
+        :param filename: The file the audio was loaded from.
+        :param data: The file contents.
+        """
+        self.filename = filename
+        self.data = data
+        self.frames = {}
+
+    def split(self, frame_size):
+        """
+        Returns the audio split into frame_size memoryviews.
+        :param frame_size: Bytes per frame.
+        :return: A PromptFrames.
+        """
+        frames = self.frames.get(frame_size)
+        if frames is None:
+            frames = PromptFrames(self.data, frame_size)
+            self.frames[frame_size] = frames
+        return frames
+
+
+class PromptCache:
+    def __init__(self, budget=DEFAULT_BUDGET, tag=None, log_level=None):
+        """
+        Keeps audio files in memory so every playback of a prompt shares
+        one copy of the audio.  Files are read on
+        a worker thread the first time they're asked for and the least
+        recently used ones are evicted once the cache holds more than
+        budget bytes.  Evicting a prompt doesn't affect playbacks that are
+        already using its frames.
+        :param budget: Most bytes of audio to keep.
+        :param tag: Optional tag for logging.
+        :param log_level: Optional log level.  One of logging.LOG_LEVEL.
+        """
+        self.budget = budget
+        self.prompts = OrderedDict()
+        self.loading = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.logger = logging.getLogger(__name__)
+        self.tag = tag
+        if log_level is not None:
+            self.logger.setLevel(log_level)
+
+    def log(self, level, message):
+        """
+        Logs a message with the tag.
+        :param level: The logging level (e.g., info, warning, error).
+        :param message: The message to log.
+        """
+        tag = "" if self.tag is None else f"{self.tag}: "
+        self.logger.log(level, f"{tag}{message}")
+
+    def __len__(self):
+        return len(self.prompts)
+
+    def __contains__(self, filename):
+        return os.path.normpath(filename) in self.prompts
+
+    @staticmethod
+    def read(filename):
+        with open(filename, "rb") as f:
+            return f.read()
+
+    async def get(self, filename):
+        """
+        Returns the cached Prompt for a file, loading it if needed.
+        Concurrent requests for a file that's still loading share one read.
+        :param filename: The path to the audio file.
+        :raises OSError: If the file can't be read.
+        """
+        filename = os.path.normpath(filename)
+        prompt = self.prompts.get(filename)
+        if prompt is not None:
+            self.hits += 1
+            self.prompts.move_to_end(filename)
+            return prompt
+        self.misses += 1
+        future = self.loading.get(filename)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, self.read, filename)
+            self.loading[filename] = future
+            try:
+                data = await future
+            finally:
+                del self.loading[filename]
+            return self.add(filename, data)
+        await future
+        return self.prompts.get(filename) or Prompt(filename, future.result())
+
+    async def frames(self, filename, frame_size):
+        """
+        Returns a file split into frame_size memoryviews.
+        :param filename: The path to the audio file.
+        :param frame_size: Bytes per frame.
+        :return: A PromptFrames.
+        """
+        prompt = await self.get(filename)
+        return prompt.split(frame_size)
+
+    def add(self, filename, data):
+        """
+        Adds audio that's already in memory, replacing any cached copy.
+        :param filename: The name to cache it under.
+        :param data: bytes-like audio.
+        :return: The Prompt.
+        """
+        filename = os.path.normpath(filename)
+        self.remove(filename)
+        prompt = Prompt(filename, data)
+        self.prompts[filename] = prompt
+        self.size += len(data)
+        while self.size > self.budget and len(self.prompts) > 1:
+            _, evicted = self.prompts.popitem(last=False)
+            self.size -= len(evicted.data)
+            self.evictions += 1
+            self.log(DEBUG, f"Evicted '{evicted.filename}'")
+        if self.size > self.budget:
+            self.log(WARNING, f"'{filename}' is larger than the cache budget")
+        return prompt
+
+    def remove(self, filename):
+        """
+        Drops a file from the cache so the next get() reads it again.
+        :param filename: The path to the audio file.
+        """
+        prompt = self.prompts.pop(os.path.normpath(filename), None)
+        if prompt is not None:
+            self.size -= len(prompt.data)
+
+    async def warm(
+        self, directory, pattern="*.ulaw", frame_sizes=DEFAULT_WARM_FRAME_SIZES
+    ):
+        """
+        Loads every matching file in a directory and pre-splits it so the
+        first callers don't wait on disk.
+        :param directory: The directory to load from.
+        :param pattern: glob pattern of the files to load.
+        :param frame_sizes: Frame sizes to split each file into.
+        :return: The number of files loaded.
+        """
+        count = 0
+        for filename in sorted(glob.glob(os.path.join(directory, pattern))):
+            try:
+                prompt = await self.get(filename)
+            except OSError as e:
+                self.log(ERROR, f"Unable to load '{filename}': {e}")
+                continue
+            for frame_size in frame_sizes:
+                prompt.split(frame_size)
+            count += 1
+        self.log(INFO, f"Loaded {count} prompts, {self.size} bytes")
+        return count
+
+
+default_cache = None
+
+
+def get_default_cache():
+    """
+    Returns the process wide prompt cache shared by media connections that
+    weren't given their own.
+    """
+    global default_cache
+    if default_cache is None:
+        default_cache = PromptCache()
+    return default_cache
@@ -0,0 +1,121 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import asyncio
+import logging
+from logging import INFO, WARNING, ERROR, DEBUG, NOTSET
+import traceback
+
+DEFAULT_TICK_INTERVAL = 0.01
+# If the loop falls further behind than this many ticks, skip ahead
+# instead of firing the missed ticks back-to-back.
+MAX_CATCHUP_TICKS = 10
+
+
+class MediaClock:
+    def __init__(self, interval=DEFAULT_TICK_INTERVAL, tag=None, log_level=None):
+        """
+        A single monotonic tick that drives every registered media stream.
+        Ticks are scheduled against absolute deadlines so sleep overshoot
+        doesn't accumulate as drift.  The clock only runs while it has
+        streams.
+        :param interval: Seconds between ticks.
+        :param tag: Optional tag for logging.
+        :param log_level: Optional log level.  One of logging.LOG_LEVEL.
+        """
+        self.interval = interval
+        self.streams = set()
+        self.task = None
+        self.ticks = 0
+        self.late_ticks = 0
+        self.skipped_ticks = 0
+        self.max_lateness = 0.0
+        self.logger = logging.getLogger(__name__)
+        self.tag = tag
+        if log_level is not None:
+            self.logger.setLevel(log_level)
+
+    def log(self, level, message):
+        """
+        Logs a message with the tag.
+        :param level: The logging level (e.g., info, warning, error).
+        :param message: The message to log.
+        """
+        tag = "" if self.tag is None else f"{self.tag}: "
+        self.logger.log(level, f"{tag}{message}")
+
+    def add(self, stream):
+        """
+        Registers a stream.  Its tick(now) coroutine is awaited on every
+        tick until it's removed.  A stream whose tick() raises is removed,
+        and its fail(exception) method is called if it has one.
+        :param stream: An object with an async tick(now) method.
+        """
+        self.streams.add(stream)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def remove(self, stream):
+        """
+        Unregisters a stream.  Safe to call from the stream's own tick.
+        :param stream: The stream to remove.
+        """
+        self.streams.discard(stream)
+
+    def now(self):
+        return asyncio.get_running_loop().time()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tick = 0
+        try:
+            while self.streams:
+                tick += 1
+                deadline = start + tick * self.interval
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                lateness = loop.time() - deadline
+                if lateness > self.max_lateness:
+                    self.max_lateness = lateness
+                if lateness > self.interval:
+                    self.late_ticks += 1
+                    if lateness > self.interval * MAX_CATCHUP_TICKS:
+                        skipped = int(lateness / self.interval)
+                        self.skipped_ticks += skipped
+                        tick += skipped
+                        self.log(WARNING, f"Media clock {lateness * 1000:.0f}ms late")
+                self.ticks += 1
+                now = loop.time()
+                for stream in list(self.streams):
+                    try:
+                        await stream.tick(now)
+                    except Exception as e:
+                        self.log(ERROR, f"Media stream failed: {e}")
+                        traceback.print_exc()
+                        self.streams.discard(stream)
+                        fail = getattr(stream, "fail", None)
+                        if fail is not None:
+                            fail(e)
+        finally:
+            self.task = None
+
+
+default_clock = None
+
+
+def get_default_clock():
+    """
+    Returns the process wide clock shared by media connections that
+    weren't given their own.
+    """
+    global default_clock
+    if default_clock is None:
+        default_clock = MediaClock()
+    return default_clock
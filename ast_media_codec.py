@@ -0,0 +1,286 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Audio format conversion for chan_websocket media.
+
+Supports the formats Asterisk names ulaw, alaw, slin (8kHz) and slin16
+(16kHz), all of which carry 16 bit little endian samples once decoded.
+Everything is done with NumPy lookup tables and array arithmetic so
+converting a frame, or a whole batch of frames from different sessions,
+never loops over samples in Python.  Requires numpy.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SAMPLE_RATES = {
+    "ulaw": 8000,
+    "alaw": 8000,
+    "slin": 8000,
+    "slin16": 16000,
+}
+
+SLIN_DTYPE = np.dtype("<i2")
+
+# Taps in the 8kHz <-> 16kHz anti-aliasing filter.  Must be even.
+RESAMPLER_TAPS = 48
+# Passband edge as a fraction of the 16kHz rate (3.6kHz).
+RESAMPLER_CUTOFF = 0.225
+
+
+def _ulaw_decode_table():
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    sample = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(u & 0x80, -sample, sample).astype(np.int16)
+
+
+def _ulaw_encode_table():
+    pcm = np.arange(-32768, 32768, dtype=np.int32)
+    sign = np.where(pcm < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(pcm), 32635) + 0x84
+    exponent = np.maximum(np.floor(np.log2(magnitude >> 7)).astype(np.int32), 0)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return _by_uint16(~(sign | (exponent << 4) | mantissa) & 0xFF)
+
+
+def _alaw_decode_table():
+    a = np.arange(256, dtype=np.int32) ^ 0x55
+    t = (a & 0x0F) << 4
+    seg = (a & 0x70) >> 4
+    t = np.where(seg == 0, t + 8, (t + 0x108) << np.maximum(seg - 1, 0))
+    return np.where(a & 0x80, t, -t).astype(np.int16)
+
+
+def _alaw_encode_table():
+    pcm = np.arange(-32768, 32768, dtype=np.int32) >> 3
+    mask = np.where(pcm >= 0, 0xD5, 0x55)
+    pcm = np.where(pcm >= 0, pcm, -pcm - 1)
+    seg_end = np.array([0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF])
+    seg = np.searchsorted(seg_end, pcm)
+    aval = np.where(
+        seg < 2, (seg << 4) | ((pcm >> 1) & 0x0F), (seg << 4) | ((pcm >> seg) & 0x0F)
+    )
+    aval = np.where(seg >= 8, 0x7F, aval)
+    return _by_uint16(aval ^ mask)
+
+
+def _by_uint16(table):
+    # The tables above are built for samples -32768..32767.  Rotate them
+    # so they can be indexed by a uint16 view of the samples.
+    return np.roll(table.astype(np.uint8), -32768)
+
+
+DECODE_TABLES = {
+    "ulaw": _ulaw_decode_table(),
+    "alaw": _alaw_decode_table(),
+}
+
+ENCODE_TABLES = {
+    "ulaw": _ulaw_encode_table(),
+    "alaw": _alaw_encode_table(),
+}
+
+
+def check_format(fmt):
+    if fmt not in SAMPLE_RATES:
+        raise ValueError(f"Unsupported media format '{fmt}'")
+
+
+def bytes_per_sample(fmt):
+    check_format(fmt)
+    return 1 if fmt in DECODE_TABLES else 2
+
+
+def decode(data, fmt, out=None):
+    """
+    Decodes one frame to linear samples.
+    :param data: bytes-like audio in fmt.
+    :param fmt: One of SAMPLE_RATES.
+    :param out: Optional int16 ndarray to decode into instead of
+    allocating.  Only as many samples as it holds are read from data.
+    :return: An int16 ndarray, or out.  For slin and slin16 without out
+    it's a view of data.
+    """
+    check_format(fmt)
+    table = DECODE_TABLES.get(fmt)
+    count = -1 if out is None else out.size
+    if table is None:
+        samples = np.frombuffer(data, dtype=SLIN_DTYPE, count=count)
+        if out is None:
+            return samples
+        out[...] = samples
+        return out
+    if out is None:
+        return table[np.frombuffer(data, dtype=np.uint8)]
+    np.take(table, np.frombuffer(data, dtype=np.uint8, count=count), out=out)
+    return out
+
+
+def encode(samples, fmt, out=None):
+    """
+    Encodes linear samples.
+    :param samples: An int16 ndarray of any shape.
+    :param fmt: One of SAMPLE_RATES.
+    :param out: Optional writable buffer of exactly the encoded size to
+    encode into instead of allocating.
+    :return: bytes in fmt, or out.
+    """
+    check_format(fmt)
+    table = ENCODE_TABLES.get(fmt)
+    samples = np.asarray(samples, dtype=SLIN_DTYPE)
+    if out is not None:
+        if table is None:
+            np.frombuffer(out, dtype=SLIN_DTYPE)[:] = samples.ravel()
+        else:
+            target = np.frombuffer(out, dtype=np.uint8)
+            np.take(table, samples.view(np.uint16).ravel(), out=target)
+        return out
+    if table is None:
+        return samples.tobytes()
+    return table[samples.view(np.uint16)].tobytes()
+
+
+def decode_batch(frames, fmt):
+    """
+    Decodes equal length frames from any number of sessions in one call.
+    :param frames: A sequence of bytes-like frames in fmt.
+    :param fmt: One of SAMPLE_RATES.
+    :return: An int16 ndarray with one row per frame.
+    """
+    return decode(b"".join(frames), fmt).reshape(len(frames), -1)
+
+
+def encode_batch(samples, fmt):
+    """
+    Encodes a 2D array of samples, one row per session.
+    :param samples: An int16 ndarray with one row per frame.
+    :param fmt: One of SAMPLE_RATES.
+    :return: A list of bytes, one per row.
+    """
+    data = encode(samples, fmt)
+    size = len(data) // len(samples)
+    view = memoryview(data)
+    return [view[i : i + size] for i in range(0, len(data), size)]
+
+
+def _design_filter(taps=RESAMPLER_TAPS, cutoff=RESAMPLER_CUTOFF):
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(taps, 8.0)
+    return (h / h.sum()).astype(np.float32)
+
+
+FILTER = _design_filter()
+# The filter reversed to apply to windows in time order.  Upsampling uses
+# its two polyphase branches as the columns of one matrix, with a gain of
+# 2 to make up for the zeros that upsampling notionally inserts.
+UP_PHASES = np.stack((FILTER[0::2][::-1], FILTER[1::2][::-1]), axis=1) * 2
+DOWN_TAPS = np.ascontiguousarray(FILTER[::-1])
+
+
+def _clip(samples):
+    return np.clip(np.rint(samples), -32768, 32767).astype(np.int16)
+
+
+class Resampler:
+    __slots__ = ("up", "history")
+
+    def __init__(self, up):
+        """
+        Converts between 8kHz and 16kHz with a polyphase FIR filter.  The
+        filter history is carried from one frame to the next so frame
+        boundaries don't click.  Use one Resampler per stream and
+        direction.
+        :param up: True for 8kHz to 16kHz, False for 16kHz to 8kHz.
+        """
+        self.up = up
+        self.history = np.zeros(self.history_size(), dtype=np.float32)
+
+    def history_size(self):
+        return (RESAMPLER_TAPS // 2 if self.up else RESAMPLER_TAPS) - 1
+
+    def process(self, samples):
+        """
+        Resamples one frame.
+        :param samples: An int16 ndarray.  Its length must be even when
+        downsampling.
+        :return: An int16 ndarray twice or half as long.
+        """
+        history = self.history[np.newaxis]
+        out, history = resample(self.up, history, np.asarray(samples)[np.newaxis])
+        self.history = history[0]
+        return out[0]
+
+    def reset(self):
+        self.history[:] = 0
+
+
+def resample(up, history, samples):
+    """
+    Resamples a 2D array of frames, one row per stream.
+    :param up: True for 8kHz to 16kHz, False for 16kHz to 8kHz.
+    :param history: float32 ndarray of each stream's filter history.
+    :param samples: int16 ndarray of each stream's next frame.
+    :return: (resampled int16 ndarray, new history).
+    """
+    x = np.concatenate((history, samples.astype(np.float32)), axis=1)
+    keep = history.shape[1]
+    if up:
+        windows = sliding_window_view(x, keep + 1, axis=1)
+        out = (windows @ UP_PHASES).reshape(len(samples), -1)
+    else:
+        windows = sliding_window_view(x, keep + 1, axis=1)[:, 1::2]
+        out = windows @ DOWN_TAPS
+    return _clip(out), x[:, x.shape[1] - keep :].copy()
+
+
+def resample_batch(resamplers, samples):
+    """
+    Resamples one frame from each of many streams in one call.  All of
+    the resamplers must go the same direction.
+    :param resamplers: A sequence of Resamplers, one per row of samples.
+    :param samples: int16 ndarray with one equal length frame per row.
+    :return: An int16 ndarray with one resampled frame per row.
+    """
+    up = resamplers[0].up
+    history = np.stack([r.history for r in resamplers])
+    out, history = resample(up, history, samples)
+    for resampler, row in zip(resamplers, history):
+        resampler.history = row
+    return out
+
+
+class Transcoder:
+    __slots__ = ("source", "target", "resampler")
+
+    def __init__(self, source, target):
+        """
+        Converts a stream of frames from one format to another, resampling
+        if the rates differ.
+        :param source: The input format.
+        :param target: The output format.
+        :raises ValueError: If either format isn't supported.
+        """
+        check_format(source)
+        check_format(target)
+        self.source = source
+        self.target = target
+        self.resampler = None
+        if SAMPLE_RATES[source] != SAMPLE_RATES[target]:
+            self.resampler = Resampler(SAMPLE_RATES[target] > SAMPLE_RATES[source])
+
+    def process(self, data):
+        """
+        Converts one frame.
+        :param data: bytes-like audio in the source format.
+        :return: bytes in the target format.
+        """
+        samples = decode(data, self.source)
+        if self.resampler is not None:
+            samples = self.resampler.process(samples)
+        return encode(samples, self.target)
@@ -0,0 +1,145 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import numpy as np
+import ast_media_codec as codec
+from ast_media_batch import BatchProcessor, grow_array
+
+ROW_FREQUENCIES = (697, 770, 852, 941)
+COLUMN_FREQUENCIES = (1209, 1336, 1477, 1633)
+DIGITS = "123A456B789C*0#D"
+
+# Minimum mean power of a frame in dBFS.
+DEFAULT_MIN_LEVEL_DB = -40.0
+# Minimum share of the frame's energy in the strongest row and column tone.
+DEFAULT_TONE_RATIO = 0.6
+# Allowed column to row power ratio in dB.  Columns may be up to 8dB
+# weaker (normal twist) or 4dB stronger (reverse twist) than rows.
+DEFAULT_TWIST_DB = (-8.0, 4.0)
+# The second strongest tone in each group must be this much weaker.
+DEFAULT_GROUP_MARGIN_DB = 6.0
+# Consecutive frames a digit must be present for to be reported.
+DEFAULT_HITS = 2
+
+_bases = {}
+
+
+def goertzel_basis(rate, length):
+    """
+    Returns the cosine and sine terms of the Goertzel filters for the
+    eight DTMF frequencies as one (length, 16) matrix.  Multiplying a
+    block of frames by it gives the same result as running the Goertzel
+    recurrence on each frame, in one matrix product.
+    :param rate: Sample rate.
+    :param length: Samples per frame.
+    """
+    basis = _bases.get((rate, length))
+    if basis is None:
+        freqs = np.array(ROW_FREQUENCIES + COLUMN_FREQUENCIES)
+        phase = 2 * np.pi * np.outer(np.arange(length), freqs) / rate
+        basis = np.concatenate((np.cos(phase), np.sin(phase)), axis=1)
+        basis = basis.astype(np.float32)
+        _bases[(rate, length)] = basis
+    return basis
+
+
+def tone_powers(samples, rate):
+    """
+    Computes the power at each DTMF frequency.
+    :param samples: int16 ndarray with one frame per row.
+    :param rate: Sample rate.
+    :return: (float32 ndarray of shape (frames, 8), frame energies).
+    """
+    x = samples.astype(np.float32)
+    parts = x @ goertzel_basis(rate, x.shape[1])
+    powers = parts[:, :8] ** 2 + parts[:, 8:] ** 2
+    return powers, np.einsum("ij,ij->i", x, x)
+
+
+class DtmfDetector(BatchProcessor):
+    def __init__(
+        self,
+        listener,
+        clock=None,
+        min_level_db=DEFAULT_MIN_LEVEL_DB,
+        tone_ratio=DEFAULT_TONE_RATIO,
+        twist_db=DEFAULT_TWIST_DB,
+        group_margin_db=DEFAULT_GROUP_MARGIN_DB,
+        hits=DEFAULT_HITS,
+        tag=None,
+        log_level=None,
+    ):
+        """
+        Detects DTMF digits on any number of streams.  The queued frames of
+        every stream are checked together on each MediaClock tick and
+        listener(key, digit) is called once for each digit, after it's been
+        present for hits frames in a row.
+        :param listener: Called with the stream's key and the digit.
+        :param clock: Optional MediaClock.  Defaults to the shared one.
+        :param min_level_db: Minimum frame power in dBFS.
+        :param tone_ratio: Minimum share of the frame's energy in the tones.
+        :param twist_db: (min, max) column to row power ratio in dB.
+        :param group_margin_db: Minimum margin over the next strongest tone
+        in the same group.
+        :param hits: Frames in a row needed to report a digit.
+        :param tag: Optional tag for logging.
+        :param log_level: Optional log level.  One of logging.LOG_LEVEL.
+        """
+        super().__init__(listener, clock, tag, log_level)
+        self.min_power = 32768.0 * 32768.0 * 10 ** (min_level_db / 10)
+        self.tone_ratio = tone_ratio
+        self.min_twist = 10 ** (twist_db[0] / 10)
+        self.max_twist = 10 ** (twist_db[1] / 10)
+        self.group_margin = 10 ** (group_margin_db / 10)
+        self.hits = hits
+        self.last = np.full(len(self.keys), -1, dtype=np.int8)
+        self.count = np.zeros(len(self.keys), dtype=np.int32)
+        self.digits = 0
+
+    def reset(self, slot):
+        self.last[slot] = -1
+        self.count[slot] = 0
+
+    def resize(self, size):
+        self.last = grow_array(self.last, size)
+        self.count = grow_array(self.count, size)
+
+    def detect(self, samples, rate):
+        """
+        Finds the digit in each frame.
+        :param samples: int16 ndarray with one frame per row.
+        :param rate: Sample rate.
+        :return: int8 ndarray of indexes into DIGITS, -1 where there's none.
+        """
+        powers, energy = tone_powers(samples, rate)
+        length = samples.shape[1]
+        rows = np.sort(powers[:, :4], axis=1)
+        columns = np.sort(powers[:, 4:], axis=1)
+        row_power = rows[:, -1]
+        column_power = columns[:, -1]
+        valid = energy > self.min_power * length
+        # A pure tone of energy E has power E * length / 2 at its frequency.
+        valid &= row_power + column_power > self.tone_ratio * energy * length / 2
+        valid &= column_power > self.min_twist * row_power
+        valid &= column_power < self.max_twist * row_power
+        valid &= row_power > self.group_margin * rows[:, -2]
+        valid &= column_power > self.group_margin * columns[:, -2]
+        digit = np.argmax(powers[:, :4], axis=1) * 4 + np.argmax(powers[:, 4:], axis=1)
+        return np.where(valid, digit, -1).astype(np.int8)
+
+    def classify(self, fmt, slots, samples):
+        digit = self.detect(samples, codec.SAMPLE_RATES[fmt])
+        count = np.where(digit == self.last[slots], self.count[slots] + 1, 1)
+        self.last[slots] = digit
+        self.count[slots] = count
+        found = (digit >= 0) & (count == self.hits)
+        if not found.any():
+            return
+        for slot, index in zip(slots[found], digit[found]):
+            self.digits += 1
+            self.notify(slot, DIGITS[index])
@@ -0,0 +1,207 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import asyncio
+
+# One second of 20ms frames.
+DEFAULT_CAPACITY = 50
+# What happens to a subscriber that falls more than capacity frames behind.
+# "drop" skips it ahead to the oldest frame still buffered, "close"
+# unsubscribes it.
+POLICIES = ("drop", "close")
+
+
+class Subscriber:
+    __slots__ = (
+        "fanout",
+        "name",
+        "policy",
+        "cursor",
+        "waiter",
+        "closed",
+        "received",
+        "dropped",
+        "max_lag",
+    )
+
+    def __init__(self, fanout, name, policy):
+        """
+        One consumer's position in a FanoutBuffer.  Create with
+        FanoutBuffer.subscribe().
+        """
+        self.fanout = fanout
+        self.name = name
+        self.policy = policy
+        self.cursor = fanout.seq
+        self.waiter = None
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+        self.max_lag = 0
+
+    @property
+    def lag(self):
+        """
+        Frames published that this subscriber hasn't read yet.
+        """
+        return self.fanout.seq - self.cursor
+
+    def read(self):
+        """
+        Returns the next frame without waiting.  It's a view of the
+        fan-out's buffer, which is reused capacity frames after the frame
+        was published.  Copy the frame to keep it longer.
+        :return: A read-only memoryview, or None if there's no frame ready
+        or the subscriber is closed.
+        """
+        if self.closed:
+            return None
+        fanout = self.fanout
+        lag = fanout.seq - self.cursor
+        if lag == 0:
+            if fanout.closed:
+                self.close()
+            return None
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if lag > fanout.capacity:
+            if self.policy == "close":
+                self.close()
+                return None
+            self.dropped += lag - fanout.capacity
+            self.cursor = fanout.seq - fanout.capacity
+        frame = fanout.views[self.cursor % fanout.capacity]
+        self.cursor += 1
+        self.received += 1
+        return frame
+
+    async def get(self):
+        """
+        Returns the next frame, waiting for one if necessary.
+        :return: A read-only memoryview, or None once the subscriber or the
+        fan-out has been closed and every buffered frame has been read.
+        """
+        while True:
+            frame = self.read()
+            if frame is not None or self.closed:
+                return frame
+            self.waiter = asyncio.get_running_loop().create_future()
+            self.fanout.waiting.append(self)
+            try:
+                await self.waiter
+            finally:
+                self.waiter = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        frame = await self.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+    def close(self):
+        """
+        Unsubscribes.  A pending get() returns None.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.fanout.subscribers.discard(self)
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+
+class FanoutBuffer:
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Shares one stream of frames with any number of consumers.  Frames
+        are copied into a ring of capacity buffers that are allocated once
+        and reused, and every subscriber reads them through its own cursor,
+        so publishing costs the same however many consumers there are and
+        never waits for them.
+        A consumer that falls behind by more than capacity frames loses the
+        oldest ones or is unsubscribed, depending on its policy.
+        :param capacity: Frames kept for slow subscribers.
+        """
+        self.capacity = capacity
+        self.buffers = [None] * capacity
+        # Read-only views of the buffers, handed to subscribers.
+        self.views = [None] * capacity
+        self.seq = 0
+        self.subscribers = set()
+        self.waiting = []
+        self.closed = False
+
+    def __len__(self):
+        return len(self.subscribers)
+
+    def subscribe(self, name=None, policy="drop"):
+        """
+        Adds a consumer.  It receives frames published from now on.
+        :param name: Optional name for the consumer.
+        :param policy: One of POLICIES.
+        :return: The Subscriber.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'")
+        subscriber = Subscriber(self, name, policy)
+        if self.closed:
+            subscriber.closed = True
+        else:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def publish(self, frame):
+        """
+        Adds a frame and wakes subscribers waiting for one.  The frame is
+        copied, so the caller keeps ownership of it.
+        :param frame: bytes-like audio.
+        """
+        index = self.seq % self.capacity
+        buffer = self.buffers[index]
+        if buffer is not None and len(buffer) == len(frame):
+            buffer[:] = frame
+        else:
+            # The first lap, or the frame size changed.
+            buffer = self.buffers[index] = bytearray(frame)
+            self.views[index] = memoryview(buffer).toreadonly()
+        self.seq += 1
+        if self.waiting:
+            self.wake()
+
+    def close(self):
+        """
+        Ends the stream.  Subscribers can still read what's buffered.
+        """
+        self.closed = True
+        self.wake()
+
+    def wake(self):
+        waiting = self.waiting
+        self.waiting = []
+        for subscriber in waiting:
+            waiter = subscriber.waiter
+            if waiter is not None and not waiter.done():
+                waiter.set_result(None)
+
+    def stats(self):
+        """
+        Returns a dict of each subscriber's lag, max lag, frames received
+        and frames dropped, by name.
+        """
+        stats = {}
+        for s in self.subscribers:
+            stats[s.name or id(s)] = {
+                "lag": s.lag,
+                "max_lag": s.max_lag,
+                "received": s.received,
+                "dropped": s.dropped,
+            }
+        return stats
@@ -0,0 +1,146 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+# Bytes of audio per second for the formats frames can be sized in
+# milliseconds for.
+BYTES_PER_SECOND = {
+    "ulaw": 8000,
+    "alaw": 8000,
+    "slin": 16000,
+    "slin16": 32000,
+}
+# The byte value of silence in each format.
+SILENCE = {
+    "ulaw": 0xFF,
+    "alaw": 0xD5,
+    "slin": 0x00,
+    "slin16": 0x00,
+}
+# Frames assembled in the ring before the oldest is reused.
+DEFAULT_RING_FRAMES = 8
+
+
+def frame_bytes(fmt, ms):
+    """
+    Returns the size of a frame.
+    :param fmt: The media format.
+    :param ms: Milliseconds of audio.
+    :raises ValueError: If the format isn't in BYTES_PER_SECOND or ms
+    isn't a whole number of samples.
+    """
+    rate = BYTES_PER_SECOND.get(fmt)
+    if rate is None:
+        raise ValueError(f"Unable to size frames of '{fmt}'")
+    size, remainder = divmod(rate * ms, 1000)
+    if remainder or not size:
+        raise ValueError(f"{ms}ms isn't a whole number of '{fmt}' samples")
+    return size
+
+
+class FrameNormalizer:
+    __slots__ = (
+        "frame_bytes",
+        "capacity",
+        "ring",
+        "view",
+        "slot",
+        "fill",
+        "silence",
+        "frames",
+    )
+
+    def __init__(self, frame_bytes, capacity=DEFAULT_RING_FRAMES, silence=0):
+        """
+        Re-chunks a stream of media messages of any size into frames of
+        exactly frame_bytes.  A message that is exactly one frame is
+        returned as is and other whole frames inside a message as
+        memoryviews of it.  Only frames that span messages are copied, into
+        a ring of capacity frames allocated up front, so splitting never
+        allocates a buffer.
+        :param frame_bytes: The frame size.
+        :param capacity: Frames in the ring.  A frame assembled in the
+        ring is overwritten capacity messages later.
+        :param silence: The byte value flush() pads with.
+        """
+        self.frame_bytes = frame_bytes
+        self.capacity = capacity
+        self.ring = bytearray(frame_bytes * capacity)
+        self.view = memoryview(self.ring)
+        self.slot = 0
+        self.fill = 0
+        self.silence = silence
+        self.frames = []
+
+    @property
+    def pending(self):
+        """
+        Bytes waiting for the rest of their frame.
+        """
+        return self.fill
+
+    def split(self, data):
+        """
+        Adds a message and returns the frames it completes.
+        :param data: bytes-like audio.
+        :return: A list of bytes-like frames of frame_bytes each.  The list
+        is reused by the next call.  Frames of a bytes message stay valid
+        for as long as they're referenced.  Ones assembled in the ring are
+        memoryviews of it and stay valid for the next capacity - 1 calls.
+        """
+        size = self.frame_bytes
+        length = len(data)
+        frames = self.frames
+        frames.clear()
+        if not self.fill and length == size:
+            # What Asterisk normally sends.  Nothing to copy or slice.
+            frames.append(data)
+            return frames
+        data = memoryview(data)
+        position = 0
+        if self.fill:
+            start = self.slot * size
+            position = min(size - self.fill, length)
+            self.view[start + self.fill : start + self.fill + position] = data[
+                :position
+            ]
+            self.fill += position
+            if self.fill < size:
+                return frames
+            frames.append(self.view[start : start + size])
+            self.slot = (self.slot + 1) % self.capacity
+            self.fill = 0
+        while length - position >= size:
+            frames.append(data[position : position + size])
+            position += size
+        if position < length:
+            start = self.slot * size
+            self.fill = length - position
+            self.view[start : start + self.fill] = data[position:]
+        return frames
+
+    def flush(self):
+        """
+        Pads the partial frame, if any, with silence and returns it.
+        :return: A memoryview of frame_bytes, or None.
+        """
+        if not self.fill:
+            return None
+        size = self.frame_bytes
+        start = self.slot * size
+        self.view[start + self.fill : start + size] = bytes([self.silence]) * (
+            size - self.fill
+        )
+        self.slot = (self.slot + 1) % self.capacity
+        self.fill = 0
+        return self.view[start : start + size]
+
+    def reset(self):
+        """
+        Discards the partial frame.
+        """
+        self.fill = 0
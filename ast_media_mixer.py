@@ -0,0 +1,263 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import logging
+from logging import INFO, WARNING, ERROR, DEBUG, NOTSET
+import traceback
+import numpy as np
+import ast_media_codec as codec
+from ast_media_clock import get_default_clock
+from ast_media_playback import DEFAULT_PTIME
+
+# Most frames of a participant's audio held before the oldest is dropped.
+DEFAULT_MAX_BUFFERED_FRAMES = 3
+
+
+class MixerParticipant:
+    __slots__ = ("session", "format", "pending", "frames_in", "underruns", "overruns")
+
+    def __init__(self, session):
+        """
+        A session's place in a Mixer.
+        :param session: The MediaSession.
+        """
+        self.session = session
+        self.format = session.format
+        self.pending = bytearray()
+        self.frames_in = 0
+        self.underruns = 0
+        self.overruns = 0
+
+
+class Mixer:
+    def __init__(
+        self,
+        rate=8000,
+        ptime=DEFAULT_PTIME,
+        clock=None,
+        max_buffered=DEFAULT_MAX_BUFFERED_FRAMES,
+        tag=None,
+        log_level=None,
+    ):
+        """
+        Mixes the audio of any number of media sessions.  Every ptime
+        milliseconds on the media clock, one frame is taken from each
+        participant and each one is sent the sum of everybody else, clipped
+        to 16 bits.  set_gain() changes what individual participants hear,
+        for whisper and coach topologies.
+        :param rate: Sample rate.  Participants must use a format at this rate.
+        :param ptime: Milliseconds of audio per frame.
+        :param clock: Optional MediaClock.  Defaults to the shared one.
+        :param max_buffered: Frames buffered per participant before the
+        oldest are dropped.
+        :param tag: Optional tag for logging.
+        :param log_level: Optional log level.  One of logging.LOG_LEVEL.
+        """
+        self.rate = rate
+        self.ptime = ptime
+        self.clock = clock or get_default_clock()
+        self.samples = rate * ptime // 1000
+        self.max_buffered = max_buffered
+        self.participants = {}
+        self.order = None
+        self.formats = None
+        # Inbound frames are decoded straight into inputs, one row per
+        # participant, and mixed through wide into mixed.
+        self.inputs = None
+        self.wide = None
+        self.total = None
+        self.mixed = None
+        # Outbound frames are encoded into these and sent from them, by
+        # format: (buffer, one memoryview per participant, the rows of
+        # mixed, an array to gather the rows into if they're not adjacent).
+        self.send_buffers = None
+        self.gains = {}
+        self.matrix = None
+        self.next_time = None
+        self.frames = 0
+        self.logger = logging.getLogger(__name__)
+        self.tag = tag
+        if log_level is not None:
+            self.logger.setLevel(log_level)
+
+    def log(self, level, message):
+        """
+        Logs a message with the tag.
+        :param level: The logging level (e.g., info, warning, error).
+        :param message: The message to log.
+        """
+        tag = "" if self.tag is None else f"{self.tag}: "
+        self.logger.log(level, f"{tag}{message}")
+
+    def __len__(self):
+        return len(self.participants)
+
+    def add(self, session):
+        """
+        Adds a session.  Its inbound frames should be passed to feed().
+        Anything the session is playing, such as the announcement, is
+        stopped so it only hears the mix.
+        :param session: A MediaSession that has received MEDIA_START.
+        :raises ValueError: If its format isn't at the mixer's rate.
+        """
+        codec.check_format(session.format)
+        if codec.SAMPLE_RATES[session.format] != self.rate:
+            raise ValueError(f"Format '{session.format}' isn't {self.rate}Hz")
+        if session.playback is not None:
+            session.playback.stop()
+        session.sending_file = False
+        self.participants[session] = MixerParticipant(session)
+        session.mixer = self
+        self.order = None
+        if len(self.participants) == 1:
+            self.next_time = None
+            self.clock.add(self)
+
+    def remove(self, session):
+        """
+        Removes a session and any gains set for it.
+        :param session: The MediaSession.
+        """
+        if self.participants.pop(session, None) is None:
+            return
+        session.mixer = None
+        self.gains = {k: v for k, v in self.gains.items() if session not in k}
+        self.order = None
+        if not self.participants:
+            self.clock.remove(self)
+
+    def set_gain(self, listener, speaker, gain):
+        """
+        Sets how loud speaker is in listener's mix.  Everybody else hears
+        everybody else at 1.0 by default.  Use 0 to keep a coach's audio
+        from the customer, for instance.
+        :param listener: The MediaSession that hears the audio.
+        :param speaker: The MediaSession whose audio it is.
+        :param gain: The multiplier, or None to go back to 1.0.
+        """
+        if gain is None:
+            self.gains.pop((listener, speaker), None)
+        else:
+            self.gains[(listener, speaker)] = gain
+        self.order = None
+
+    def feed(self, session, frame):
+        """
+        Buffers an inbound frame from a participant.
+        :param session: The MediaSession.
+        :param frame: bytes-like audio in the session's format.
+        """
+        participant = self.participants.get(session)
+        if participant is None:
+            return
+        participant.frames_in += 1
+        pending = participant.pending
+        pending += frame
+        limit = self.max_buffered * self.frame_bytes(participant.format)
+        if len(pending) > limit:
+            participant.overruns += 1
+            del pending[: len(pending) - limit]
+
+    def frame_bytes(self, fmt):
+        return self.samples * codec.bytes_per_sample(fmt)
+
+    def rebuild(self):
+        self.order = list(self.participants.values())
+        shape = (len(self.order), self.samples)
+        self.inputs = np.zeros(shape, dtype=np.int16)
+        self.mixed = np.zeros(shape, dtype=np.int16)
+        self.total = np.zeros(self.samples, dtype=np.int32)
+        self.formats = {}
+        for i, participant in enumerate(self.order):
+            self.formats.setdefault(participant.format, []).append(i)
+        self.send_buffers = {}
+        for fmt, indexes in self.formats.items():
+            size = self.frame_bytes(fmt)
+            buffer = bytearray(size * len(indexes))
+            view = memoryview(buffer)
+            views = [view[i : i + size] for i in range(0, len(buffer), size)]
+            rows = slice(indexes[0], indexes[-1] + 1)
+            gather = None
+            if len(indexes) != rows.stop - rows.start:
+                rows = np.array(indexes, dtype=np.intp)
+                gather = np.zeros((len(indexes), self.samples), dtype=np.int16)
+            self.send_buffers[fmt] = (buffer, views, rows, gather)
+        self.matrix = None
+        if self.gains:
+            index = {p.session: i for i, p in enumerate(self.order)}
+            count = len(self.order)
+            matrix = np.ones((count, count), dtype=np.float32)
+            np.fill_diagonal(matrix, 0)
+            for (listener, speaker), gain in self.gains.items():
+                if listener != speaker:
+                    matrix[index[listener], index[speaker]] = gain
+            self.matrix = matrix
+        self.wide = np.zeros(
+            shape, dtype=np.int32 if self.matrix is None else np.float32
+        )
+
+    def mix(self):
+        """
+        Takes one frame from every participant and returns the mix for
+        each of them.
+        :return: int16 ndarray with one frame per participant, in the order
+        of self.order.  It's reused by the next call.
+        """
+        if self.order is None:
+            self.rebuild()
+        order = self.order
+        inputs = self.inputs
+        for fmt, indexes in self.formats.items():
+            size = self.frame_bytes(fmt)
+            for i in indexes:
+                pending = order[i].pending
+                if len(pending) < size:
+                    # Not enough audio yet.  The participant is silent.
+                    order[i].underruns += 1
+                    inputs[i] = 0
+                    continue
+                # Decoded in place from pending, without copying it out.
+                codec.decode(pending, fmt, out=inputs[i])
+                del pending[:size]
+        wide = self.wide
+        if self.matrix is None:
+            np.copyto(wide, inputs)
+            np.sum(wide, axis=0, out=self.total)
+            np.subtract(self.total, wide, out=wide)
+        else:
+            np.matmul(self.matrix, inputs, out=wide)
+            np.rint(wide, out=wide)
+        np.clip(wide, -32768, 32767, out=wide)
+        np.copyto(self.mixed, wide, casting="unsafe")
+        return self.mixed
+
+    async def tick(self, now):
+        if self.next_time is None:
+            self.next_time = now
+        if now < self.next_time:
+            return
+        self.next_time += self.ptime / 1000
+        if now > self.next_time + self.ptime / 1000:
+            # Fell behind.  Don't try to catch up with a burst.
+            self.next_time = now
+        mixed = self.mix()
+        self.frames += 1
+        order = self.order
+        for fmt, indexes in self.formats.items():
+            buffer, frames, rows, gather = self.send_buffers[fmt]
+            if gather is None:
+                samples = mixed[rows]
+            else:
+                samples = np.take(mixed, rows, axis=0, out=gather)
+            codec.encode(samples, fmt, out=buffer)
+            for i, frame in zip(indexes, frames):
+                session = order[i].session
+                # send_nowait() copies the frame and never waits, so one
+                # participant that stops reading can't hold up the others.
+                if session.flow.paused or not session.send_nowait(frame):
+                    session.dropped_out += 1
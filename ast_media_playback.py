@@ -0,0 +1,231 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import asyncio
+
+DEFAULT_PTIME = 20
+# Frames sent ahead of real time to cover network and scheduling jitter.
+DEFAULT_LEAD_FRAMES = 3
+# Most frames sent on one tick when catching up after a stall.
+MAX_BURST_FRAMES = 10
+# Bounds for the lead FlowControl adapts, and the number of seconds
+# without an XOFF before it's allowed to grow again.
+MIN_LEAD_FRAMES = 1
+MAX_LEAD_FRAMES = 10
+LEAD_RECOVERY_TIME = 5.0
+
+
+def split_frames(data, frame_size):
+    """
+    Splits audio into frame_size chunks without copying.
+    :param data: bytes-like audio.
+    :param frame_size: Bytes per frame.
+    :return: A list of memoryviews.  The last one may be short.
+    """
+    view = memoryview(data)
+    return [view[i : i + frame_size] for i in range(0, len(view), frame_size)]
+
+
+class FlowControl:
+    __slots__ = (
+        "paused",
+        "open",
+        "lead",
+        "min_lead",
+        "max_lead",
+        "paused_since",
+        "last_change",
+        "xoff_count",
+        "stray_xon_count",
+        "paused_time",
+        "max_paused_time",
+    )
+
+    def __init__(
+        self,
+        lead=DEFAULT_LEAD_FRAMES,
+        min_lead=MIN_LEAD_FRAMES,
+        max_lead=MAX_LEAD_FRAMES,
+    ):
+        """
+        MEDIA_XOFF/MEDIA_XON state for one media connection.  xoff() and
+        xon() never block so they can be called from the receive loop;
+        only outbound producers check paused or await wait_open().
+        The number of frames producers keep ahead of real time is adapted:
+        halved on every XOFF, then grown by one frame for each
+        LEAD_RECOVERY_TIME seconds without one.
+        :param lead: Initial number of frames to send ahead of real time.
+        :param min_lead: Smallest lead.
+        :param max_lead: Largest lead.
+        """
+        self.paused = False
+        self.open = asyncio.Event()
+        self.open.set()
+        self.lead = lead
+        self.min_lead = min_lead
+        self.max_lead = max_lead
+        self.paused_since = None
+        self.last_change = None
+        self.xoff_count = 0
+        self.stray_xon_count = 0
+        self.paused_time = 0.0
+        self.max_paused_time = 0.0
+
+    def xoff(self, now):
+        """
+        Handles MEDIA_XOFF: pauses producers and reduces the lead.
+        :param now: The current loop time.
+        """
+        self.xoff_count += 1
+        self.last_change = now
+        if self.paused:
+            return
+        self.paused = True
+        self.paused_since = now
+        self.open.clear()
+        self.lead = max(self.min_lead, self.lead // 2)
+
+    def xon(self, now):
+        """
+        Handles MEDIA_XON: resumes producers.  An XON without a preceding
+        XOFF is counted and otherwise ignored.
+        :param now: The current loop time.
+        """
+        if not self.paused:
+            self.stray_xon_count += 1
+            return
+        paused = now - self.paused_since
+        self.paused_time += paused
+        if paused > self.max_paused_time:
+            self.max_paused_time = paused
+        self.paused = False
+        self.paused_since = None
+        self.open.set()
+
+    def adapt(self, now):
+        """
+        Grows the lead after a quiet period.  Called by producers as they send.
+        :param now: The current loop time.
+        :return: The lead to use.
+        """
+        if self.last_change is None:
+            self.last_change = now
+        elif now - self.last_change > LEAD_RECOVERY_TIME:
+            self.last_change = now
+            if self.lead < self.max_lead:
+                self.lead += 1
+        return self.lead
+
+    async def wait_open(self):
+        """
+        Waits until producers may send.
+        """
+        await self.open.wait()
+
+
+class Playback:
+    def __init__(
+        self,
+        ws_media,
+        frames,
+        clock,
+        ptime=DEFAULT_PTIME,
+        lead=DEFAULT_LEAD_FRAMES,
+        flow=None,
+        sent_data=None,
+    ):
+        """
+        Sends frames to a media websocket at real-time rate, driven by a
+        MediaClock.  Only lead frames are ever queued ahead of real time so
+        Asterisk's buffer stays small and stop() takes effect immediately.
+        Frames are handed to the session's send_nowait() so the clock never
+        waits for the socket.  A session whose peer isn't reading falls
+        behind on its own without losing frames.
+        :param ws_media: The MediaSession to send the frames over.
+        :param frames: A sequence of bytes-like frames.
+        :param clock: The MediaClock that drives the playback.
+        :param ptime: Milliseconds of audio per frame.
+        :param lead: Number of frames to keep ahead of real time.  Ignored
+        if flow is given.
+        :param flow: Optional FlowControl.  Sending pauses while it's paused
+        and the lead is taken from it.
+        :param sent_data: Optional buffer to store sent data for verification.
+        """
+        self.ws_media = ws_media
+        self.frames = frames
+        self.clock = clock
+        self.frame_time = ptime / 1000
+        self.lead = lead
+        self.flow = flow
+        self.sent_data = sent_data
+        self.sent = 0
+        self.start_time = None
+        self.paused_since = None
+        self.done = asyncio.get_running_loop().create_future()
+
+    def start(self):
+        """
+        Starts sending on the next clock tick.
+        :return: A future that resolves to True when every frame was sent or
+        False if the playback was stopped.
+        """
+        self.clock.add(self)
+        return self.done
+
+    def stop(self):
+        """
+        Stops sending.  Frames already sent are still in Asterisk's buffer.
+        """
+        self.finish(False)
+
+    def finish(self, result):
+        self.clock.remove(self)
+        if not self.done.done():
+            self.done.set_result(result)
+
+    def fail(self, exception):
+        """
+        Called by the clock when tick() raised and the playback was dropped.
+        :param exception: The exception tick() raised.
+        """
+        self.clock.remove(self)
+        if not self.done.done():
+            self.done.set_exception(exception)
+
+    async def tick(self, now):
+        lead = self.lead
+        if self.start_time is None:
+            # Set even if the first tick finds the flow paused, so the
+            # time spent paused can be taken off it.
+            self.start_time = now
+        if self.flow is not None:
+            if self.flow.paused:
+                if self.paused_since is None:
+                    self.paused_since = now
+                return
+            lead = self.flow.adapt(now)
+        if self.paused_since is not None:
+            # Don't try to make up the time spent paused.
+            self.start_time += now - self.paused_since
+            self.paused_since = None
+        due = int((now - self.start_time) / self.frame_time) + 1 + lead
+        count = min(due - self.sent, MAX_BURST_FRAMES)
+        for _ in range(count):
+            if self.sent >= len(self.frames):
+                break
+            frame = self.frames[self.sent]
+            if not self.ws_media.send_nowait(frame):
+                # The peer isn't keeping up.  Try again on the next tick,
+                # without making up the time lost like after an XOFF.
+                self.paused_since = now
+                break
+            if self.sent_data is not None:
+                self.sent_data.write(frame)
+            self.sent += 1
+        if self.sent >= len(self.frames):
+            self.finish(True)
@@ -0,0 +1,178 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import asyncio
+from collections import deque
+import time
+
+# One second of 20ms frames.
+DEFAULT_MAXSIZE = 50
+# What happens to a frame that arrives when the queue is full.
+# "drop-oldest" discards the oldest queued frame to make room for it,
+# "drop-newest" discards the new frame and "block" ends the iteration
+# with FrameQueueOverrun once the queued frames have been read.  None of
+# them ever make the websocket reader wait.
+POLICIES = ("drop-oldest", "drop-newest", "block")
+
+
+class FrameQueueOverrun(Exception):
+    def __init__(self, queue):
+        """
+        Raised by a "block" FrameQueue whose consumer fell maxsize frames
+        behind.
+        :param queue: The FrameQueue.
+        """
+        super().__init__(
+            f"Frame queue '{queue.name}' overran after {queue.received} frames"
+        )
+        self.queue = queue
+
+
+class FrameQueue:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, policy="drop-oldest", name=None):
+        """
+        A bounded queue of one session's inbound frames for one consumer.
+        Create with MediaSession.frames() and read with "async for".
+        Frames are copied into maxsize + 1 buffers that are allocated once
+        and reused, so a frame is valid until the next one is read.  Copy
+        it to keep it longer.
+        :param maxsize: Most frames queued.
+        :param policy: One of POLICIES.
+        :param name: Optional name for the consumer's stats.
+        :raises ValueError: If the policy isn't one of POLICIES.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name
+        # (buffer, read-only view, time queued)
+        self.queue = deque()
+        self.free = []
+        self.current = None
+        self.waiter = None
+        self.closed = False
+        self.overrun = False
+        self.received = 0
+        self.dropped = 0
+        self.max_lag = 0
+        self.delay = 0.0
+        self.max_delay = 0.0
+
+    @property
+    def lag(self):
+        """
+        Frames queued that the consumer hasn't read yet.
+        """
+        return len(self.queue)
+
+    def put(self, frame):
+        """
+        Queues a frame without waiting.
+        :param frame: bytes-like audio.  It's copied.
+        """
+        if self.closed:
+            return
+        queue = self.queue
+        if len(queue) >= self.maxsize:
+            if self.policy == "drop-newest":
+                self.dropped += 1
+                return
+            if self.policy == "block":
+                self.overrun = True
+                self.close()
+                return
+            self.dropped += 1
+            self.free.append(queue.popleft())
+        entry = self.free.pop() if self.free else None
+        if entry is None or len(entry[0]) != len(frame):
+            buffer = bytearray(frame)
+            entry = (buffer, memoryview(buffer).toreadonly(), 0.0)
+        else:
+            entry[0][:] = frame
+        queue.append((entry[0], entry[1], time.monotonic()))
+        if len(queue) > self.max_lag:
+            self.max_lag = len(queue)
+        waiter = self.waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def get_nowait(self):
+        """
+        Returns the next frame without waiting.  The previous frame's
+        buffer is reused from now on.
+        :return: A read-only memoryview, or None if no frame is queued.
+        """
+        if self.current is not None:
+            self.free.append(self.current)
+            self.current = None
+        if not self.queue:
+            return None
+        entry = self.queue.popleft()
+        self.current = entry
+        self.received += 1
+        self.delay = time.monotonic() - entry[2]
+        if self.delay > self.max_delay:
+            self.max_delay = self.delay
+        return entry[1]
+
+    async def get(self):
+        """
+        Returns the next frame, waiting for one if necessary.
+        :return: A read-only memoryview, or None once the queue is closed
+        and empty.
+        :raises FrameQueueOverrun: Instead of returning None if a "block"
+        queue was closed because it was full.
+        """
+        while True:
+            frame = self.get_nowait()
+            if frame is not None:
+                return frame
+            if self.closed:
+                if self.overrun:
+                    raise FrameQueueOverrun(self)
+                return None
+            self.waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self.waiter
+            finally:
+                self.waiter = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        frame = await self.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+    def close(self):
+        """
+        Stops queuing frames.  The consumer can still read the ones
+        already queued.
+        """
+        self.closed = True
+        waiter = self.waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def stats(self):
+        """
+        Returns a dict of the queue's lag in frames, max lag, the delay of
+        the last frame read and the max delay in seconds, and frames
+        received and dropped.
+        """
+        return {
+            "lag": self.lag,
+            "max_lag": self.max_lag,
+            "delay": self.delay,
+            "max_delay": self.max_delay,
+            "received": self.received,
+            "dropped": self.dropped,
+        }
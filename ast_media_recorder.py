@@ -0,0 +1,413 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import asyncio
+import logging
+from logging import INFO, WARNING, ERROR, DEBUG, NOTSET
+import queue
+import struct
+import threading
+import time
+import traceback
+
+try:
+    import numpy as np
+    import ast_media_codec as codec
+except ImportError:
+    np = codec = None
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+# Most outbound audio held in "mixed" mode waiting for inbound audio to
+# mix it with, in seconds.
+MAX_MIX_BACKLOG = 1.0
+
+# WAVE format tag, bits per sample, sample rate.
+WAV_FORMATS = {
+    "ulaw": (7, 8, 8000),
+    "alaw": (6, 8, 8000),
+    "slin": (1, 16, 8000),
+    "slin16": (1, 16, 16000),
+}
+
+
+def wav_header(fmt, data_size=0):
+    """
+    Builds a WAV header.
+    :param fmt: One of WAV_FORMATS.
+    :param data_size: Bytes of audio that follow the header.
+    :raises ValueError: If the format can't be stored in a WAV file.
+    """
+    if fmt not in WAV_FORMATS:
+        raise ValueError(f"Format '{fmt}' can't be recorded to WAV")
+    tag, bits, rate = WAV_FORMATS[fmt]
+    block = bits // 8
+    fmt_chunk = struct.pack("<HHIIHH", tag, 1, rate, rate * block, block, bits)
+    if tag != 1:
+        # Non-PCM formats have an (empty) extension size field.
+        fmt_chunk += struct.pack("<H", 0)
+    riff_size = 4 + 8 + len(fmt_chunk) + 8 + data_size
+    return (
+        struct.pack("<4sI4s", b"RIFF", riff_size, b"WAVE")
+        + struct.pack("<4sI", b"fmt ", len(fmt_chunk))
+        + fmt_chunk
+        + struct.pack("<4sI", b"data", data_size)
+    )
+
+
+def repair_wav(path):
+    """
+    Fixes the sizes in the header of a WAV file whose writer died before
+    the last header update, so it includes everything on disk.
+    :param path: The file to fix.
+    :return: The number of bytes of audio in the file.
+    :raises ValueError: If the file isn't a WAV file.
+    """
+    with open(path, "r+b") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+            raise ValueError(f"'{path}' isn't a WAV file")
+        end = f.seek(0, 2)
+        offset = 12
+        while offset + 8 <= end:
+            f.seek(offset)
+            chunk_id, size = struct.unpack("<4sI", f.read(8))
+            if chunk_id == b"data":
+                size = end - offset - 8
+                f.seek(offset + 4)
+                f.write(struct.pack("<I", size))
+                f.seek(4)
+                f.write(struct.pack("<I", end - 8))
+                return size
+            offset += 8 + size + (size & 1)
+    raise ValueError(f"'{path}' has no data chunk")
+
+
+class RecordingFile:
+    __slots__ = ("path", "fmt", "wav", "handle", "data_size", "error")
+
+    def __init__(self, path, fmt, wav):
+        """
+        A file being recorded to.  Only the writer thread touches it once
+        it's been created.
+        :param path: The file to write.
+        :param fmt: The format of the audio.
+        :param wav: True to write a WAV header, False for raw audio.
+        :raises ValueError: If wav is True and the format isn't supported.
+        """
+        self.path = path
+        self.fmt = fmt
+        self.wav = wav
+        self.handle = None
+        self.data_size = 0
+        self.error = None
+        if wav:
+            wav_header(fmt)
+
+    def write(self, data):
+        if self.handle is None:
+            self.handle = open(self.path, "wb")
+            if self.wav:
+                self.handle.write(wav_header(self.fmt))
+        self.handle.write(data)
+        self.data_size += len(data)
+
+    def sync(self):
+        """
+        Flushes to the OS and makes the header describe everything written
+        so far, so the file is playable if the process dies.
+        """
+        if self.handle is None:
+            return
+        if self.wav:
+            position = self.handle.tell()
+            self.handle.seek(0)
+            self.handle.write(wav_header(self.fmt, self.data_size))
+            self.handle.seek(position)
+        self.handle.flush()
+
+    def close(self):
+        if self.handle is None:
+            # Nothing was ever recorded.  Still leave a valid empty file.
+            self.write(b"")
+        self.sync()
+        self.handle.close()
+
+
+class RecordingWriter:
+    def __init__(self, max_bandwidth=None, tag=None, log_level=None):
+        """
+        Writes recordings on a background thread so disk I/O never runs on
+        the event loop.  Chunks queued for the same file are written with
+        one call and every file's header is updated after each batch.
+        :param max_bandwidth: Optional cap on bytes written per second
+        across every recording.
+        :param tag: Optional tag for logging.
+        :param log_level: Optional log level.  One of logging.LOG_LEVEL.
+        """
+        self.max_bandwidth = max_bandwidth
+        self.queue = queue.SimpleQueue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.bytes_written = 0
+        self.allowance_time = None
+        self.batches = 0
+        self.throttled_time = 0.0
+        self.logger = logging.getLogger(__name__)
+        self.tag = tag
+        if log_level is not None:
+            self.logger.setLevel(log_level)
+
+    def log(self, level, message):
+        """
+        Logs a message with the tag.
+        :param level: The logging level (e.g., info, warning, error).
+        :param message: The message to log.
+        """
+        tag = "" if self.tag is None else f"{self.tag}: "
+        self.logger.log(level, f"{tag}{message}")
+
+    def submit(self, file, data, done=None):
+        """
+        Queues data for a file.
+        :param file: The RecordingFile.
+        :param data: bytes to append, possibly empty.
+        :param done: Optional (loop, future) to resolve once the file has
+        been closed.  Nothing else may be submitted for the file after it.
+        """
+        self.queue.put((file, data, done))
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name="recording-writer", daemon=True
+                )
+                self.thread.start()
+
+    def run(self):
+        while True:
+            items = [self.queue.get()]
+            try:
+                while True:
+                    items.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            batch = {}
+            for file, data, done in items:
+                chunks, closers = batch.setdefault(file, ([], []))
+                chunks.append(data)
+                if done is not None:
+                    closers.append(done)
+            for file, (chunks, closers) in batch.items():
+                self.write(file, b"".join(chunks), closers)
+            self.batches += 1
+
+    def throttle(self, size):
+        """
+        Sleeps as long as needed to keep writes under max_bandwidth.
+        """
+        now = time.monotonic()
+        if self.allowance_time is None or self.allowance_time < now - 1.0:
+            # Don't bank more than a second of idle time.
+            self.allowance_time = now - 1.0
+        delay = self.allowance_time - now
+        self.allowance_time += size / self.max_bandwidth
+        if delay > 0:
+            self.throttled_time += delay
+            time.sleep(delay)
+
+    def write(self, file, data, closers):
+        try:
+            if file.error is None:
+                if self.max_bandwidth:
+                    # Write in tenth of a second pieces so the rate is
+                    # smooth even when a large batch is queued.
+                    step = max(int(self.max_bandwidth / 10), 4096)
+                    view = memoryview(data)
+                    for i in range(0, len(data), step):
+                        self.throttle(len(view[i : i + step]))
+                        file.write(view[i : i + step])
+                elif data:
+                    file.write(data)
+                if closers:
+                    file.close()
+                else:
+                    file.sync()
+        except Exception as e:
+            file.error = e
+            self.log(ERROR, f"Unable to write '{file.path}': {e}")
+            traceback.print_exc()
+        self.bytes_written += len(data)
+        for loop, future in closers:
+            loop.call_soon_threadsafe(self.resolve, future, file.error)
+
+    @staticmethod
+    def resolve(future, error):
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+
+
+default_writer = None
+
+
+def get_default_writer():
+    """
+    Returns the process wide writer shared by recorders that weren't
+    given their own.
+    """
+    global default_writer
+    if default_writer is None:
+        default_writer = RecordingWriter()
+    return default_writer
+
+
+class Recorder:
+    def __init__(
+        self,
+        session,
+        base,
+        container="wav",
+        mode="split",
+        writer=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+    ):
+        """
+        Records a media session's audio.  Frames are collected in memory
+        and handed to the writer thread in chunk_size pieces, or at least
+        every flush_interval seconds.
+        :param session: The MediaSession.  Its format must be known.
+        :param base: Path of the recording without an extension.
+        :param container: "wav" or "raw".
+        :param mode: "split" for separate {base}-in and {base}-out files,
+        "in" or "out" for one direction, or "mixed" for both directions in
+        one slin file.
+        :param writer: Optional RecordingWriter.  Defaults to the shared one.
+        :param chunk_size: Bytes collected before they're handed off.
+        :param flush_interval: Most seconds audio stays in memory.
+        :raises ValueError: For an unknown container or mode, or a format
+        that can't be recorded.
+        :raises ImportError: For "mixed" if numpy isn't installed.
+        """
+        if container not in ("wav", "raw"):
+            raise ValueError(f"Unknown container '{container}'")
+        if mode not in ("split", "in", "out", "mixed"):
+            raise ValueError(f"Unknown recording mode '{mode}'")
+        self.session = session
+        self.mode = mode
+        self.writer = writer or get_default_writer()
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.files = {}
+        self.buffers = {}
+        self.target = None
+        self.backlog = bytearray()
+        self.max_backlog = 0
+        fmt = session.format
+        extension = container if container == "wav" else fmt
+        wav = container == "wav"
+        if mode == "mixed":
+            if codec is None:
+                raise ImportError("Mixed recording requires numpy")
+            rate = codec.SAMPLE_RATES.get(fmt)
+            if rate is None:
+                raise ValueError(f"Format '{fmt}' can't be mixed")
+            self.target = "slin16" if rate == 16000 else "slin"
+            path = f"{base}.{extension}"
+            self.files["mixed"] = RecordingFile(path, self.target, wav)
+            self.max_backlog = int(rate * 2 * MAX_MIX_BACKLOG)
+        else:
+            directions = ("in", "out") if mode == "split" else (mode,)
+            for direction in directions:
+                path = f"{base}-{direction}.{extension}"
+                self.files[direction] = RecordingFile(path, fmt, wav)
+        for name in self.files:
+            self.buffers[name] = bytearray()
+        self.frames = 0
+        self.closed = False
+        self.timer = asyncio.get_running_loop().call_later(flush_interval, self.tick)
+
+    def write_in(self, frame):
+        """
+        Records an inbound frame.
+        """
+        if self.mode == "mixed":
+            self.mix(frame)
+        elif "in" in self.buffers:
+            self.append("in", frame)
+
+    def write_out(self, frame):
+        """
+        Records an outbound frame.
+        """
+        if self.mode == "mixed":
+            self.backlog += codec.decode(frame, self.session.format).tobytes()
+            if len(self.backlog) > self.max_backlog:
+                del self.backlog[: len(self.backlog) - self.max_backlog]
+        elif "out" in self.buffers:
+            self.append("out", frame)
+
+    def mix(self, frame):
+        # Inbound audio arrives at a steady rate so it drives the mix.
+        # Outbound audio is sent in bursts ahead of time and is held in
+        # the backlog until the inbound audio catches up with it.
+        inbound = codec.decode(frame, self.session.format).astype(np.int32)
+        size = len(inbound) * 2
+        outbound = np.zeros(len(inbound), dtype=np.int32)
+        available = min(len(self.backlog), size) // 2
+        if available:
+            outbound[:available] = np.frombuffer(
+                self.backlog, dtype=codec.SLIN_DTYPE, count=available
+            )
+            del self.backlog[: available * 2]
+        mixed = np.clip(inbound + outbound, -32768, 32767)
+        self.append("mixed", codec.encode(mixed, self.target))
+
+    def append(self, name, frame):
+        if self.closed:
+            return
+        buffer = self.buffers[name]
+        buffer += frame
+        self.frames += 1
+        if len(buffer) >= self.chunk_size:
+            self.flush(name)
+
+    def flush(self, name):
+        buffer = self.buffers[name]
+        if buffer:
+            self.writer.submit(self.files[name], bytes(buffer))
+            buffer.clear()
+
+    def tick(self):
+        for name in self.buffers:
+            self.flush(name)
+        if not self.closed:
+            loop = asyncio.get_running_loop()
+            self.timer = loop.call_later(self.flush_interval, self.tick)
+
+    async def close(self):
+        """
+        Writes out what's buffered, finalizes the headers and closes the
+        files.
+        :raises OSError: If a file couldn't be written.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.timer.cancel()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for name, file in self.files.items():
+            future = loop.create_future()
+            self.writer.submit(file, bytes(self.buffers[name]), (loop, future))
+            self.buffers[name].clear()
+            futures.append(future)
+        await asyncio.gather(*futures)
@@ -0,0 +1,124 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+from logging import INFO, WARNING, ERROR, DEBUG, NOTSET
+from ast_media_framer import FrameNormalizer
+
+
+class MediaRelay:
+    __slots__ = (
+        "connection_ids",
+        "sessions",
+        "processor",
+        "framers",
+        "transcoders",
+        "frames",
+        "rechunked",
+        "dropped",
+    )
+
+    def __init__(self, connection_id1, connection_id2, processor=None):
+        """
+        Connects the media of two websocket channels directly, without an
+        Asterisk bridge.  Each inbound frame is sent to the other session
+        as is unless the other session wants a different frame size, in
+        which case it's re-chunked to that session's optimal_frame_size
+        through a FrameNormalizer.
+        :param connection_id1: Connection id of one session.
+        :param connection_id2: Connection id of the other.
+        :param processor: Optional callable(session, frame) called with
+        every inbound frame before it's forwarded.  It returns the frame to
+        forward, or None to drop it.  The frame is only valid during the
+        call.
+        """
+        self.connection_ids = (connection_id1, connection_id2)
+        self.sessions = [None, None]
+        self.processor = processor
+        # Re-chunkers, by destination side.
+        self.framers = [None, None]
+        self.transcoders = [None, None]
+        self.frames = 0
+        self.rechunked = 0
+        self.dropped = 0
+
+    @property
+    def connected(self):
+        return self.sessions[0] is not None and self.sessions[1] is not None
+
+    def join(self, session):
+        """
+        Adds a session once its MEDIA_START has been received.
+        :param session: The MediaSession.
+        """
+        side = self.connection_ids.index(session.connection_id)
+        self.sessions[side] = session
+        session.relay = self
+        if not self.connected:
+            return
+        a, b = self.sessions
+        self.framers = [FrameNormalizer(a.frame_size), FrameNormalizer(b.frame_size)]
+        if a.format != b.format:
+            # Works, but costs a decode and encode per frame and needs
+            # numpy.  Give both channels the same format to avoid it.
+            from ast_media_codec import Transcoder
+
+            self.transcoders = [
+                Transcoder(b.format, a.format),
+                Transcoder(a.format, b.format),
+            ]
+            a.log(WARNING, f"Transcoding {a.format} to {b.format} for relay")
+        a.log(INFO, f"Relaying media with {b.channel}")
+
+    def leave(self, session):
+        """
+        Removes a session.  Frames from the other one are dropped from
+        then on.
+        :param session: The MediaSession.
+        :return: True if neither session is left.
+        """
+        side = self.sessions.index(session)
+        self.sessions[side] = None
+        self.framers = [None, None]
+        self.transcoders = [None, None]
+        session.relay = None
+        return self.sessions[1 - side] is None
+
+    def forward(self, session, frame):
+        """
+        Queues an inbound frame from one session for the other.  It never
+        waits for the other session's socket, so a peer that stops reading
+        can't hold up this session's inbound media.  Frames it has no room
+        for are dropped.
+        :param session: The MediaSession the frame came in on.
+        :param frame: bytes-like audio.
+        """
+        side = 1 - (self.sessions[1] is session)
+        peer = self.sessions[side]
+        if self.processor is not None:
+            frame = self.processor(session, frame)
+            if frame is None:
+                return
+        if peer is None or peer.flow.paused:
+            self.dropped += 1
+            if peer is not None:
+                peer.dropped_out += 1
+            return
+        transcoder = self.transcoders[side]
+        if transcoder is not None:
+            frame = transcoder.process(frame)
+        # send_nowait() copies frames that aren't bytes, so frames
+        # assembled in the framer's ring can be reused straight away.
+        # Queuing also keeps them in order with commands from send_control().
+        for chunk in self.framers[side].split(frame):
+            if not peer.send_nowait(chunk):
+                self.dropped += 1
+                peer.dropped_out += 1
+                continue
+            self.frames += 1
+            if chunk is not frame:
+                self.rechunked += 1
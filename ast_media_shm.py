@@ -0,0 +1,332 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Shared memory rings for handing inbound media to worker processes.
+
+The media server owns a SharedMediaRing: one shared memory segment
+divided into a fixed number of slots, each a ring of frames for one
+session.  Worker processes open the same segment by name with a
+SharedMediaReader and read frames in place.  Instead of a message per
+frame, the server writes one byte to each worker's notification pipe on
+media clock ticks where something was published.
+
+    ring = SharedMediaRing(slots=1000)
+    reader_end, writer_end = multiprocessing.Pipe(duplex=False)
+    ring.add_notifier(writer_end)
+    Process(target=worker, args=(ring.name, reader_end)).start()
+
+    def worker(name, notifications):
+        reader = SharedMediaReader(name)
+        while reader.wait(notifications, 1.0) is not None:
+            for slot, key, fmt in reader.active_slots():
+                frames, lost = reader.read(slot)
+                ...
+"""
+
+import multiprocessing
+import os
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from ast_media_clock import get_default_clock
+
+MAGIC = b"ASTMEDIA"
+VERSION = 1
+DEFAULT_SLOTS = 256
+# Two seconds of 20ms frames.
+DEFAULT_RING_FRAMES = 100
+# 20ms of slin16, the largest frame chan_websocket sends by default.
+DEFAULT_FRAME_BYTES = 640
+
+# magic, version, slots, ring_frames, frame_bytes
+SEGMENT_HEADER = struct.Struct("<8sIIII")
+SEGMENT_HEADER_SIZE = 64
+# seq, generation, active, format, key
+SLOT_HEADER = struct.Struct("<QQI16s64s")
+SLOT_HEADER_SIZE = 128
+SEQ = struct.Struct("<Q")
+LENGTH = struct.Struct("<H")
+
+
+def slot_size(ring_frames, frame_bytes):
+    lengths = (ring_frames * LENGTH.size + 7) & ~7
+    return SLOT_HEADER_SIZE + lengths + ring_frames * frame_bytes
+
+
+class SharedMediaRing:
+    def __init__(
+        self,
+        name=None,
+        slots=DEFAULT_SLOTS,
+        ring_frames=DEFAULT_RING_FRAMES,
+        frame_bytes=DEFAULT_FRAME_BYTES,
+        clock=None,
+    ):
+        """
+        Creates the shared memory segment.  Call close() to remove it.
+        :param name: Optional segment name.  One is generated if not given.
+        :param slots: Most sessions published at once.
+        :param ring_frames: Frames kept per session for slow workers.
+        :param frame_bytes: Largest frame.  Longer frames are truncated.
+        :param clock: Optional MediaClock for notifications.  Defaults to
+        the shared one.
+        """
+        self.slots = slots
+        self.ring_frames = ring_frames
+        self.frame_bytes = frame_bytes
+        self.slot_bytes = slot_size(ring_frames, frame_bytes)
+        size = SEGMENT_HEADER_SIZE + slots * self.slot_bytes
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        SEGMENT_HEADER.pack_into(
+            self.buf, 0, MAGIC, VERSION, slots, ring_frames, frame_bytes
+        )
+        self.free = list(range(slots - 1, -1, -1))
+        self.seqs = [0] * slots
+        self.generations = [0] * slots
+        self.notifiers = []
+        self.clock = clock or get_default_clock()
+        self.pending = False
+        self.frames = 0
+        self.truncated = 0
+        self.full = 0
+
+    def offset(self, slot):
+        return SEGMENT_HEADER_SIZE + slot * self.slot_bytes
+
+    def __len__(self):
+        return self.slots - len(self.free)
+
+    def attach(self, key, fmt):
+        """
+        Assigns a slot to a session.
+        :param key: A name for the session, such as its connection id.
+        Truncated to 64 bytes.
+        :param fmt: The session's media format.
+        :return: The slot, or None if every slot is in use.
+        """
+        if not self.free:
+            self.full += 1
+            return None
+        slot = self.free.pop()
+        self.seqs[slot] = 0
+        self.generations[slot] += 1
+        SLOT_HEADER.pack_into(
+            self.buf,
+            self.offset(slot),
+            0,
+            self.generations[slot],
+            1,
+            fmt.encode("utf-8"),
+            str(key).encode("utf-8"),
+        )
+        self.notify()
+        return slot
+
+    def detach(self, slot):
+        """
+        Releases a session's slot.  Workers see it as inactive.
+        :param slot: The slot attach() returned.
+        """
+        SLOT_HEADER.pack_into(
+            self.buf,
+            self.offset(slot),
+            self.seqs[slot],
+            self.generations[slot],
+            0,
+            b"",
+            b"",
+        )
+        self.free.append(slot)
+        self.notify()
+
+    def publish(self, slot, frame):
+        """
+        Copies a frame into a session's ring.
+        :param slot: The slot attach() returned.
+        :param frame: bytes-like audio.
+        """
+        seq = self.seqs[slot]
+        index = seq % self.ring_frames
+        base = self.offset(slot)
+        size = len(frame)
+        if size > self.frame_bytes:
+            self.truncated += 1
+            size = self.frame_bytes
+            frame = memoryview(frame)[:size]
+        lengths = base + SLOT_HEADER_SIZE
+        data = lengths + ((self.ring_frames * LENGTH.size + 7) & ~7)
+        start = data + index * self.frame_bytes
+        self.buf[start : start + size] = frame
+        LENGTH.pack_into(self.buf, lengths + index * LENGTH.size, size)
+        # The sequence number is written last so readers never see a frame
+        # before its data.
+        seq += 1
+        self.seqs[slot] = seq
+        SEQ.pack_into(self.buf, base, seq)
+        self.frames += 1
+        self.notify()
+
+    def add_notifier(self, connection):
+        """
+        Adds a worker's notification pipe.
+        :param connection: The write end of a multiprocessing.Pipe(False),
+        or anything else with a fileno().
+        """
+        os.set_blocking(connection.fileno(), False)
+        self.notifiers.append(connection)
+
+    def remove_notifier(self, connection):
+        self.notifiers.remove(connection)
+
+    def notify(self):
+        if self.notifiers and not self.pending:
+            self.pending = True
+            self.clock.add(self)
+
+    async def tick(self, now):
+        self.clock.remove(self)
+        self.pending = False
+        for connection in list(self.notifiers):
+            try:
+                os.write(connection.fileno(), b"\x01")
+            except BlockingIOError:
+                # The worker already has notifications it hasn't read.
+                pass
+            except OSError:
+                self.notifiers.remove(connection)
+
+    def close(self):
+        """
+        Removes the segment.  Workers that still have it open keep their
+        mapping until they close it.
+        """
+        self.clock.remove(self)
+        self.buf = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedMediaReader:
+    def __init__(self, name):
+        """
+        Opens a SharedMediaRing in a worker process.
+        :param name: The ring's name.
+        :raises ValueError: If the segment isn't a SharedMediaRing.
+        """
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 always registers the segment with the resource
+            # tracker.  Children of the server share its tracker, but a
+            # separately started worker has its own that would remove the
+            # segment when the worker exits.
+            self.shm = shared_memory.SharedMemory(name=name)
+            if multiprocessing.parent_process() is None:
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.buf = self.shm.buf
+        magic, version, slots, ring_frames, frame_bytes = SEGMENT_HEADER.unpack_from(
+            self.buf, 0
+        )
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{name}' isn't a media ring")
+        self.slots = slots
+        self.ring_frames = ring_frames
+        self.frame_bytes = frame_bytes
+        self.slot_bytes = slot_size(ring_frames, frame_bytes)
+        self.cursors = [0] * slots
+        self.generations = [0] * slots
+        self.lost = 0
+
+    def offset(self, slot):
+        return SEGMENT_HEADER_SIZE + slot * self.slot_bytes
+
+    def slot_info(self, slot):
+        """
+        Returns (seq, generation, active, format, key) for a slot.
+        """
+        seq, generation, active, fmt, key = SLOT_HEADER.unpack_from(
+            self.buf, self.offset(slot)
+        )
+        fmt = fmt.rstrip(b"\0").decode("utf-8")
+        key = key.rstrip(b"\0").decode("utf-8")
+        return seq, generation, bool(active), fmt, key
+
+    def active_slots(self):
+        """
+        Returns (slot, key, format) for every session being published.
+        """
+        active = []
+        for slot in range(self.slots):
+            _, _, is_active, fmt, key = self.slot_info(slot)
+            if is_active:
+                active.append((slot, key, fmt))
+        return active
+
+    def read(self, slot):
+        """
+        Returns the frames published to a slot since the last read().
+        The frames are memoryviews of the shared memory.  They're only
+        valid until the server overwrites them, about ring_frames frames
+        later, so process or copy them before reading again.
+        :param slot: The slot.
+        :return: (list of memoryviews, frames lost because the reader fell
+        more than ring_frames behind).
+        """
+        base = self.offset(slot)
+        seq, generation = struct.unpack_from("<QQ", self.buf, base)
+        if generation != self.generations[slot]:
+            # A new session.  Start with whatever it's already buffered.
+            self.generations[slot] = generation
+            self.cursors[slot] = max(seq - self.ring_frames + 1, 0)
+        cursor = self.cursors[slot]
+        # The server may already be writing frame seq, into the slot of
+        # frame seq - ring_frames, so that one is never read.
+        start = max(cursor, seq - self.ring_frames + 1)
+        lengths = base + SLOT_HEADER_SIZE
+        data = lengths + ((self.ring_frames * LENGTH.size + 7) & ~7)
+        frames = []
+        for n in range(start, seq):
+            index = n % self.ring_frames
+            (size,) = LENGTH.unpack_from(self.buf, lengths + index * LENGTH.size)
+            offset = data + index * self.frame_bytes
+            frames.append(self.buf[offset : offset + size])
+        # Frames the server overwrote, or may be overwriting, while they
+        # were being collected: up to and including latest - ring_frames.
+        (latest,) = SEQ.unpack_from(self.buf, base)
+        overwritten = max(latest - self.ring_frames + 1 - start, 0)
+        if overwritten:
+            frames = frames[overwritten:]
+        lost = start - cursor + min(overwritten, seq - start)
+        self.lost += lost
+        self.cursors[slot] = seq
+        return frames, lost
+
+    @staticmethod
+    def wait(connection, timeout=None):
+        """
+        Waits for the server to publish something.
+        :param connection: The read end of the worker's notification pipe.
+        :param timeout: Optional seconds to wait.
+        :return: True if notified, False on timeout, None if the server
+        closed the pipe.
+        """
+        if not connection.poll(timeout):
+            return False
+        try:
+            return len(os.read(connection.fileno(), 4096)) > 0 or None
+        except OSError:
+            return None
+
+    def close(self):
+        """
+        Releases the mapping.  Memoryviews from read() must be released
+        first.
+        """
+        self.buf = None
+        self.shm.close()
@@ -0,0 +1,90 @@
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+"""
+
+import numpy as np
+from ast_media_batch import BatchProcessor, grow_array
+
+# Frames louder than this (dB relative to full scale) may be speech.
+DEFAULT_THRESHOLD_DB = -40.0
+# Frames whose zero-crossing rate (crossings per sample) is higher than
+# this are treated as noise however loud they are.
+DEFAULT_MAX_ZCR = 0.35
+# Consecutive speech frames needed to start speech, and consecutive
+# silent frames needed to end it.
+DEFAULT_START_FRAMES = 3
+DEFAULT_END_FRAMES = 20
+
+
+def frame_features(samples):
+    """
+    Computes per-frame energy and zero-crossing rate.
+    :param samples: int16 ndarray with one frame per row.
+    :return: (energy in dBFS, zero crossings per sample), one per row.
+    """
+    x = samples.astype(np.float32)
+    energy = np.einsum("ij,ij->i", x, x) / (x.shape[1] * 32768.0 * 32768.0)
+    db = 10 * np.log10(energy + 1e-10)
+    signs = x >= 0
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / x.shape[1]
+    return db, zcr
+
+
+class VoiceActivityDetector(BatchProcessor):
+    def __init__(
+        self,
+        listener,
+        clock=None,
+        threshold_db=DEFAULT_THRESHOLD_DB,
+        max_zcr=DEFAULT_MAX_ZCR,
+        start_frames=DEFAULT_START_FRAMES,
+        end_frames=DEFAULT_END_FRAMES,
+        tag=None,
+        log_level=None,
+    ):
+        """
+        Detects speech on any number of streams.  The queued frames of
+        every stream are classified together on each MediaClock tick and
+        listener(key, speaking) is called when a stream starts or stops
+        speaking.
+        :param listener: Called with the stream's key and True or False.
+        :param clock: Optional MediaClock.  Defaults to the shared one.
+        :param threshold_db: Minimum speech energy in dBFS.
+        :param max_zcr: Maximum speech zero-crossing rate.
+        :param start_frames: Speech frames in a row that start speech.
+        :param end_frames: Silent frames in a row that end speech.
+        :param tag: Optional tag for logging.
+        :param log_level: Optional log level.  One of logging.LOG_LEVEL.
+        """
+        super().__init__(listener, clock, tag, log_level)
+        self.threshold_db = threshold_db
+        self.max_zcr = max_zcr
+        self.limits = np.array([start_frames, end_frames], dtype=np.int32)
+        self.speaking = np.zeros(len(self.keys), dtype=bool)
+        self.run = np.zeros(len(self.keys), dtype=np.int32)
+
+    def reset(self, slot):
+        self.speaking[slot] = False
+        self.run[slot] = 0
+
+    def resize(self, size):
+        self.speaking = grow_array(self.speaking, size)
+        self.run = grow_array(self.run, size)
+
+    def classify(self, fmt, slots, samples):
+        db, zcr = frame_features(samples)
+        speech = (db > self.threshold_db) & (zcr < self.max_zcr)
+        speaking = self.speaking[slots]
+        run = np.where(speech != speaking, self.run[slots] + 1, 0)
+        changed = run >= self.limits[speaking.astype(np.intp)]
+        run[changed] = 0
+        self.run[slots] = run
+        if not changed.any():
+            return
+        self.speaking[slots[changed]] = ~speaking[changed]
+        for slot in slots[changed]:
+            self.notify(slot, bool(self.speaking[slot]))
@@ -7,25 +7,290 @@ the Apache License Version 2.0.
 """
 
 import asyncio
-import io
+from collections import deque
 import logging
 from logging import INFO, WARNING, ERROR, DEBUG, NOTSET
 import traceback
 from websockets.asyncio.server import serve
 from websockets.asyncio.server import basic_auth
 from websockets.asyncio.client import connect
+from ast_media_cache import get_default_cache
+from ast_media_clock import get_default_clock
+from ast_media_fanout import DEFAULT_CAPACITY, FanoutBuffer
+from ast_media_framer import SILENCE, FrameNormalizer, frame_bytes
+from ast_media_playback import DEFAULT_PTIME, FlowControl, Playback
+from ast_media_queue import DEFAULT_MAXSIZE, FrameQueue
+
+# 20ms of ulaw, used until MEDIA_START says otherwise.
+DEFAULT_FRAME_SIZE = 160
+# Frames queued by send_nowait() for a peer that isn't reading before
+# more are refused.
+MAX_QUEUED_FRAMES = 10
+
+
+class MediaSession:
+    __slots__ = (
+        "owner",
+        "ws_media",
+        "connection_id",
+        "channel",
+        "format",
+        "optimal_frame_size",
+        "ptime",
+        "flow",
+        "outbox",
+        "spare",
+        "writer",
+        "wakeup",
+        "framer",
+        "playback",
+        "sending_file",
+        "frames_in",
+        "bytes_in",
+        "frames_out",
+        "bytes_out",
+        "dropped_out",
+        "vad_slot",
+        "dtmf_slot",
+        "mixer",
+        "recorder",
+        "fanout",
+        "queues",
+        "shm_slot",
+        "relay",
+        "speaking",
+    )
+
+    def __init__(self, owner, ws_media, connection_id=None):
+        """
+        State for one media websocket connection: the MEDIA_START
+        parameters, flow control and playback state, and counters.
+        :param owner: The AstMediaWebSocket that accepted the connection.
+        :param ws_media: The websocket connection.
+        :param connection_id: The connection id, if known before MEDIA_START.
+        """
+        self.owner = owner
+        self.ws_media = ws_media
+        self.connection_id = connection_id
+        self.channel = None
+        self.format = None
+        self.optimal_frame_size = 0
+        self.ptime = DEFAULT_PTIME
+        self.flow = FlowControl()
+        self.outbox = deque()
+        self.spare = []
+        self.writer = None
+        self.wakeup = None
+        self.framer = None
+        self.playback = None
+        self.sending_file = False
+        self.frames_in = 0
+        self.bytes_in = 0
+        self.frames_out = 0
+        self.bytes_out = 0
+        self.dropped_out = 0
+        self.vad_slot = None
+        self.dtmf_slot = None
+        self.mixer = None
+        self.recorder = None
+        self.fanout = None
+        self.queues = []
+        self.shm_slot = None
+        self.relay = None
+        self.speaking = False
+
+    @property
+    def frame_size(self):
+        return self.optimal_frame_size or DEFAULT_FRAME_SIZE
+
+    def log(self, level, message):
+        """
+        Logs a message tagged with the channel name.
+        :param level: The logging level (e.g., info, warning, error).
+        :param message: The message to log.
+        """
+        if self.channel is None:
+            self.owner.log(level, message)
+        else:
+            self.owner.log(level, f"{self.channel}: {message}")
+
+    def media_start(self, message):
+        """
+        Parses the parameters of a MEDIA_START notification.
+        :param message: The MEDIA_START notification.
+        """
+        for p in message.split(" ")[1:]:
+            name, _, value = p.partition(":")
+            if name == "connection_id":
+                self.connection_id = value
+            elif name == "channel":
+                self.channel = value
+            elif name == "format":
+                self.format = value
+            elif name == "optimal_frame_size":
+                self.optimal_frame_size = int(value)
+            elif name == "ptime":
+                self.ptime = int(value)
+
+    def subscribe(self, name=None, policy="drop", capacity=DEFAULT_CAPACITY):
+        """
+        Adds a consumer of the inbound audio.  Every consumer reads the
+        same copy of each frame and a slow one can't hold up the others or
+        the websocket.
+        :param name: Optional name for the consumer's stats.
+        :param policy: "drop" or "close".  See FanoutBuffer.
+        :param capacity: Frames buffered for slow consumers.  Only used by
+        the first subscribe().
+        :return: A Subscriber.  Use "async for frame in subscriber".
+        """
+        if self.fanout is None:
+            self.fanout = FanoutBuffer(capacity)
+        return self.fanout.subscribe(name, policy)
+
+    def frames(self, maxsize=DEFAULT_MAXSIZE, policy="drop-oldest", name=None):
+        """
+        Returns the session's inbound audio as an async iterator:
+
+            async for frame in session.frames():
+                ...
+
+        The websocket reader never waits for the consumer.  Frames that
+        don't fit in the queue are handled according to the policy.
+        Iteration ends when the media disconnects.  Call close() on the
+        queue to stop early.
+        :param maxsize: Most frames queued for a slow consumer.
+        :param policy: "drop-oldest", "drop-newest" or "block".  See
+        FrameQueue.
+        :param name: Optional name for the consumer's stats.
+        :return: A FrameQueue.  Each frame is a read-only memoryview that's
+        valid until the next one is read.
+        """
+        queue = FrameQueue(maxsize, policy, name)
+        self.queues.append(queue)
+        return queue
+
+    async def send(self, frame):
+        """
+        Sends a media frame and counts it.
+        :param frame: bytes-like audio.
+        """
+        await self.ws_media.send(frame)
+        if self.recorder is not None:
+            self.recorder.write_out(frame)
+        self.frames_out += 1
+        self.bytes_out += len(frame)
+
+    def send_nowait(self, frame):
+        """
+        Queues a media frame for the session's writer task and returns
+        without waiting for the socket, so code driven by the shared
+        MediaClock is never held up by a peer that has stopped reading.
+        Frames that aren't bytes are copied into reused buffers.
+        :param frame: bytes-like audio.
+        :return: False if MAX_QUEUED_FRAMES are already queued and the
+        frame wasn't.
+        """
+        if len(self.outbox) >= MAX_QUEUED_FRAMES:
+            return False
+        if not isinstance(frame, bytes):
+            buffer = self.spare.pop() if self.spare else None
+            if buffer is None or len(buffer) != len(frame):
+                buffer = bytearray(frame)
+            else:
+                buffer[:] = frame
+            frame = buffer
+        self.queue(frame)
+        return True
+
+    def send_control(self, message):
+        """
+        Queues a command such as STOP_MEDIA_BUFFERING behind the frames
+        already queued.  Commands are never refused.
+        :param message: The command.
+        """
+        self.queue(message)
+
+    def discard_queued(self):
+        """
+        Drops queued frames that haven't started being sent.  Queued
+        commands are kept.
+        """
+        outbox = self.outbox
+        for _ in range(len(outbox) - 1):
+            # Rotate everything after the first item, which may be in
+            # the middle of being sent, keeping only commands.
+            item = outbox.pop()
+            if isinstance(item, str):
+                outbox.insert(1, item)
+            elif isinstance(item, bytearray):
+                self.spare.append(item)
+
+    @property
+    def backlog(self):
+        return len(self.outbox)
+
+    def queue(self, item):
+        self.outbox.append(item)
+        if self.writer is None:
+            self.writer = asyncio.create_task(self.write_queued())
+        elif self.wakeup is not None and not self.wakeup.done():
+            self.wakeup.set_result(None)
+
+    async def write_queued(self):
+        outbox = self.outbox
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                while outbox:
+                    # Stays queued while it's being sent so backlog counts it.
+                    item = outbox[0]
+                    if isinstance(item, str):
+                        await self.ws_media.send(item)
+                    else:
+                        await self.send(item)
+                    outbox.popleft()
+                    if isinstance(item, bytearray):
+                        self.spare.append(item)
+                self.wakeup = loop.create_future()
+                await self.wakeup
+                self.wakeup = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.log(WARNING, f"Unable to send media: {e}")
+            outbox.clear()
+            self.writer = None
+
+    def stop_writer(self):
+        if self.writer is not None:
+            self.writer.cancel()
 
 
 class AstMediaWebSocket:
-    def __init__(self, tag=None, log_level=None):
+    # Stop playback when the caller starts speaking.  Needs enable_vad().
+    barge_in = False
+    # Milliseconds of audio in each inbound frame passed on to playback,
+    # detectors, mixers and so on.  None uses the optimal_frame_size.
+    frame_ms = None
+
+    def __init__(self, tag=None, log_level=None, clock=None, cache=None):
         """
         :param tag: Optional tag for logging.
         :param log_level: Optional log level.  One of logging.LOG_LEVEL.
+        :param clock: Optional MediaClock to pace playback with.  Defaults
+        to the clock shared by the whole process.
+        :param cache: Optional PromptCache to load files from.  Defaults
+        to the cache shared by the whole process.
         """
         self.logger = logging.getLogger(__name__)
         self.tag = tag
-        self.optimal_frame_size = 0
-        self.sending_file = False
+        self.clock = clock
+        self.cache = cache
+        self.sessions = {}
+        self.vad = None
+        self.dtmf = None
+        self.shared_ring = None
+        self.relays = {}
         if log_level is not None:
             self.logger.setLevel(log_level)
 
@@ -38,35 +303,268 @@ class AstMediaWebSocket:
         tag = "" if self.tag is None else f"{self.tag}: "
         self.logger.log(level, f"{tag}{message}")
 
-    async def send_file(self, ws_media, filename, lock, sent_data=None):
+    async def send_file(self, session, filename, sent_data=None):
         """
-        Sends a file over the media websocket.
-        :param ws_media: The websocket connection to send the file over.
+        Sends a file over the media websocket in optimal_frame_size frames
+        paced at real-time rate.
+        :param session: The MediaSession to send the file on.
         :param filename: The path to the file to send.
-        :param lock: An asyncio lock to use to throttle outgoing data.
         :param sent_data: Optional buffer to store sent data for verification.
         """
-        buff_size = 1000
-        f = io.open(filename, "rb", buffering=0)
-        self.log(INFO, f"Playing '{filename}'")
-        await ws_media.send("START_MEDIA_BUFFERING")
-        while True:
-            async with lock:
-                buff = f.read(buff_size)
-                if buff is None or len(buff) <= 0:
-                    break
-                # Send on the websocket
-                await ws_media.send(buff)
-                if sent_data is not None:
-                    sent_data.write(buff)
-        f.close()
-        await ws_media.send(f"STOP_MEDIA_BUFFERING {filename}")
-        self.log(INFO, f"Stopping '{filename}'")
-
-    async def echo_timer(self, ws_media, filename, timeout, lock):
+        cache = self.cache or get_default_cache()
+        frames = await cache.frames(filename, session.frame_size)
+        session.log(INFO, f"Playing '{filename}'")
+        session.send_control("START_MEDIA_BUFFERING")
+        playback = Playback(
+            session,
+            frames,
+            self.clock or get_default_clock(),
+            session.ptime,
+            flow=session.flow,
+            sent_data=sent_data,
+        )
+        session.playback = playback
+        try:
+            await playback.start()
+        except Exception as e:
+            # Still end the buffering so Asterisk reports the playback
+            # completed and echo resumes.
+            session.log(ERROR, f"Playing '{filename}' failed: {e}")
+        finally:
+            if session.playback is playback:
+                session.playback = None
+        session.send_control(f"STOP_MEDIA_BUFFERING {filename}")
+        session.log(INFO, f"Stopping '{filename}'")
+
+    async def echo_timer(self, session, filename, timeout):
         await asyncio.sleep(timeout)
-        self.sending_file = True
-        asyncio.create_task(self.send_file(ws_media, filename, lock))
+        session.sending_file = True
+        asyncio.create_task(self.send_file(session, filename))
+
+    def enable_vad(self, barge_in=None, **kwargs):
+        """
+        Runs voice activity detection on inbound audio.  Requires numpy.
+        :param barge_in: Optionally overrides the barge_in class attribute.
+        :param kwargs: Passed to VoiceActivityDetector.
+        """
+        from ast_media_vad import VoiceActivityDetector
+
+        if barge_in is not None:
+            self.barge_in = barge_in
+        self.vad = VoiceActivityDetector(
+            self.speech_changed, self.clock, tag=self.tag, **kwargs
+        )
+
+    def speech_changed(self, session, speaking):
+        session.speaking = speaking
+        if not speaking:
+            asyncio.create_task(self.handle_speech_end(session))
+            return
+        if self.barge_in and session.playback is not None:
+            self.barge(session)
+        asyncio.create_task(self.handle_speech_start(session))
+
+    def barge(self, session):
+        """
+        Stops the current playback and has Asterisk discard whatever it
+        has buffered so the caller hears silence right away.
+        :param session: The MediaSession the caller is speaking on.
+        """
+        session.log(INFO, "Barge-in, stopping playback")
+        # Queued frames would only be flushed again.  The flush goes out
+        # before send_file's STOP_MEDIA_BUFFERING.
+        session.discard_queued()
+        session.send_control("FLUSH_MEDIA")
+        session.playback.stop()
+        session.sending_file = False
+
+    async def handle_speech_start(self, session):
+        """
+        Called when the caller starts speaking.  Override to act on it.
+        :param session: The MediaSession.
+        """
+        session.log(DEBUG, "Speech started")
+
+    async def handle_speech_end(self, session):
+        """
+        Called when the caller stops speaking.  Override to act on it.
+        :param session: The MediaSession.
+        """
+        session.log(DEBUG, "Speech ended")
+
+    def enable_dtmf(self, **kwargs):
+        """
+        Detects DTMF in inbound audio and calls handle_dtmf() for each
+        digit.  Requires numpy.
+        :param kwargs: Passed to DtmfDetector.
+        """
+        from ast_media_dtmf import DtmfDetector
+
+        self.dtmf = DtmfDetector(self.dtmf_received, self.clock, tag=self.tag, **kwargs)
+
+    def dtmf_received(self, session, digit):
+        asyncio.create_task(self.handle_dtmf(session, digit))
+
+    async def handle_dtmf(self, session, digit):
+        """
+        Called for each DTMF digit detected.  Override to act on it.
+        :param session: The MediaSession.
+        :param digit: The digit, one of "0123456789*#ABCD".
+        """
+        session.log(INFO, f"DTMF '{digit}'")
+
+    def enable_shared_memory(self, **kwargs):
+        """
+        Publishes every session's inbound audio to a shared memory ring
+        that worker processes can read with SharedMediaReader.
+        :param kwargs: Passed to SharedMediaRing.
+        :return: The SharedMediaRing.  Add worker notification pipes to
+        it and close() it when done.
+        """
+        from ast_media_shm import SharedMediaRing
+
+        self.shared_ring = SharedMediaRing(clock=self.clock, **kwargs)
+        self.log(INFO, f"Publishing media to shared memory '{self.shared_ring.name}'")
+        return self.shared_ring
+
+    def start_analysis(self, session):
+        """
+        Adds a session to the enabled detectors and the shared memory ring
+        once its format is known.
+        :param session: The MediaSession.
+        """
+        if self.shared_ring is not None and session.shm_slot is None:
+            session.shm_slot = self.shared_ring.attach(
+                session.connection_id, session.format
+            )
+            if session.shm_slot is None:
+                session.log(WARNING, "No free shared memory slot")
+        try:
+            if self.vad is not None and session.vad_slot is None:
+                session.vad_slot = self.vad.add(session, session.format)
+            if self.dtmf is not None and session.dtmf_slot is None:
+                session.dtmf_slot = self.dtmf.add(session, session.format)
+        except ValueError as e:
+            session.log(WARNING, f"Unable to analyze media: {e}")
+
+    def stop_analysis(self, session):
+        if session.vad_slot is not None:
+            self.vad.remove(session.vad_slot)
+            session.vad_slot = None
+        if session.dtmf_slot is not None:
+            self.dtmf.remove(session.dtmf_slot)
+            session.dtmf_slot = None
+        if session.shm_slot is not None:
+            self.shared_ring.detach(session.shm_slot)
+            session.shm_slot = None
+
+    def start_recording(self, session, base, **kwargs):
+        """
+        Starts recording a session's audio.  Requires MEDIA_START to have
+        been received.
+        :param session: The MediaSession.
+        :param base: Path of the recording without an extension.
+        :param kwargs: Passed to Recorder.
+        :return: The Recorder.
+        """
+        from ast_media_recorder import Recorder
+
+        if session.recorder is not None:
+            raise ValueError(f"{session.channel} is already being recorded")
+        session.recorder = Recorder(session, base, **kwargs)
+        session.log(INFO, f"Recording to '{base}'")
+        return session.recorder
+
+    async def stop_recording(self, session):
+        """
+        Stops recording a session and waits for the files to be closed.
+        :param session: The MediaSession.
+        """
+        recorder = session.recorder
+        if recorder is None:
+            return
+        session.recorder = None
+        await recorder.close()
+        session.log(INFO, f"Recorded {recorder.frames} frames")
+
+    def join_relay(self, session):
+        """
+        Connects a session to the relay set up for its connection id.
+        :param session: The MediaSession.
+        """
+        relay = self.relays[session.connection_id]
+        try:
+            relay.join(session)
+        except (ImportError, ValueError) as e:
+            session.log(ERROR, f"Unable to relay media: {e}")
+            self.leave_relay(session)
+
+    def leave_relay(self, session):
+        relay = session.relay
+        if relay is not None and relay.leave(session):
+            for connection_id in relay.connection_ids:
+                if self.relays.get(connection_id) is relay:
+                    del self.relays[connection_id]
+
+    def start_framing(self, session):
+        """
+        Sets up re-chunking of a session's inbound media into frames of
+        frame_ms, or of its optimal_frame_size.
+        :param session: The MediaSession.
+        """
+        size = session.frame_size
+        if self.frame_ms is not None:
+            try:
+                size = frame_bytes(session.format, self.frame_ms)
+            except ValueError as e:
+                session.log(WARNING, f"{e}.  Using {size} byte frames.")
+        session.framer = FrameNormalizer(size, silence=SILENCE.get(session.format, 0))
+
+    def create_session(self, ws_media):
+        """
+        Creates the MediaSession for a new connection.  Override to use a
+        MediaSession subclass.
+        :param ws_media: The websocket connection.
+        """
+        return MediaSession(self, ws_media)
+
+    async def process_frame(self, session, frame):
+        """
+        Passes one inbound frame to everything that uses the session's
+        audio and echoes it if nothing else does.
+
+        The frame is borrowed.  It may be a view of a buffer that's reused
+        once this returns, so anything that keeps it must copy it: the
+        recorder, fan-out, frame queues, shared memory ring and mixer copy
+        into buffers of their own, and the detectors copy views they queue.
+        send() copies outbound frames before it returns, so send buffers
+        can be reused as soon as it has.
+        :param session: The MediaSession.
+        :param frame: Exactly one frame.  bytes or a memoryview.
+        """
+        if session.recorder is not None:
+            session.recorder.write_in(frame)
+        if session.fanout is not None:
+            session.fanout.publish(frame)
+        for queue in session.queues:
+            queue.put(frame)
+            if queue.closed:
+                session.queues = [q for q in session.queues if not q.closed]
+        if session.shm_slot is not None:
+            self.shared_ring.publish(session.shm_slot, frame)
+        if session.vad_slot is not None:
+            self.vad.feed(session.vad_slot, frame)
+        if session.dtmf_slot is not None:
+            self.dtmf.feed(session.dtmf_slot, frame)
+        if session.relay is not None:
+            session.relay.forward(session, frame)
+        elif session.mixer is not None:
+            session.mixer.feed(session, frame)
+        elif not session.sending_file:
+            if session.flow.paused:
+                session.dropped_out += 1
+            else:
+                await session.send(frame)
 
     async def process_media(self, ws_media):
         """
@@ -74,50 +572,90 @@ class AstMediaWebSocket:
         :param ws_media: The websocket connection to process media on.
         """
         self.log(INFO, f"Media websocket connection from {ws_media.remote_address}")
+        session = self.create_session(ws_media)
+        loop = asyncio.get_running_loop()
         try:
-            lock = asyncio.Lock()
             async for message in ws_media:
                 if isinstance(message, str):
-                    self.log(INFO, f"Received media notification {message}")
+                    session.log(INFO, f"Received media notification {message}")
                     if "MEDIA_START" in message:
-                        ma = message.split(" ")
-                        for p in ma[1:]:
-                            v = p.split(":")
-                            if v[0] == "channel":
-                                self.tag = v[1]
-                            elif v[0] == "optimal_frame_size":
-                                self.optimal_frame_size = int(v[1])
-                        self.sending_file = True
-                        asyncio.create_task(
-                            self.send_file(ws_media, "echo-announce.ulaw", lock)
-                        )
+                        session.media_start(message)
+                        if session.connection_id is not None:
+                            self.sessions[session.connection_id] = session
+                        self.start_framing(session)
+                        self.start_analysis(session)
+                        if session.connection_id in self.relays:
+                            self.join_relay(session)
+                        else:
+                            session.sending_file = True
+                            asyncio.create_task(
+                                self.send_file(session, "echo-announce.ulaw")
+                            )
                     if "MEDIA_XOFF" in message:
-                        await lock.acquire()
+                        session.flow.xoff(loop.time())
                     if "MEDIA_XON" in message:
-                        lock.release()
+                        session.flow.xon(loop.time())
                     if "MEDIA_BUFFERING_COMPLETED" in message:
-                        self.sending_file = False
+                        session.sending_file = False
                         ca = message.split(" ")
                         if "zombies" in ca[1]:
                             await ws_media.send("HANGUP")
                             break
                         else:
                             asyncio.create_task(
-                                self.echo_timer(ws_media, "zombies.ulaw", 10, lock)
+                                self.echo_timer(session, "zombies.ulaw", 10)
                             )
                     continue
-                if not self.sending_file:
-                    await ws_media.send(message)
+                session.frames_in += 1
+                session.bytes_in += len(message)
+                if session.framer is None:
+                    self.start_framing(session)
+                for frame in session.framer.split(message):
+                    await self.process_frame(session, frame)
         except Exception as e:
-            self.log(ERROR, f"Media error {e}")
+            session.log(ERROR, f"Media error {e}")
             traceback.print_exc()
             raise e
         finally:
-            self.log(INFO, "Media disconnected")
+            if session.playback is not None:
+                session.playback.stop()
+            session.stop_writer()
+            self.stop_analysis(session)
+            if session.fanout is not None:
+                session.fanout.close()
+            for queue in session.queues:
+                queue.close()
+            if session.mixer is not None:
+                session.mixer.remove(session)
+            if session.relay is not None:
+                self.leave_relay(session)
+            try:
+                await self.stop_recording(session)
+            except Exception as e:
+                session.log(ERROR, f"Unable to finish recording: {e}")
+            if self.sessions.get(session.connection_id) is session:
+                del self.sessions[session.connection_id]
+            session.log(
+                INFO,
+                f"Media disconnected. In: {session.frames_in} frames "
+                f"{session.bytes_in} bytes Out: {session.frames_out} frames "
+                f"{session.bytes_out} bytes XOFF: {session.flow.xoff_count} "
+                f"paused {session.flow.paused_time:.2f}s",
+            )
 
 
 class AstMediaWebSocketServer(AstMediaWebSocket):
-    def __init__(self, host, port, credentials, protocol, tag=None, log_level=None):
+    def __init__(
+        self,
+        host,
+        port,
+        credentials,
+        protocol,
+        tag=None,
+        log_level=None,
+        clock=None,
+        cache=None,
+    ):
         """
         Initializes the media websocket server.
         :param host: The host address to bind the server to.
@@ -125,14 +663,44 @@ class AstMediaWebSocketServer(AstMediaWebSocket):
         :param credentials: Optional credential tuple for authentication ("username", "password")
         :param protocol: The protocol to use for the websocket. Default "media".
         :param tag: Optional tag for logging.
+        :param clock: Optional MediaClock to pace playback with.
+        :param cache: Optional PromptCache to load files from.
         """
-        super().__init__(tag, log_level)
+        super().__init__(tag, log_level, clock, cache)
         self.host = host
         self.port = port
         self.protocol = protocol
         self.credentials = credentials
         self.server = None
 
+    def relay(self, connection_id1, connection_id2, processor=None):
+        """
+        Connects the media of two websocket channels to each other instead
+        of echoing it, replacing an Asterisk bridge between them.  The
+        sessions can connect before or after this is called.  The relay is
+        removed once both have disconnected.
+        :param connection_id1: Connection id of one channel.
+        :param connection_id2: Connection id of the other.
+        :param processor: Optional callable(session, frame) that sees every
+        frame first.  See MediaRelay.
+        :return: The MediaRelay.
+        """
+        from ast_media_relay import MediaRelay
+
+        relay = MediaRelay(connection_id1, connection_id2, processor)
+        for connection_id in relay.connection_ids:
+            if connection_id in self.relays:
+                raise ValueError(f"'{connection_id}' is already being relayed")
+        for connection_id in relay.connection_ids:
+            self.relays[connection_id] = relay
+            session = self.sessions.get(connection_id)
+            if session is not None:
+                if session.playback is not None:
+                    session.playback.stop()
+                session.sending_file = False
+                self.join_relay(session)
+        return relay
+
     async def listen(self):
         """
         Starts the media websocket server and listens for incoming connections.
@@ -161,13 +729,24 @@ class AstMediaWebSocketServer(AstMediaWebSocket):
 
 
 class AstMediaWebSocketClient(AstMediaWebSocket):
-    def __init__(self, host, port, connection_id, tag=None, log_level=None):
+    def __init__(
+        self,
+        host,
+        port,
+        connection_id,
+        tag=None,
+        log_level=None,
+        clock=None,
+        cache=None,
+    ):
         """
         Initializes the media websocket client.
         :param uri: The URI to connect to the media websocket.
         :param tag: Optional tag for logging.
+        :param clock: Optional MediaClock to pace playback with.
+        :param cache: Optional PromptCache to load files from.
         """
-        super().__init__(tag, log_level)
+        super().__init__(tag, log_level, clock, cache)
         self.host = host
         self.port = port
         self.connection_id = connection_id
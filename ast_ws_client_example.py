@@ -10,12 +10,14 @@ the Apache License Version 2.0.
 
 from argparse import ArgumentParser as ArgParser
 import asyncio
-import json
 import logging
 import sys
 import uuid
 import traceback
+import ast_json
+from ast_media_cache import get_default_cache
 from ast_media_websocket import AstMediaWebSocketClient
+from ast_call_setup import CallSetupPlan
 from ast_ari_websocket import AstAriWebSocketClient
 
 logger = logging.getLogger(__name__)
@@ -62,7 +64,7 @@ class ast_ws_client(AstAriWebSocketClient):
                     {"name": "originator", "value": incoming_id},
                 ],
             )
-            msg_body = json.loads(resp.get("message_body"))
+            msg_body = ast_json.loads(resp.get("message_body"))
             sess.ws_channel = msg_body["id"]
             sess.ws_channel_name = msg_body["name"]
             self.sessions_by_websocket[sess.ws_channel] = sess
@@ -106,17 +108,43 @@ class ast_ws_client(AstAriWebSocketClient):
             sess = self.sessions_by_websocket.get(msg["peer"]["id"])
             sess.bridge_id = str(uuid.uuid4())
             logger.info(f"Creating bridge {sess.bridge_id}")
-            await self.send_request("POST", f"bridges/{sess.bridge_id}?type=mixing")
-            await self.send_request(
-                "POST",
-                f"bridges/{sess.bridge_id}/addChannel?channel={sess.incoming_channel}",
+            logger.info(f"Answering {sess.incoming_channel_name}")
+            plan = CallSetupPlan()
+            plan.create_bridge("bridge", sess.bridge_id)
+            plan.add_channel(
+                "add_incoming", sess.bridge_id, sess.incoming_channel, after=["bridge"]
             )
-            await self.send_request(
-                "POST", f"bridges/{sess.bridge_id}/addChannel?channel={sess.ws_channel}"
+            plan.add_channel(
+                "add_websocket", sess.bridge_id, sess.ws_channel, after=["bridge"]
             )
-
-            logger.info(f"Answering {sess.incoming_channel_name}")
-            await self.send_request("POST", f"channels/{sess.incoming_channel}/answer")
+            plan.answer("answer", sess.incoming_channel)
+            await plan.run(self)
+
+    async def reconcile(self, channels, bridges):
+        """
+        Drops sessions that lost a channel while we were disconnected,
+        hanging up the surviving channel and deleting the bridge.
+        """
+        live_channels = {c["id"] for c in channels}
+        live_bridges = {b["id"] for b in bridges}
+        sessions = {id(s): s for s in self.sessions_by_incoming.values()}
+        sessions.update({id(s): s for s in self.sessions_by_websocket.values()})
+        for sess in sessions.values():
+            incoming_live = sess.incoming_channel in live_channels
+            ws_live = sess.ws_channel in live_channels
+            if incoming_live and ws_live:
+                continue
+            logger.info(f"Dropping stale session for {sess.incoming_channel_name}")
+            requests = []
+            if incoming_live:
+                requests.append(("DELETE", f"channels/{sess.incoming_channel}"))
+            if ws_live:
+                requests.append(("DELETE", f"channels/{sess.ws_channel}"))
+            if sess.bridge_id in live_bridges:
+                requests.append(("DELETE", f"bridges/{sess.bridge_id}"))
+            self.sessions_by_incoming.pop(sess.incoming_channel, None)
+            self.sessions_by_websocket.pop(sess.ws_channel, None)
+            await self.send_requests(requests, return_exceptions=True)
 
     async def handle_stasisend(self, msg):
         sess = None
@@ -152,6 +180,7 @@ async def main(args):
         (args.ari_user, args.ari_password),
         log_level=logging.INFO,
     )
+    await get_default_cache().warm(".")
     try:
         await event_handler.connect()
     except KeyboardInterrupt:
@@ -14,7 +14,9 @@ import logging
 import sys
 import uuid
 import traceback
+from ast_media_cache import get_default_cache
 from ast_media_websocket import AstMediaWebSocketServer
+from ast_call_setup import CallSetupPlan
 from ast_ari_websocket import AstAriWebSocketServer
 
 logger = logging.getLogger(__name__)
@@ -109,17 +111,17 @@ class ast_ws_server(AstAriWebSocketServer):
             sess = self.sessions_by_websocket.get(msg["peer"]["id"])
             sess.bridge_id = str(uuid.uuid4())
             logger.info(f"Creating bridge {sess.bridge_id}")
-            await self.send_request("POST", f"bridges/{sess.bridge_id}?type=mixing")
-            await self.send_request(
-                "POST",
-                f"bridges/{sess.bridge_id}/addChannel?channel={sess.incoming_channel}",
+            logger.info(f"Answering {sess.incoming_channel_name}")
+            plan = CallSetupPlan()
+            plan.create_bridge("bridge", sess.bridge_id)
+            plan.add_channel(
+                "add_incoming", sess.bridge_id, sess.incoming_channel, after=["bridge"]
             )
-            await self.send_request(
-                "POST", f"bridges/{sess.bridge_id}/addChannel?channel={sess.ws_channel}"
+            plan.add_channel(
+                "add_websocket", sess.bridge_id, sess.ws_channel, after=["bridge"]
             )
-
-            logger.info(f"Answering {sess.incoming_channel_name}")
-            await self.send_request("POST", f"channels/{sess.incoming_channel}/answer")
+            plan.answer("answer", sess.incoming_channel)
+            await plan.run(self)
 
     async def handle_stasisend(self, msg):
         sess = None
@@ -168,6 +170,7 @@ async def main(args):
         tag="ari_ws_server",
         log_level=logging.INFO,
     )
+    await get_default_cache().warm(".")
     try:
         await event_handler.listen()
     except Exception:
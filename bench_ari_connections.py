@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Opens a few hundred per-call ARI websocket connections to one
+AstAriWebSocketServer at once, the way Asterisk does with a per-call
+ari.conf outbound websocket, and checks that the REST requests made while
+handling each call's events go out on, and are answered on, that call's
+own connection.  Each simulated Asterisk answers a channel GET with its
+own channel so a response delivered to the wrong call is caught too.
+Exits with 1 if any request was misrouted, lost or answered for the
+wrong call, or if the server had to guess which connection to use.
+"""
+
+from argparse import ArgumentParser as ArgParser
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from websockets.asyncio.client import connect
+from ast_ari_websocket import AstAriWebSocketServer
+
+APP = "bench"
+
+
+class WarningCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+class BenchServer(AstAriWebSocketServer):
+    def __init__(self, jitter):
+        super().__init__("localhost", 0, None, log_level=logging.WARNING)
+        self.jitter = jitter
+        self.answered = 0
+        self.wrong = 0
+        self.failed = 0
+
+    async def handle_stasisstart(self, msg):
+        channel_id = msg["channel"]["id"]
+        try:
+            await asyncio.sleep(random.random() * self.jitter)
+            await self.channels.answer(channel_id)
+            await asyncio.sleep(random.random() * self.jitter)
+            channel = await self.channels.get(channel_id)
+        except Exception:
+            self.failed += 1
+            return
+        if channel["id"] == channel_id:
+            self.answered += 1
+        else:
+            self.wrong += 1
+
+
+class FakeCall:
+    def __init__(self, index, jitter):
+        """
+        One call's Asterisk end of a per-call ARI connection.
+        """
+        self.channel_id = f"bench-{index}"
+        self.jitter = jitter
+        self.requests = 0
+        self.misrouted = 0
+
+    def response(self, req, body=""):
+        return json.dumps(
+            {
+                "type": "RESTResponse",
+                "request_id": req["request_id"],
+                "status_code": 200 if body else 204,
+                "reason_phrase": "OK" if body else "No Content",
+                "message_body": body,
+            }
+        )
+
+    async def run(self, port):
+        channel = {"id": self.channel_id, "name": f"PJSIP/{self.channel_id}"}
+        async with connect(f"ws://localhost:{port}", subprotocols=["ari"]) as ws:
+            await ws.send(
+                json.dumps(
+                    {"type": "StasisStart", "application": APP, "channel": channel}
+                )
+            )
+            async for message in ws:
+                req = json.loads(message)
+                if req["uri"].startswith("applications/"):
+                    # The event filter, if the server sets one.
+                    await ws.send(self.response(req))
+                    continue
+                self.requests += 1
+                if self.channel_id not in req["uri"].split("?")[0].split("/"):
+                    self.misrouted += 1
+                body = ""
+                if req["method"] == "GET":
+                    body = json.dumps(channel)
+                await asyncio.sleep(random.random() * self.jitter)
+                await ws.send(self.response(req, body))
+                if req["method"] == "GET":
+                    break
+            await ws.send(
+                json.dumps(
+                    {"type": "StasisEnd", "application": APP, "channel": channel}
+                )
+            )
+
+
+async def main(args):
+    warnings = WarningCounter()
+    logging.getLogger().addHandler(warnings)
+    ari = BenchServer(args.jitter / 1000)
+    server = asyncio.create_task(ari.listen())
+    while ari.server is None:
+        await asyncio.sleep(0.01)
+    port = ari.server.sockets[0].getsockname()[1]
+    calls = [FakeCall(i, args.jitter / 1000) for i in range(args.calls)]
+    start = time.perf_counter()
+    # A call whose requests went out on another connection never ends.
+    done, unfinished = await asyncio.wait(
+        [asyncio.create_task(call.run(port)) for call in calls], timeout=args.timeout
+    )
+    elapsed = time.perf_counter() - start
+    for task in unfinished:
+        task.cancel()
+    await ari.stop()
+    server.cancel()
+
+    errors = sum(task.exception() is not None for task in done)
+    requests = sum(call.requests for call in calls)
+    misrouted = sum(call.misrouted for call in calls)
+    print(
+        f"calls: {args.calls}  requests: {requests}  answered: {ari.answered}  "
+        f"{elapsed:.2f}s"
+    )
+    print(
+        f"misrouted: {misrouted}  wrong call: {ari.wrong}  failed: {ari.failed}  "
+        f"unfinished: {len(unfinished)}  connection errors: {errors}  "
+        f"warnings: {warnings.count}"
+    )
+    ok = (
+        ari.answered == args.calls
+        and requests == 2 * args.calls
+        and not (misrouted or ari.wrong or ari.failed)
+        and not (unfinished or errors or warnings.count)
+    )
+    print("ok" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = ArgParser(
+        description="Check REST request routing with per-call connections"
+    )
+    parser.add_argument(
+        "-c",
+        "--calls",
+        type=int,
+        help="Concurrent per-call connections. Default=300",
+        default=300,
+    )
+    parser.add_argument(
+        "-j",
+        "--jitter",
+        type=float,
+        help="Most random delay before each request and response in ms. Default=10",
+        default=10.0,
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        help="Seconds to wait for all the calls to finish. Default=30",
+        default=30.0,
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
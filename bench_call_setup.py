@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Compares the answer path of the example call flows, one request per
+round trip, with the same sequence run through CallSetupPlan.
+Asterisk is simulated in-process with a fixed round trip time and a
+per-request processing time.
+"""
+
+from argparse import ArgumentParser as ArgParser
+import asyncio
+import json
+import logging
+import statistics
+from ast_ari_websocket import AstAriConnection, AstAriWebSocket
+from ast_call_setup import CallSetupPlan
+
+
+class FakeAsterisk:
+    def __init__(self, ari, rtt, service_time):
+        """
+        Answers every RESTRequest with a 204 after rtt + service_time.
+        Requests are serviced one at a time, like a single ARI websocket.
+        """
+        self.ari = ari
+        self.rtt = rtt
+        self.service_time = service_time
+        self.busy_until = 0.0
+        self.requests = 0
+
+    async def send(self, message, text=True):
+        req = json.loads(message)
+        self.requests += 1
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self.busy_until = max(self.busy_until, now + self.rtt / 2) + self.service_time
+        loop.call_at(self.busy_until + self.rtt / 2, self.respond, req)
+
+    def respond(self, req):
+        asyncio.create_task(
+            self.ari.process_rest_response(
+                {
+                    "type": "RESTResponse",
+                    "request_id": req["request_id"],
+                    "status_code": 204,
+                    "reason_phrase": "No Content",
+                    "message_body": "",
+                }
+            )
+        )
+
+
+async def sequential(ari, bridge_id, incoming, ws_channel):
+    await ari.send_request("POST", f"bridges/{bridge_id}?type=mixing")
+    await ari.send_request("POST", f"bridges/{bridge_id}/addChannel?channel={incoming}")
+    await ari.send_request(
+        "POST", f"bridges/{bridge_id}/addChannel?channel={ws_channel}"
+    )
+    await ari.send_request("POST", f"channels/{incoming}/answer")
+
+
+async def planned(ari, bridge_id, incoming, ws_channel):
+    plan = CallSetupPlan()
+    plan.create_bridge("bridge", bridge_id)
+    plan.add_channel("add_incoming", bridge_id, incoming, after=["bridge"])
+    plan.add_channel("add_websocket", bridge_id, ws_channel, after=["bridge"])
+    plan.answer("answer", incoming)
+    await plan.run(ari)
+
+
+async def measure(flow, calls, rtt, service_time):
+    ari = AstAriWebSocket(log_level=logging.WARNING)
+    asterisk = FakeAsterisk(ari, rtt, service_time)
+    ari.connection = AstAriConnection(ari, asterisk)
+    loop = asyncio.get_running_loop()
+    latencies = []
+    for i in range(calls):
+        start = loop.time()
+        await flow(ari, f"bridge-{i}", f"incoming-{i}", f"ws-{i}")
+        latencies.append((loop.time() - start) * 1000)
+    return latencies, asterisk.requests / calls
+
+
+async def main(args):
+    rtt = args.rtt / 1000
+    service_time = args.service_time / 1000
+    for name, flow in (("sequential", sequential), ("call setup plan", planned)):
+        latencies, requests = await measure(flow, args.calls, rtt, service_time)
+        print(
+            f"{name:16} requests/call: {requests:.0f} "
+            f"median: {statistics.median(latencies):.2f}ms "
+            f"max: {max(latencies):.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = ArgParser(description="Benchmark call setup latency")
+    parser.add_argument(
+        "-c", "--calls", type=int, help="Calls to set up. Default=200", default=200
+    )
+    parser.add_argument(
+        "-r", "--rtt", type=float, help="Round trip time in ms. Default=5", default=5.0
+    )
+    parser.add_argument(
+        "-s",
+        "--service-time",
+        type=float,
+        help="Asterisk processing time per request in ms. Default=0.5",
+        default=0.5,
+    )
+    asyncio.run(main(parser.parse_args()))
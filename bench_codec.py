@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Measures ast_media_codec throughput in 20ms frames per second on one
+core, converting frames one at a time and in batches across sessions.
+"""
+
+from argparse import ArgumentParser as ArgParser
+import time
+import numpy as np
+import ast_media_codec as codec
+
+
+def rate(func, frames, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return frames * iterations / (time.perf_counter() - start)
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    sessions = args.sessions
+    slin = rng.integers(-8000, 8000, (sessions, 160), dtype=np.int16)
+    slin16 = rng.integers(-8000, 8000, (sessions, 320), dtype=np.int16)
+    ulaw = codec.encode_batch(slin, "ulaw")
+    up = codec.Resampler(True)
+    down = codec.Resampler(False)
+    ups = [codec.Resampler(True) for _ in range(sessions)]
+    downs = [codec.Resampler(False) for _ in range(sessions)]
+    transcoder = codec.Transcoder("ulaw", "slin16")
+
+    single = {
+        "ulaw decode": lambda: codec.decode(ulaw[0], "ulaw"),
+        "ulaw encode": lambda: codec.encode(slin[0], "ulaw"),
+        "alaw encode": lambda: codec.encode(slin[0], "alaw"),
+        "8k->16k": lambda: up.process(slin[0]),
+        "16k->8k": lambda: down.process(slin16[0]),
+        "ulaw->slin16": lambda: transcoder.process(ulaw[0]),
+    }
+    batched = {
+        "ulaw decode": lambda: codec.decode_batch(ulaw, "ulaw"),
+        "ulaw encode": lambda: codec.encode_batch(slin, "ulaw"),
+        "alaw encode": lambda: codec.encode_batch(slin, "alaw"),
+        "8k->16k": lambda: codec.resample_batch(ups, slin),
+        "16k->8k": lambda: codec.resample_batch(downs, slin16),
+    }
+    iterations = args.iterations
+    print(f"{'':14} {'single':>12} {f'batch of {sessions}':>14}")
+    for name, func in single.items():
+        result = f"{name:14} {rate(func, 1, iterations) / 1000:10.0f}k/s"
+        if name in batched:
+            batch_rate = rate(batched[name], sessions, max(iterations // sessions, 1))
+            result += f" {batch_rate / 1000:12.0f}k/s"
+        print(result)
+
+
+if __name__ == "__main__":
+    parser = ArgParser(description="Benchmark media codecs and resampling")
+    parser.add_argument(
+        "-i",
+        "--iterations",
+        type=int,
+        help="Frames converted one at a time per test. Default=20000",
+        default=20000,
+    )
+    parser.add_argument(
+        "-s",
+        "--sessions",
+        type=int,
+        help="Sessions per batch. Default=500",
+        default=500,
+    )
+    main(parser.parse_args())
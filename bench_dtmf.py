@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Measures DtmfDetector accuracy and throughput on synthesized ulaw
+streams.  Each stream dials every digit with random levels, twist, phase
+and alignment over background noise, then plays tones that must not be
+detected: single tones, a voiced speech-like signal and loud noise.
+"""
+
+from argparse import ArgumentParser as ArgParser
+import time
+import numpy as np
+import ast_media_codec as codec
+from ast_media_dtmf import COLUMN_FREQUENCIES, DIGITS, ROW_FREQUENCIES, DtmfDetector
+
+RATE = 8000
+FRAME = 160
+
+
+class NoClock:
+    def add(self, stream):
+        pass
+
+    def remove(self, stream):
+        pass
+
+
+def tone(rng, freqs, seconds, level_db):
+    t = np.arange(int(seconds * RATE)) / RATE
+    amplitude = 32768 * 10 ** (level_db / 20)
+    return sum(
+        amplitude * np.sin(2 * np.pi * f * t + rng.uniform(0, 2 * np.pi)) for f in freqs
+    )
+
+
+def speech_like(rng, seconds):
+    t = np.arange(int(seconds * RATE)) / RATE
+    f0 = 110 + 30 * np.sin(2 * np.pi * 3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / RATE
+    return sum(3000 / h * np.sin(h * phase) for h in range(1, 30))
+
+
+def fixture(rng, snr_db):
+    """
+    Returns (ulaw frames, the digits dialed).
+    """
+    parts = [np.zeros(rng.integers(0, FRAME))]
+    digits = "".join(rng.permutation(list(DIGITS)))
+    for digit in digits:
+        index = DIGITS.index(digit)
+        row_db = rng.uniform(-25, -8)
+        column_db = row_db + rng.uniform(-4, 2)
+        parts.append(
+            tone(rng, (ROW_FREQUENCIES[index // 4],), 0.07, row_db)
+            + tone(rng, (COLUMN_FREQUENCIES[index % 4],), 0.07, column_db)
+        )
+        parts.append(np.zeros(int(rng.uniform(0.05, 0.1) * RATE)))
+    for freq in ROW_FREQUENCIES + COLUMN_FREQUENCIES:
+        parts.append(tone(rng, (freq,), 0.1, -10))
+    parts.append(speech_like(rng, 1.0))
+    parts.append(rng.normal(0, 8000, RATE // 2))
+    signal = np.concatenate(parts)
+    noise_level = np.sqrt(np.mean(signal**2)) * 10 ** (-snr_db / 20)
+    signal = signal + rng.normal(0, noise_level, len(signal))
+    signal = np.clip(signal, -32768, 32767).astype(np.int16)
+    data = codec.encode(signal[: len(signal) // FRAME * FRAME], "ulaw")
+    return [data[i : i + FRAME] for i in range(0, len(data), FRAME)], digits
+
+
+def main(args):
+    rng = np.random.default_rng(args.seed)
+    fixtures = [fixture(rng, args.snr) for _ in range(args.fixtures)]
+    detected = {}
+    detector = DtmfDetector(
+        lambda key, digit: detected.setdefault(key, []).append(digit), NoClock()
+    )
+    slots = [detector.add(i, "ulaw") for i in range(args.streams)]
+    length = max(len(frames) for frames, _ in fixtures)
+
+    start = time.perf_counter()
+    for n in range(length):
+        for i, slot in enumerate(slots):
+            frames = fixtures[i % len(fixtures)][0]
+            if n < len(frames):
+                detector.feed(slot, frames[n])
+        detector.process()
+    elapsed = time.perf_counter() - start
+
+    correct = missed = extra = 0
+    for i in range(args.streams):
+        expected = fixtures[i % len(fixtures)][1]
+        got = "".join(detected.get(i, []))
+        if got == expected:
+            correct += 1
+        missed += sum(1 for d in expected if d not in got)
+        extra += max(len(got) - len(expected), 0)
+    frames = detector.frames
+    print(f"Streams: {args.streams}  frames: {frames}  SNR: {args.snr}dB")
+    print(f"Streams exactly right: {correct}/{args.streams}")
+    print(f"Digits missed: {missed}  extra digits: {extra}")
+    print(
+        f"Throughput: {frames / elapsed / 1000:.0f}k frames/s "
+        f"({frames / elapsed / 50:.0f} real-time 20ms streams)"
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgParser(description="Benchmark DTMF detection")
+    parser.add_argument(
+        "-s", "--streams", type=int, help="Streams. Default=2000", default=2000
+    )
+    parser.add_argument(
+        "-f",
+        "--fixtures",
+        type=int,
+        help="Distinct synthesized streams. Default=50",
+        default=50,
+    )
+    parser.add_argument(
+        "-n", "--snr", type=float, help="Signal to noise ratio. Default=20", default=20
+    )
+    parser.add_argument("--seed", type=int, help="Random seed. Default=1", default=1)
+    main(parser.parse_args())
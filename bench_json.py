@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Compares the JSON backends available to ast_json on ARI event payloads
+captured from the example call flows, and on a RESTRequest encode.
+"""
+
+from argparse import ArgumentParser as ArgParser
+import time
+import ast_json
+
+CHANNEL = (
+    '{"id":"1760545432.12","name":"PJSIP/1000-0000000c","state":"Ring",'
+    '"protocol_id":"a84f3c2b-77b1-4b4e-9d1e-8c1f8bb0e0a1","caller":{"name":"Alice",'
+    '"number":"1000"},"connected":{"name":"","number":""},"accountcode":"",'
+    '"dialplan":{"context":"default","exten":"1234","priority":2,"app_name":"Stasis",'
+    '"app_data":"ast_ws_server,incoming"},"creationtime":"2025-10-15T16:23:52.113+0000",'
+    '"language":"en","channelvars":{"MEDIA_WEBSOCKET_CONNECTION_ID":""}}'
+)
+
+PAYLOADS = {
+    "StasisStart": (
+        '{"type":"StasisStart","timestamp":"2025-10-15T16:23:52.118+0000","args":'
+        f'["incoming"],"channel":{CHANNEL},"asterisk_id":"02:42:ac:11:00:02",'
+        '"application":"ast_ws_server"}'
+    ),
+    "ChannelVarset": (
+        '{"type":"ChannelVarset","timestamp":"2025-10-15T16:23:52.120+0000",'
+        '"variable":"STASISSTATUS","value":"","channel":'
+        f'{CHANNEL},"asterisk_id":"02:42:ac:11:00:02","application":"ast_ws_server"}}'
+    ),
+    "Dial": (
+        '{"type":"Dial","timestamp":"2025-10-15T16:23:52.301+0000","dialstatus":"ANSWER",'
+        f'"forward":"","caller":{CHANNEL},"peer":{CHANNEL},'
+        '"asterisk_id":"02:42:ac:11:00:02","application":"ast_ws_server"}'
+    ),
+    "RESTResponse": (
+        '{"type":"RESTResponse","transaction_id":"","request_id":"4c1f9e2a0b7d-17",'
+        '"status_code":200,"reason_phrase":"OK","uri":"channels/create","headers":'
+        '[{"name":"Content-type","value":"application/json"}],"content_type":'
+        '"application/json","message_body":"{\\"id\\":\\"1760545432.13\\",\\"name\\":'
+        '\\"WebSocket/INCOMING-0000000d\\",\\"state\\":\\"Down\\"}"}'
+    ),
+}
+
+REQUEST = {
+    "type": "RESTRequest",
+    "request_id": "4c1f9e2a0b7d-17",
+    "method": "POST",
+    "uri": "channels/create",
+    "query_strings": [
+        {"name": "endpoint", "value": "WebSocket/INCOMING/c(ulaw)"},
+        {"name": "app", "value": "ast_ws_client"},
+        {"name": "appArgs", "value": "websocket"},
+        {"name": "originator", "value": "1760545432.12"},
+    ],
+}
+
+
+def rate(func, arg, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return iterations / (time.perf_counter() - start)
+
+
+def main(args):
+    for codec in ast_json.CODECS:
+        try:
+            ast_json.set_codec(codec)
+        except ImportError:
+            print(f"{codec:8} not installed")
+            continue
+        results = [
+            f"{event} {rate(ast_json.loads, payload, args.iterations) / 1000:.0f}k/s"
+            for event, payload in PAYLOADS.items()
+        ]
+        results.append(
+            f"encode {rate(ast_json.dumpb, REQUEST, args.iterations) / 1000:.0f}k/s"
+        )
+        print(f"{codec:8} " + " ".join(results))
+
+
+if __name__ == "__main__":
+    parser = ArgParser(description="Benchmark ARI JSON codecs")
+    parser.add_argument(
+        "-i",
+        "--iterations",
+        type=int,
+        help="Iterations per payload. Default=100000",
+        default=100000,
+    )
+    main(parser.parse_args())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Measures the cost per frame of AstMediaWebSocket's inbound media path,
+from a received message through the FrameNormalizer and process_frame()
+to the outbound send() or a Mixer, with tracemalloc.  Once the path has warmed up,
+nothing allocated for a frame may outlive it: buffers are preallocated
+and reused, so memory allocated during the run and still held at the end
+must be zero.  Also reports the peak memory allocated while frames are in
+flight.  Exits with 1 if any scenario holds on to memory.
+"""
+
+from argparse import ArgumentParser as ArgParser
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from ast_media_mixer import Mixer
+from ast_media_websocket import AstMediaWebSocketServer
+
+SCENARIOS = ("echo", "rechunk", "fanout", "queue", "relay", "mixer")
+WARMUP_FRAMES = 2000
+
+
+class NullWebSocket:
+    remote_address = ("bench", 0)
+
+    async def send(self, message):
+        pass
+
+
+class ManualClock:
+    # The mixer is ticked by run() instead.
+    def add(self, listener):
+        pass
+
+    def remove(self, listener):
+        pass
+
+
+def start_session(mws, connection_id, frame_size):
+    session = mws.create_session(NullWebSocket())
+    session.media_start(
+        f"MEDIA_START connection_id:{connection_id} channel:WebSocket/{connection_id} "
+        f"format:ulaw optimal_frame_size:{frame_size} ptime:20"
+    )
+    mws.sessions[connection_id] = session
+    mws.start_framing(session)
+    return session
+
+
+def setup(scenario, subscribers):
+    """
+    Returns (server, sessions, the message each session receives, the
+    subscribers to drain).
+    """
+    mws = AstMediaWebSocketServer("localhost", 0, None, "media")
+    if scenario == "relay":
+        mws.relay("a", "b")
+        sessions = [start_session(mws, "a", 160), start_session(mws, "b", 320)]
+        for session in sessions:
+            mws.join_relay(session)
+    elif scenario == "mixer":
+        mixer = Mixer(clock=ManualClock())
+        sessions = [start_session(mws, f"m{i}", 160) for i in range(subscribers)]
+        for session in sessions:
+            mixer.add(session)
+    else:
+        sessions = [start_session(mws, "a", 160)]
+    # Asterisk sends optimal_frame_size messages.  "rechunk" sends ones
+    # that don't line up with them.
+    size = 150 if scenario == "rechunk" else 160
+    message = bytes(range(size))
+    readers = []
+    if scenario == "fanout":
+        readers = [sessions[0].subscribe(f"s{i}") for i in range(subscribers)]
+    elif scenario == "queue":
+        readers = [sessions[0].frames(name=f"q{i}") for i in range(subscribers)]
+    return mws, sessions, message, readers
+
+
+async def run(mws, sessions, message, readers, count):
+    mixer = sessions[0].mixer
+    for _ in range(count):
+        for session in sessions:
+            for frame in session.framer.split(message):
+                await mws.process_frame(session, frame)
+        if mixer is not None:
+            await mixer.tick(mixer.next_time or 0.0)
+            # Let the participants' writers send the mix.
+            await asyncio.sleep(0)
+        for reader in readers:
+            read = getattr(reader, "get_nowait", None) or reader.read
+            while read() is not None:
+                pass
+
+
+async def measure(scenario, frames, subscribers):
+    mws, sessions, message, readers = setup(scenario, subscribers)
+    # Traced from the start so caches that fill up during the warm up,
+    # such as numpy's, aren't counted as held.
+    tracemalloc.start()
+    await run(mws, sessions, message, readers, WARMUP_FRAMES)
+    gc.collect()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    await run(mws, sessions, message, readers, frames)
+    # collect() also empties the interpreter's free lists, which the run
+    # refilled, so after is measured from the same state as before.
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    await run(mws, sessions, message, readers, frames)
+    elapsed = time.perf_counter() - start
+    for session in sessions:
+        session.stop_writer()
+    count = frames * len(sessions)
+    return (after - before) / count, peak - before, elapsed / count
+
+
+async def main(args):
+    failed = 0
+    for scenario in args.scenarios:
+        held, peak, seconds = await measure(scenario, args.frames, args.subscribers)
+        # tracemalloc's own bookkeeping can account for a few bytes.
+        pooled = held * args.frames < 1024
+        failed |= not pooled
+        print(
+            f"{scenario:8}  held: {held:6.2f} bytes/frame  peak: {peak:6} bytes  "
+            f"{seconds * 1e6:5.2f}us/frame  {'ok' if pooled else 'HELD'}"
+        )
+    return failed
+
+
+if __name__ == "__main__":
+    parser = ArgParser(description="Benchmark the inbound media path")
+    parser.add_argument(
+        "-f",
+        "--frames",
+        type=int,
+        help="Frames per scenario. Default=20000",
+        default=20000,
+    )
+    parser.add_argument(
+        "-s",
+        "--subscribers",
+        type=int,
+        help="Fan-out subscribers, frame queues or mixer participants. Default=4",
+        default=4,
+    )
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        help=f"Scenarios to run: {', '.join(SCENARIOS)}. Default=all",
+    )
+    args = parser.parse_args()
+    for scenario in args.scenarios:
+        if scenario not in SCENARIOS:
+            parser.error(f"Unknown scenario '{scenario}'")
+    args.scenarios = args.scenarios or SCENARIOS
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) 2025, Sangoma Technologies Corporation
+George T Joseph <gjoseph@sangoma.com>
+
+This program is free software, distributed under the terms of
+the Apache License Version 2.0.
+
+Drives a few hundred concurrent fake chan_websocket connections against
+one AstMediaWebSocketServer to check that each connection's MediaSession
+keeps its own state.  Calls alternate between 160 and 320 byte
+optimal_frame_sizes.  Each one plays the announcement the way Asterisk
+would, acknowledges it with MEDIA_BUFFERING_COMPLETED and then checks
+that the frames it sends, stamped with the call and a sequence number,
+are echoed back to it and only to it.  Exits with 1 if any call got
+another call's media, frames of the wrong size, an incomplete
+announcement or lost echoes, or if sessions are left behind.
+"""
+
+from argparse import ArgumentParser as ArgParser
+import asyncio
+import logging
+import os
+import sys
+import time
+from websockets.asyncio.client import connect
+from ast_media_websocket import AstMediaWebSocketServer
+
+ANNOUNCEMENT = "echo-announce.ulaw"
+
+
+class FakeChannel:
+    def __init__(self, index, frames):
+        """
+        One call's Asterisk end of a chan_websocket connection.
+        """
+        self.connection_id = f"bench-{index}"
+        self.frame_size = 160 if index % 2 else 320
+        self.frames = [
+            (index.to_bytes(2, "big") + bytes([seq])) * (self.frame_size // 3)
+            + bytes(self.frame_size % 3)
+            for seq in range(frames)
+        ]
+        self.announced = 0
+        self.wrong_size = 0
+        self.echoed = 0
+        self.wrong_echo = 0
+
+    async def run(self, port):
+        async with connect(f"ws://localhost:{port}", subprotocols=["media"]) as ws:
+            await ws.send(
+                f"MEDIA_START connection_id:{self.connection_id} "
+                f"channel:WebSocket/{self.connection_id} format:ulaw "
+                f"optimal_frame_size:{self.frame_size} ptime:{self.frame_size // 8}"
+            )
+            async for message in ws:
+                if isinstance(message, str):
+                    if message.startswith("STOP_MEDIA_BUFFERING"):
+                        await ws.send(f"MEDIA_BUFFERING_COMPLETED {ANNOUNCEMENT}")
+                        for frame in self.frames:
+                            await ws.send(frame)
+                    continue
+                if self.echoed or message == self.frames[0]:
+                    if message != self.frames[self.echoed]:
+                        self.wrong_echo += 1
+                    self.echoed += 1
+                    if self.echoed == len(self.frames):
+                        return
+                    continue
+                # Only the announcement's last frame can be short.
+                if self.announced % self.frame_size or len(message) > self.frame_size:
+                    self.wrong_size += 1
+                self.announced += len(message)
+
+
+async def watch(mws, peak):
+    while True:
+        peak[0] = max(peak[0], len(mws.sessions))
+        await asyncio.sleep(0.01)
+
+
+async def main(args):
+    mws = AstMediaWebSocketServer(
+        "localhost", 0, None, "media", log_level=logging.WARNING
+    )
+    server = asyncio.create_task(mws.listen())
+    while mws.server is None:
+        await asyncio.sleep(0.01)
+    port = mws.server.sockets[0].getsockname()[1]
+    peak = [0]
+    watcher = asyncio.create_task(watch(mws, peak))
+    channels = [FakeChannel(i, args.frames) for i in range(args.calls)]
+    start = time.perf_counter()
+    done, unfinished = await asyncio.wait(
+        [asyncio.create_task(channel.run(port)) for channel in channels],
+        timeout=args.timeout,
+    )
+    elapsed = time.perf_counter() - start
+    for task in unfinished:
+        task.cancel()
+    # Let the server finish with the closed connections.
+    await asyncio.sleep(0.2)
+    watcher.cancel()
+    left = len(mws.sessions)
+    await mws.stop()
+    server.cancel()
+
+    size = os.path.getsize(ANNOUNCEMENT)
+    errors = sum(task.exception() is not None for task in done)
+    short = sum(channel.announced < size for channel in channels)
+    wrong_size = sum(channel.wrong_size for channel in channels)
+    wrong_echo = sum(channel.wrong_echo for channel in channels)
+    lost = sum(args.frames - channel.echoed for channel in channels)
+    print(
+        f"calls: {args.calls}  peak sessions: {peak[0]}  {elapsed:.2f}s  "
+        f"sessions left: {left}"
+    )
+    print(
+        f"short announcements: {short}  wrong frame size: {wrong_size}  "
+        f"wrong echoes: {wrong_echo}  lost echoes: {lost}  "
+        f"unfinished: {len(unfinished)}  connection errors: {errors}"
+    )
+    ok = not (short or wrong_size or wrong_echo or lost)
+    ok = ok and not (unfinished or errors or left)
+    print("ok" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = ArgParser(description="Drive concurrent media websocket connections")
+    parser.add_argument(
+        "-c",
+        "--calls",
+        type=int,
+        help="Concurrent media connections. Default=300",
+        default=300,
+    )
+    parser.add_argument(
+        "-f",
+        "--frames",
+        type=int,
+        help="Frames each call sends to be echoed. Default=25",
+        default=25,
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        help="Seconds to wait for all the calls to finish. Default=30",
+        default=30.0,
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -26,17 +26,25 @@ logging.basicConfig(
 test_failed = 0
 
 
-async def send_file(ws_media, filename, chan_name, sent_buffer):
-    buff_size = 1000
+async def send_file(ws_media, filename, chan_name, sent_buffer, frame_size, ptime):
     f = io.open(filename, "rb", buffering=0)
     logger.info(f"Playing '{filename}' for {chan_name}")
     await ws_media.send("START_MEDIA_BUFFERING")
+    # Send one frame per ptime, a few frames ahead of real time, rather
+    # than as fast as the socket allows.
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    frames = 0
     while True:
-        buff = f.read(buff_size)
+        buff = f.read(frame_size)
         if buff is None or len(buff) <= 0:
             break
+        delay = start + (frames - 3) * ptime / 1000 - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
         # Send on the websocket
         await ws_media.send(buff)
+        frames += 1
         # Save in buffer so we can compare to what was received.
         sent_buffer.write(buff)
     f.close()
@@ -106,6 +114,7 @@ async def process_media(ws_media):
         recvd_buffer = io.BytesIO()
         chan_name = ""
         optimal_frame_size = 0
+        ptime = 20
         async for message in ws_media:
             if isinstance(message, str):
                 logger.info(f"Received {message}")
@@ -117,8 +126,17 @@ async def process_media(ws_media):
                             chan_name = v[1]
                         elif v[0] == "optimal_frame_size":
                             optimal_frame_size = int(v[1])
+                        elif v[0] == "ptime":
+                            ptime = int(v[1])
                     asyncio.create_task(
-                        send_file(ws_media, "test.ulaw", chan_name, sent_buffer)
+                        send_file(
+                            ws_media,
+                            "test.ulaw",
+                            chan_name,
+                            sent_buffer,
+                            optimal_frame_size or 160,
+                            ptime,
+                        )
                     )
                 if "MEDIA_BUFFERING_COMPLETED" in message:
                     asyncio.create_task(